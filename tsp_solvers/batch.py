@@ -0,0 +1,338 @@
+"""
+Headless batch solver for directories of TSPLIB instances.
+
+Solves every matched ``.tsp`` file on a process pool, writes each tour in the
+TSPLIB ``.tour`` format and prints a summary table of lengths and timings.
+The largest instances are submitted first, so long runs do not end up on the
+tail of the batch.
+
+Usage::
+
+    python -m tsp_solvers.batch data/ --solver sa --params '{"candidate_k": 8}' --time-limit 5 --output-dir tours/
+    python -m tsp_solvers.batch "instances/*.tsp" --config nightly.json --workers 16 --summary summary.csv
+
+A ``--config`` file is a JSON object with any of ``solver``, ``params``,
+``time_limit``, ``max_evaluations``, ``float_dist`` and ``seed``; command-line
+options override it.
+"""
+import argparse
+import concurrent.futures
+import csv
+import glob
+import inspect
+import json
+import os
+import random
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from .construction import construct_tour
+from .core.task_holder import TSPInstance
+from .core.tsplib import write_tour
+from .local_search import LinKernighan
+from .metaheuristics import AntColony, ParticleSwarmOptimization, SimulatedAnnealing
+
+SOLVERS = {
+    "sa": SimulatedAnnealing,
+    "aco": AntColony,
+    "pso": ParticleSwarmOptimization,
+    "lk": LinKernighan,
+}
+
+# Columns of the summary table and file
+SUMMARY_FIELDS = (
+    "instance", "dimension", "length", "load_time", "solve_time", "stop_reason", "iterations", "evaluations",
+    "tour_file", "error",
+)
+
+
+def find_instances(inputs):
+    """
+    Expand directories and glob patterns into a sorted list of ``.tsp`` paths.
+
+    Parameters
+    ----------
+    inputs : iterable of str
+        Directories (searched non-recursively), glob patterns or file paths.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, "*.tsp")))
+        else:
+            matches = glob.glob(item)
+            paths.update(matches if matches else [item])
+    return sorted(paths)
+
+
+def instance_names(paths):
+    """
+    Names of the instances in the summary and of their ``.tour`` files.
+
+    A name is the path relative to the deepest directory containing all files,
+    without the extension and with ``/`` separators. Files of one directory keep
+    their base names; same-named files of different directories stay distinct.
+
+    Returns
+    -------
+    dict
+        Path -> name.
+    """
+    if not paths:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    return {
+        path: os.path.splitext(os.path.relpath(os.path.abspath(path), root))[0].replace(os.sep, "/")
+        for path in paths
+    }
+
+
+def solve_file(path, solver="sa", params=None, time_limit=None, max_evaluations=None, float_dist=True,
+               seed=None, output_dir=None, name=None):
+    """
+    Load and solve one instance and write its tour.
+
+    Parameters
+    ----------
+    path : str
+        The .tsp file.
+    solver : str
+        Key of SOLVERS. "lk" improves a start tour built with ``params["init"]``
+        (nearest neighbor by default); budgets do not apply to it.
+    params : dict, optional
+        Constructor options of the solver.
+    time_limit, max_evaluations : optional
+        Budgets passed to ``solve``.
+    float_dist : bool
+        False for TSPLIB nint distances.
+    seed : int, optional
+        Base seed of the batch. The file gets its own seed derived from it and
+        the instance name (see file_seed), which seeds ``random`` and
+        ``numpy.random`` and is passed as ``seed`` to solvers that take one,
+        unless ``params`` sets it.
+    output_dir : str, optional
+        Directory of the ``.tour`` file; no file is written if None.
+    name : str, optional
+        Instance name (see instance_names); the tour is written to
+        ``<output_dir>/<name>.tour``. Default is the base name of ``path``.
+
+    Returns
+    -------
+    dict
+        One summary record (see SUMMARY_FIELDS). Errors are reported in the
+        ``error`` field instead of being raised, so one bad file does not stop a batch.
+    """
+    record = dict.fromkeys(SUMMARY_FIELDS)
+    record["instance"] = name or os.path.splitext(os.path.basename(path))[0]
+    params = dict(params or {})
+    try:
+        start = time.perf_counter()
+        instance = TSPInstance.from_file(path, float_dist=float_dist)
+        instance.distance_matrix
+        record["dimension"] = instance.dimension
+        record["load_time"] = time.perf_counter() - start
+
+        if seed is not None:
+            seed = file_seed(seed, record["instance"])
+            random.seed(seed)
+            np.random.seed(seed)
+            if "seed" in inspect.signature(SOLVERS[solver]).parameters:
+                params.setdefault("seed", seed)
+        start = time.perf_counter()
+        if solver == "lk":
+            init = params.pop("init", "nearest_neighbor")
+            tour, length = LinKernighan(**params).improve(instance, construct_tour(instance, init))
+        else:
+            result = SOLVERS[solver](**params).solve(
+                instance, time_limit=time_limit, max_evaluations=max_evaluations
+            )
+            tour, length = result
+            record.update(stop_reason=result.stop_reason, iterations=result.iterations,
+                          evaluations=result.evaluations)
+        record["solve_time"] = time.perf_counter() - start
+        record["length"] = float(length)
+
+        if output_dir is not None:
+            record["tour_file"] = os.path.join(output_dir, *record["instance"].split("/")) + ".tour"
+            os.makedirs(os.path.dirname(record["tour_file"]), exist_ok=True)
+            write_tour(
+                record["tour_file"], tour, name=os.path.basename(record["tour_file"]),
+                comment=f"Length {float(length):.6g} ({solver})",
+            )
+    except Exception as error:
+        record["error"] = f"{type(error).__name__}: {error}"
+    return record
+
+
+def file_seed(seed, name):
+    """
+    Seed of one instance in a batch: depends only on the base seed and the
+    instance name, not on the order in which the pool runs the files.
+    """
+    return int(np.random.SeedSequence([seed, zlib.crc32(name.encode())]).generate_state(1)[0])
+
+
+def _solve_job(job):
+    path, options = job
+    return path, solve_file(path, **options)
+
+
+def run_batch(paths, workers=None, log=None, **options):
+    """
+    Solve many instances on a process pool.
+
+    The workers are not daemonic, so solvers may start pools of their own
+    (``num_workers`` of AntColony).
+
+    Parameters
+    ----------
+    paths : list of str
+        The .tsp files.
+    workers : int, optional
+        Pool size (default: CPU count). With 1, files are solved in this process.
+    log : callable, optional
+        Called with every record as soon as it is finished.
+    **options
+        Passed to solve_file.
+
+    Returns
+    -------
+    list of dict
+        Records in the order of ``paths``.
+    """
+    workers = workers or os.cpu_count() or 1
+    if options.get("output_dir") is not None:
+        os.makedirs(options["output_dir"], exist_ok=True)
+    names = instance_names(paths)
+    # Largest files first keeps the pool busy until the end
+    jobs = sorted(((path, dict(options, name=names[path])) for path in paths), key=lambda job: -_file_size(job[0]))
+    records = {}
+    pool = None
+    if workers == 1 or len(jobs) == 1:
+        results = map(_solve_job, jobs)
+    else:
+        pool = concurrent.futures.ProcessPoolExecutor(min(workers, len(jobs)))
+        futures = [pool.submit(_solve_job, job) for job in jobs]
+        results = (future.result() for future in concurrent.futures.as_completed(futures))
+    try:
+        for path, record in results:
+            records[path] = record
+            if log is not None:
+                log(record)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return [records[path] for path in paths]
+
+
+def format_table(records):
+    """
+    Aligned text table of the records, with a total line.
+    """
+    header = ("instance", "n", "length", "load s", "solve s", "stop", "status")
+    rows = []
+    for record in records:
+        rows.append((
+            record["instance"],
+            "" if record["dimension"] is None else str(record["dimension"]),
+            "" if record["length"] is None else f"{record['length']:.2f}",
+            "" if record["load_time"] is None else f"{record['load_time']:.3f}",
+            "" if record["solve_time"] is None else f"{record['solve_time']:.3f}",
+            record["stop_reason"] or "",
+            record["error"] or "ok",
+        ))
+    solved = [record for record in records if record["error"] is None]
+    rows.append((
+        "total", str(len(records)), "",
+        f"{sum(record['load_time'] for record in solved):.3f}",
+        f"{sum(record['solve_time'] for record in solved):.3f}",
+        "", f"{len(records) - len(solved)} failed",
+    ))
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+    lines = [
+        "  ".join(cell.ljust(width) if i in (0, 5, 6) else cell.rjust(width)
+                  for i, (cell, width) in enumerate(zip(row, widths))).rstrip()
+        for row in [header] + rows
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    lines.insert(len(lines) - 1, lines[1])
+    return "\n".join(lines)
+
+
+def write_summary(path, records):
+    """
+    Write the records as CSV, or as JSON if ``path`` ends with ``.json``.
+    """
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(records, f, indent=2)
+        return
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="directories, glob patterns or .tsp files")
+    parser.add_argument("--config", help="JSON file with solver, params and budgets")
+    parser.add_argument("--solver", choices=sorted(SOLVERS))
+    parser.add_argument("--params", help="solver constructor options as a JSON object")
+    parser.add_argument("--time-limit", type=float, help="seconds per instance")
+    parser.add_argument("--max-evaluations", type=int, help="evaluations per instance")
+    parser.add_argument("--nint", action="store_true", help="round distances to integers (TSPLIB nint)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int, default=None, help="pool size (default: CPU count)")
+    parser.add_argument("--output-dir", help="write <instance>.tour files here (in subdirectories for nested inputs)")
+    parser.add_argument("--summary", help="write the summary as CSV (or JSON for a .json path)")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary table")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    if args.params:
+        config["params"] = json.loads(args.params)
+    for name in ("solver", "time_limit", "max_evaluations", "seed"):
+        if getattr(args, name) is not None:
+            config[name] = getattr(args, name)
+    if args.nint:
+        config["float_dist"] = False
+    unknown = set(config) - {"solver", "params", "time_limit", "max_evaluations", "float_dist", "seed"}
+    if unknown:
+        parser.error(f"unknown config keys: {sorted(unknown)}")
+    if config.setdefault("solver", "sa") not in SOLVERS:
+        parser.error(f"unknown solver {config['solver']!r}")
+
+    paths = find_instances(args.inputs)
+    if not paths:
+        parser.error("no .tsp files found")
+
+    def log(record):
+        if not args.quiet:
+            status = record["error"] or f"length={record['length']:.2f} time={record['solve_time']:.3f}s"
+            print(f"{record['instance']}: {status}", flush=True)
+
+    start = time.perf_counter()
+    records = run_batch(paths, args.workers, log=log, output_dir=args.output_dir, **config)
+    print(format_table(records))
+    print(f"{len(records)} instances in {time.perf_counter() - start:.2f}s")
+    if args.summary:
+        write_summary(args.summary, records)
+    return 1 if any(record["error"] for record in records) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
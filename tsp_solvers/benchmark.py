@@ -0,0 +1,329 @@
+"""
+Reproducible benchmark of the solvers on the bundled TSPLIB instances.
+
+Every (solver, instance, seed) run records wall time, peak traced memory, tour
+evaluations per second and the gap to the known optimum. Results are written
+as JSON; ``--compare`` checks them against a saved baseline and exits with a
+non-zero status if a run regressed.
+
+Usage::
+
+    python -m tsp_solvers.benchmark --output baseline.json
+    python -m tsp_solvers.benchmark --compare baseline.json --output current.json
+    python -m tsp_solvers.benchmark --solvers sa aco --instances qa194 --seeds 0 1 2 --budget 2
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .construction import construct_tour
+from .core.task_holder import TSPInstance
+from .local_search import LinKernighan
+from .metaheuristics import AntColony, ParticleSwarmOptimization, SimulatedAnnealing
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Optimal tour lengths (TSPLIB nint distances) of the bundled instances
+OPTIMA = {
+    "circle10": 59143,
+    "wi29": 27603,
+    "dj38": 6656,
+    "qa194": 9352,
+    "zi929": 95345,
+    "lu980": 11340,
+}
+
+# Default tolerances of the compare mode (relative, except gap which is absolute)
+TOLERANCES = {
+    "wall_time": 0.15,
+    "peak_memory": 0.15,
+    "evaluations_per_second": 0.15,
+    "gap": 0.005,
+}
+
+
+def _run_annealing(instance, seed, budget):
+    solver = SimulatedAnnealing(
+        initial_temp=100.0, cooling_rate=0.99, stopping_temp=1e-3, max_iterations=int(200 * budget), candidate_k=8
+    )
+    result = solver.solve(instance)
+    return result.best_path, result.best_distance, result.evaluations
+
+
+def _run_ant_colony(instance, seed, budget):
+    solver = AntColony(num_ants=20, max_iter=int(50 * budget), candidate_k=10, seed=seed)
+    result = solver.solve(instance)
+    return result.best_path, result.best_distance, result.evaluations
+
+
+def _run_particle_swarm(instance, seed, budget):
+    solver = ParticleSwarmOptimization(num_particles=20, max_iterations=int(200 * budget))
+    result = solver.solve(instance)
+    return result.best_path, result.best_distance, result.evaluations
+
+
+def _run_lin_kernighan(instance, seed, budget):
+    solver = LinKernighan()
+    path, length = solver.improve(instance, construct_tour(instance, "random"))
+    # LK evaluates move gains, not tours
+    return path, length, None
+
+
+# Benchmark entries: name -> function(instance, seed, budget) returning
+# (tour, length, evaluations). ``budget`` scales the iteration limits.
+SOLVERS = {
+    "sa": _run_annealing,
+    "aco": _run_ant_colony,
+    "pso": _run_particle_swarm,
+    "lk": _run_lin_kernighan,
+}
+
+
+def default_instances():
+    """
+    Paths of the bundled instances, smallest first.
+    """
+    paths = glob.glob(os.path.join(DATA_DIR, "*.tsp"))
+    return sorted(paths, key=lambda path: (_read_dimension(path), path))
+
+
+def run_one(solver, instance, seed, budget=1.0, memory=True):
+    """
+    Benchmark one solver run.
+
+    The run is timed without tracing. If ``memory`` is set, it is repeated with
+    the same seed under tracemalloc to measure the peak of traced allocations
+    (NumPy buffers included), so tracing overhead does not distort the timing.
+
+    Parameters
+    ----------
+    solver : str
+        Key of SOLVERS.
+    instance : TSPInstance
+        The instance; its distance matrix is built before the clock starts.
+    seed : int
+        Seed for ``random``, ``numpy.random`` and the solver.
+    budget : float
+        Scale of the solver's iteration limits.
+    memory : bool
+        Measure peak memory.
+
+    Returns
+    -------
+    dict
+        One JSON-serializable result record. ``evaluations`` counts tour
+        evaluations (SA moves, ants, particle moves) and is None for LK.
+    """
+    run = SOLVERS[solver]
+    instance.distance_matrix
+
+    _seed_all(seed)
+    start = time.perf_counter()
+    path, length, evaluations = run(instance, seed, budget)
+    wall_time = time.perf_counter() - start
+
+    peak_memory = None
+    if memory:
+        _seed_all(seed)
+        tracemalloc.start()
+        try:
+            run(instance, seed, budget)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    if sorted(path) != list(range(instance.dimension)):
+        raise RuntimeError(f"{solver} returned an invalid tour on {instance.name}")
+    optimum = OPTIMA.get(instance.name)
+    return {
+        "solver": solver,
+        "instance": instance.name,
+        "dimension": instance.dimension,
+        "seed": seed,
+        "budget": budget,
+        "length": float(length),
+        "optimum": optimum,
+        "gap": None if optimum is None else float(length) / optimum - 1.0,
+        "wall_time": wall_time,
+        "peak_memory": peak_memory,
+        "evaluations": evaluations,
+        "evaluations_per_second": evaluations / wall_time if evaluations is not None and wall_time > 0 else None,
+    }
+
+
+def run_benchmark(solvers=None, instance_paths=None, seeds=(0, 1, 2), budget=1.0, memory=True, log=None):
+    """
+    Run every solver on every instance with every seed.
+
+    Instances are loaded with TSPLIB nint distances, so lengths are comparable
+    with OPTIMA. Peak memory barely depends on the seed and its tracing pass is
+    slow, so it is only measured for the first seed of every pair.
+
+    Returns
+    -------
+    dict
+        ``{"meta": {...}, "runs": [...]}``, see run_one for the run records.
+    """
+    solvers = list(SOLVERS) if solvers is None else list(solvers)
+    instance_paths = default_instances() if instance_paths is None else list(instance_paths)
+    runs = []
+    for path in instance_paths:
+        instance = TSPInstance.from_file(path, float_dist=False)
+        for solver in solvers:
+            for seed in seeds:
+                record = run_one(solver, instance, seed, budget, memory and seed == seeds[0])
+                runs.append(record)
+                if log is not None:
+                    log(_format_record(record))
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "solvers": solvers,
+        "seeds": list(seeds),
+        "budget": budget,
+    }
+    return {"meta": meta, "runs": runs}
+
+
+def compare(baseline, current, tolerances=None):
+    """
+    Compare two benchmark results run by run.
+
+    Runs are grouped by (solver, instance, budget) and the metrics are averaged
+    over the seeds of each group before comparing, which smooths out timing
+    noise. Groups missing from the baseline are skipped.
+
+    Parameters
+    ----------
+    baseline, current : dict
+        Results of run_benchmark.
+    tolerances : dict, optional
+        Overrides of TOLERANCES.
+
+    Returns
+    -------
+    list of dict
+        One entry per regressed metric with the baseline and current values.
+    """
+    tolerances = {**TOLERANCES, **(tolerances or {})}
+    base = _average_by_pair(baseline["runs"])
+    regressions = []
+    for key, metrics in _average_by_pair(current["runs"]).items():
+        if key not in base:
+            continue
+        old = base[key]
+        for metric, tolerance in tolerances.items():
+            before, after = old.get(metric), metrics.get(metric)
+            if before is None or after is None:
+                continue
+            if metric == "gap":
+                worse = after > before + tolerance
+            elif metric == "evaluations_per_second":
+                worse = after < before * (1 - tolerance)
+            else:
+                worse = after > before * (1 + tolerance)
+            if worse:
+                regressions.append({
+                    "solver": key[0], "instance": key[1], "metric": metric, "baseline": before, "current": after,
+                })
+    return regressions
+
+
+def _average_by_pair(runs):
+    groups = {}
+    for run in runs:
+        groups.setdefault((run["solver"], run["instance"], run["budget"]), []).append(run)
+    averages = {}
+    for key, group in groups.items():
+        averages[key] = {}
+        for metric in TOLERANCES:
+            values = [run[metric] for run in group if run[metric] is not None]
+            averages[key][metric] = sum(values) / len(values) if values else None
+    return averages
+
+
+def _seed_all(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _read_dimension(path):
+    with open(path) as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key.strip().upper() == "DIMENSION":
+                return int(value)
+            if key.strip().upper().endswith("_SECTION"):
+                break
+    return 0
+
+
+def _format_record(record):
+    gap = "   n/a" if record["gap"] is None else f"{100 * record['gap']:5.2f}%"
+    memory = "n/a" if record["peak_memory"] is None else f"{record['peak_memory'] / 2**20:.1f} MiB"
+    speed = "n/a" if record["evaluations_per_second"] is None else f"{record['evaluations_per_second']:.0f}/s"
+    return (
+        f"{record['solver']:>4} {record['instance']:>10} seed={record['seed']:<3} "
+        f"length={record['length']:<10.0f} gap={gap} time={record['wall_time']:.3f}s "
+        f"mem={memory} evals={speed}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), default=list(SOLVERS))
+    parser.add_argument(
+        "--instances", nargs="+", default=None,
+        help="instance names (e.g. qa194) or .tsp paths; defaults to all bundled instances",
+    )
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--budget", type=float, default=1.0, help="scale of the solvers' iteration limits")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a saved result file")
+    parser.add_argument(
+        "--current", metavar="RESULTS", help="with --compare: compare this result file instead of running"
+    )
+    args = parser.parse_args(argv)
+
+    if args.current:
+        with open(args.current) as f:
+            result = json.load(f)
+    else:
+        paths = None
+        if args.instances:
+            paths = [
+                name if name.endswith(".tsp") else os.path.join(DATA_DIR, name + ".tsp") for name in args.instances
+            ]
+        result = run_benchmark(args.solvers, paths, args.seeds, args.budget, not args.no_memory, log=print)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(result, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, result)
+        for item in regressions:
+            print(
+                f"REGRESSION {item['solver']} on {item['instance']}: {item['metric']} "
+                f"{item['baseline']:.6g} -> {item['current']:.6g}"
+            )
+        if regressions:
+            return 1
+        print("No regressions against", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+from .heuristics import (
+    CONSTRUCTORS, christofides_tour, construct_tour, greedy_edge_tour, nearest_neighbor_tour, random_tour,
+    space_filling_curve_tour,
+)
@@ -0,0 +1,454 @@
+import random
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - scipy is optional
+    cKDTree = None
+
+from ..core.neighbors import k_nearest_neighbors, matrix_k_nearest_neighbors
+
+
+def random_tour(instance, start=None):
+    """
+    Uniformly random tour, drawn with the ``random`` module like the solvers do.
+    """
+    tour = list(range(instance.dimension))
+    random.shuffle(tour)
+    return tour
+
+
+def nearest_neighbor_tour(instance, start=0):
+    """
+    Nearest neighbor tour: always move to the closest unvisited city.
+
+    The closest unvisited city is looked up in the candidate lists first and in a
+    KD-tree over the remaining cities otherwise. The tree is rebuilt whenever half
+    of its cities have been visited, so the construction runs in O(n log^2 n).
+    Without scipy (or for EXPLICIT instances) the fallback scans the distance row
+    of the current city, vectorized but O(n^2) in total.
+
+    Parameters
+    ----------
+    instance : TSPInstance
+        The instance to build a tour for.
+    start : int, optional
+        First city of the tour. Default is 0.
+
+    Returns
+    -------
+    list of int
+    """
+    n = instance.dimension
+    start = 0 if start is None else int(start)
+    if n <= 2:
+        return _rotate(list(range(n)), start)
+
+    points = instance.spatial_points()
+    candidates = instance.candidate_lists(min(8, n - 1)).tolist()
+    dist = instance.distance_matrix
+    visited = np.zeros(n, dtype=bool)
+    tour = [start]
+    visited[start] = True
+
+    tree = None
+    remaining = None
+    stale = 0
+    current = start
+    for _ in range(n - 1):
+        city = -1
+        for c in candidates[current]:
+            if not visited[c]:
+                city = c
+                break
+
+        if city < 0 and (points is None or cKDTree is None):
+            row = np.array(dist[np.full(n, current), np.arange(n)], dtype=np.float64)
+            row[visited] = np.inf
+            city = int(np.argmin(row))
+        elif city < 0:
+            if tree is None or 2 * stale >= len(remaining):
+                remaining = np.flatnonzero(~visited)
+                tree = cKDTree(points[remaining])
+                stale = 0
+            k = 8
+            while city < 0:
+                k = min(k, len(remaining))
+                _, idx = tree.query(points[current], k=k)
+                for i in np.atleast_1d(idx):
+                    if not visited[remaining[i]]:
+                        city = int(remaining[i])
+                        break
+                k *= 2
+
+        visited[city] = True
+        tour.append(city)
+        if remaining is not None:
+            stale += 1
+        current = city
+    return tour
+
+
+def greedy_edge_tour(instance, start=0, k=10):
+    """
+    Greedy edge tour: add candidate edges shortest first, skipping edges that
+    would give a city a third tour edge or close a cycle early.
+
+    Only the k nearest neighbor edges of every city are considered, so the
+    remaining path fragments are finally joined end to end, each time to the
+    nearest free endpoint of another fragment.
+
+    Parameters
+    ----------
+    instance : TSPInstance
+        The instance to build a tour for.
+    start : int, optional
+        The tour is rotated to begin with this city. Default is 0.
+    k : int, optional
+        Candidate edges per city. Default is 10.
+
+    Returns
+    -------
+    list of int
+    """
+    n = instance.dimension
+    if n <= 3:
+        return _rotate(list(range(n)), start)
+
+    u, v, _ = _candidate_edges(instance, k)
+    degree = np.zeros(n, dtype=np.int8)
+    adjacency = [[] for _ in range(n)]
+    parent = list(range(n))
+    for a, b in zip(u.tolist(), v.tolist()):
+        if degree[a] == 2 or degree[b] == 2:
+            continue
+        root_a, root_b = _find(parent, a), _find(parent, b)
+        if root_a == root_b:
+            continue
+        parent[root_a] = root_b
+        degree[a] += 1
+        degree[b] += 1
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+
+    return _rotate(_join_fragments(instance, adjacency, degree), start)
+
+
+def space_filling_curve_tour(instance, start=0, order=16):
+    """
+    Visit the cities in the order of a Hilbert curve through the bounding box.
+
+    Runs in O(n log n) and keeps nearby cities close in the tour, at the price
+    of being roughly 25-40% longer than optimal. EXPLICIT instances without
+    coordinates fall back to the nearest neighbor tour.
+
+    Parameters
+    ----------
+    instance : TSPInstance
+        The instance to build a tour for.
+    start : int, optional
+        The tour is rotated to begin with this city. Default is 0.
+    order : int, optional
+        The bounding box is split into a 2**order by 2**order grid. Default is 16.
+
+    Returns
+    -------
+    list of int
+    """
+    if instance.coords_array is None:
+        return nearest_neighbor_tour(instance, start)
+
+    coords = instance.coords_array
+    side = (1 << order) - 1
+    lo = coords.min(axis=0)
+    span = max(float((coords.max(axis=0) - lo).max()), 1e-12)
+    x, y = (np.round((coords - lo) / span * side).astype(np.int64)).T
+    tour = np.argsort(hilbert_index(x, y, order), kind="stable").tolist()
+    return _rotate(tour, start)
+
+
+def hilbert_index(x, y, order):
+    """
+    Position of the grid cells (x, y) along a Hilbert curve of the given order.
+
+    Parameters
+    ----------
+    x, y : numpy.ndarray of int
+        Cell coordinates in [0, 2**order).
+    order : int
+
+    Returns
+    -------
+    numpy.ndarray of int64
+    """
+    x = np.array(x, dtype=np.int64)
+    y = np.array(y, dtype=np.int64)
+    index = np.zeros(len(x), dtype=np.int64)
+    last = (1 << order) - 1
+    s = 1 << (order - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        index += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the sub-curve has the canonical orientation
+        flip = ~ry & rx
+        x = np.where(flip, last - x, x)
+        y = np.where(flip, last - y, y)
+        x, y = np.where(~ry, y, x), np.where(~ry, x, y)
+        s >>= 1
+    return index
+
+
+def christofides_tour(instance, start=0, k=10):
+    """
+    Christofides-style tour with greedy matching ("Christofides-lite").
+
+    Builds a minimum spanning tree over the candidate edges, pairs up the
+    odd-degree vertices greedily (nearest pairs first) instead of with an exact
+    minimum weight matching, and shortcuts an Euler tour of the union. The
+    candidate graph keeps every step near O(n log n); it loses the 1.5
+    approximation guarantee but typically lands 10-25% above optimal.
+
+    Parameters
+    ----------
+    instance : TSPInstance
+        The instance to build a tour for.
+    start : int, optional
+        First city of the Euler tour. Default is 0.
+    k : int, optional
+        Candidate edges per city. Default is 10.
+
+    Returns
+    -------
+    list of int
+    """
+    n = instance.dimension
+    start = 0 if start is None else int(start)
+    if n <= 3:
+        return _rotate(list(range(n)), start)
+
+    adjacency = _spanning_tree(instance, k)
+    odd = np.flatnonzero(np.array([len(neighbors) % 2 for neighbors in adjacency], dtype=bool))
+    for a, b in _greedy_matching(instance, odd, k):
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+
+    # Hierholzer's algorithm, consuming edges from the adjacency lists
+    tour = []
+    seen = np.zeros(n, dtype=bool)
+    stack = [start]
+    while stack:
+        city = stack[-1]
+        if adjacency[city]:
+            other = adjacency[city].pop()
+            adjacency[other].remove(city)
+            stack.append(other)
+        else:
+            stack.pop()
+            if not seen[city]:
+                seen[city] = True
+                tour.append(city)
+    return tour
+
+
+# Constructors selectable by name through the solvers' ``init`` option
+CONSTRUCTORS = {
+    "random": random_tour,
+    "nearest_neighbor": nearest_neighbor_tour,
+    "greedy": greedy_edge_tour,
+    "space_filling_curve": space_filling_curve_tour,
+    "christofides": christofides_tour,
+}
+
+
+def construct_tour(instance, init="random", start=None):
+    """
+    Build an initial tour with a named construction heuristic.
+
+    Parameters
+    ----------
+    instance : TSPInstance
+        The instance to build a tour for.
+    init : str or callable
+        One of CONSTRUCTORS, or a function ``f(instance, start)`` returning a tour.
+    start : int, optional
+        Start city passed to the constructor (a random city by default, so
+        repeated calls give different nearest neighbor tours).
+
+    Returns
+    -------
+    list of int
+    """
+    if callable(init):
+        constructor = init
+    elif init in CONSTRUCTORS:
+        constructor = CONSTRUCTORS[init]
+    else:
+        raise ValueError(f"Unknown init strategy {init!r}, expected one of {sorted(CONSTRUCTORS)} or a callable")
+    if start is None and constructor is not random_tour:
+        start = random.randrange(instance.dimension) if instance.dimension else 0
+    return [int(city) for city in constructor(instance, start)]
+
+
+def _rotate(tour, start):
+    if not tour or start is None:
+        return tour
+    i = tour.index(int(start))
+    return tour[i:] + tour[:i]
+
+
+def _find(parent, city):
+    # Union-find lookup with path halving
+    while parent[city] != city:
+        parent[city] = parent[parent[city]]
+        city = parent[city]
+    return city
+
+
+def _candidate_edges(instance, k):
+    """
+    Undirected candidate edges (u < v), sorted by length.
+    """
+    candidates = instance.candidate_lists(k)
+    n, k = candidates.shape
+    u = np.repeat(np.arange(n), k)
+    v = candidates.ravel().astype(np.int64)
+    u, v = np.minimum(u, v), np.maximum(u, v)
+    keys = np.unique(u * n + v)
+    u, v = keys // n, keys % n
+    lengths = instance.edge_distances(u, v)
+    order = np.argsort(lengths, kind="stable")
+    return u[order], v[order], lengths[order]
+
+
+def _subset_neighbors(instance, cities, k):
+    """
+    k nearest neighbors within a subset of cities, as indices into ``cities``.
+    """
+    points = instance.spatial_points()
+    if points is not None:
+        return k_nearest_neighbors(points[cities], k)
+    dist = instance.distance_matrix
+    return matrix_k_nearest_neighbors(np.asarray(dist[cities[:, None], cities[None, :]]), k)
+
+
+def _nearest(instance, city, others):
+    """
+    Index into ``others`` of the city closest to ``city``.
+    """
+    row = instance.distance_matrix[np.full(len(others), city), others]
+    return int(np.argmin(row))
+
+
+def _spanning_tree(instance, k):
+    """
+    Minimum spanning tree (Kruskal) over the candidate edges. If the candidate
+    graph is disconnected, its components are linked through nearest cities.
+    """
+    n = instance.dimension
+    u, v, _ = _candidate_edges(instance, k)
+    parent = list(range(n))
+    adjacency = [[] for _ in range(n)]
+    edges = 0
+    for a, b in zip(u.tolist(), v.tolist()):
+        root_a, root_b = _find(parent, a), _find(parent, b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+            adjacency[a].append(b)
+            adjacency[b].append(a)
+            edges += 1
+            if edges == n - 1:
+                break
+
+    if edges < n - 1:
+        roots = np.array([_find(parent, city) for city in range(n)])
+        tree = np.flatnonzero(roots == roots[0])
+        for root in np.unique(roots):
+            if root == roots[0]:
+                continue
+            component = np.flatnonzero(roots == root)
+            a = int(component[0])
+            b = int(tree[_nearest(instance, a, tree)])
+            adjacency[a].append(b)
+            adjacency[b].append(a)
+            tree = np.concatenate([tree, component])
+    return adjacency
+
+
+def _greedy_matching(instance, odd, k):
+    """
+    Pair up the odd-degree vertices, nearest candidate pairs first. Vertices
+    left over are matched with their nearest unmatched vertex.
+    """
+    pairs = []
+    if len(odd) == 0:
+        return pairs
+    neighbors = _subset_neighbors(instance, odd, k)
+    u = np.repeat(np.arange(len(odd)), neighbors.shape[1])
+    v = neighbors.ravel()
+    lengths = instance.edge_distances(odd[u], odd[v])
+    matched = np.zeros(len(odd), dtype=bool)
+    for i in np.argsort(lengths, kind="stable").tolist():
+        a, b = u[i], v[i]
+        if not matched[a] and not matched[b]:
+            matched[a] = matched[b] = True
+            pairs.append((int(odd[a]), int(odd[b])))
+
+    left = odd[~matched]
+    while len(left):
+        a, rest = int(left[0]), left[1:]
+        b = _nearest(instance, a, rest)
+        pairs.append((a, int(rest[b])))
+        left = np.delete(rest, b)
+    return pairs
+
+
+def _join_fragments(instance, adjacency, degree):
+    """
+    Chain the path fragments left by the greedy edge heuristic into one tour,
+    always continuing with the nearest endpoint of an unused fragment.
+    """
+    n = len(adjacency)
+    # Every fragment end (degree < 2) maps to its other end
+    other_end = {}
+    seen = np.zeros(n, dtype=bool)
+    for city in np.flatnonzero(degree < 2).tolist():
+        if seen[city]:
+            continue
+        path = _walk(adjacency, city)
+        seen[path] = True
+        other_end[path[0]] = path[-1]
+        other_end[path[-1]] = path[0]
+
+    if not other_end:
+        # The greedy edges already form a single cycle
+        return _walk(adjacency, 0)
+
+    first = next(iter(other_end))
+    tour = []
+    free = np.ones(n, dtype=bool)
+    ends = np.array(sorted(other_end))
+    city = first
+    while True:
+        path = _walk(adjacency, city)
+        tour.extend(path)
+        free[path[0]] = free[path[-1]] = False
+        open_ends = ends[free[ends]]
+        if len(open_ends) == 0:
+            return tour
+        city = int(open_ends[_nearest(instance, path[-1], open_ends)])
+
+
+def _walk(adjacency, start):
+    """
+    Follow the path (or cycle) of tour edges from a fragment end.
+    """
+    path = [start]
+    previous, city = -1, start
+    while True:
+        step = [c for c in adjacency[city] if c != previous]
+        if not step or step[0] == start:
+            return path
+        previous, city = city, step[0]
+        path.append(city)
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .distance import PackedDistanceMatrix, resolve_dtype
+
+# Bump when the on-disk layout or the distance computation changes,
+# so that entries written by older versions are ignored.
+CACHE_FORMAT_VERSION = 2
+
+
+def file_digest(file_path, chunk_size=1 << 20):
+    """
+    Content hash of a file (hex string).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class InstanceCache:
+    """
+    On-disk cache of parsed instances and their distance matrices.
+
+    Every source file gets a directory named after its content hash holding
+    ``meta.json``, ``coords.npy`` and one ``matrix-*.npy`` per set of distance
+    options (edge weight type, dtype, packing, rounding). Arrays are loaded with ``mmap_mode='r'``,
+    so repeated loads are almost free and processes share the same pages.
+    Editing the source file changes its hash; other distance options get their
+    own matrix file, so stale data is never served.
+
+    Attributes
+    ----------
+    cache_dir : str
+        Root directory of the cache.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.fspath(cache_dir)
+
+    def entry_dir(self, file_path):
+        return os.path.join(self.cache_dir, f"v{CACHE_FORMAT_VERSION}-{file_digest(file_path)}")
+
+    @staticmethod
+    def matrix_key(edge_weight_type, dtype, packed, float_dist):
+        layout = "packed" if packed else "dense"
+        rounding = "float" if float_dist else "nint"
+        return f"matrix-{edge_weight_type}-{np.dtype(dtype).name}-{layout}-{rounding}.npy"
+
+    def load(self, cls, file_path, float_dist=True, **kwargs):
+        """
+        Load an instance through the cache, parsing the file only on a miss.
+
+        Parameters
+        ----------
+        cls : type
+            TSPInstance (or a subclass) used to parse and build the instance.
+        file_path : str
+            Path to the TSPLIB file.
+        float_dist : bool
+            Passed to the instance.
+        **kwargs
+            Other TSPInstance options (dtype, packed, lazy, ...).
+
+        Returns
+        -------
+        TSPInstance
+            The instance; its coordinates and (non-lazy) distance matrix are memory-mapped.
+        """
+        entry = self.entry_dir(file_path)
+        meta_path = os.path.join(entry, "meta.json")
+
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            coords_path = os.path.join(entry, "coords.npy")
+            coords = np.load(coords_path, mmap_mode="r") if os.path.exists(coords_path) else None
+            explicit = meta["edge_weight_type"] == "EXPLICIT"
+            matrix = self._load_matrix(entry, cls, file_path, float_dist, kwargs, meta) if explicit else None
+            instance = cls(
+                name=meta["name"], comment=meta["comment"], dimension=meta["dimension"],
+                coords=coords, float_dist=float_dist, edge_weight_type=meta["edge_weight_type"],
+                distance_matrix=matrix, **kwargs
+            )
+            if not explicit and not instance.lazy:
+                instance._distance_matrix = self._load_matrix(entry, cls, file_path, float_dist, kwargs, meta)
+            return instance
+
+        instance = cls.from_file(file_path, float_dist, **kwargs)
+        os.makedirs(entry, exist_ok=True)
+        if instance.coords_array is not None:
+            _save_array(os.path.join(entry, "coords.npy"), instance.coords_array)
+        if not instance.lazy:
+            self._save_matrix(entry, instance)
+        meta = {
+            "name": instance.name, "comment": instance.comment, "dimension": instance.dimension,
+            "edge_weight_type": instance.edge_weight_type,
+        }
+        _atomic_write(meta_path, lambda f: f.write(json.dumps(meta).encode()))
+        # Reload so the returned instance is backed by the memory-mapped files
+        return self.load(cls, file_path, float_dist, **kwargs)
+
+    def _save_matrix(self, entry, instance):
+        matrix = instance.distance_matrix
+        key = self.matrix_key(instance.edge_weight_type, instance.dtype, instance.packed, instance.float_dist)
+        _save_array(os.path.join(entry, key), matrix.data if instance.packed else matrix)
+
+    def _load_matrix(self, entry, cls, file_path, float_dist, kwargs, meta):
+        packed = kwargs.get("packed", False)
+        dtype = resolve_dtype(kwargs.get("dtype"), float_dist)
+        matrix_path = os.path.join(entry, self.matrix_key(meta["edge_weight_type"], dtype, packed, float_dist))
+        if not os.path.exists(matrix_path):
+            # Options not cached yet: build the matrix from a freshly parsed instance
+            self._save_matrix(entry, cls.from_file(file_path, float_dist, **kwargs))
+        data = np.load(matrix_path, mmap_mode="r")
+        if packed:
+            return PackedDistanceMatrix(data, meta["dimension"])
+        return data
+
+    def clear(self):
+        """
+        Remove all cache entries.
+        """
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+
+
+def _atomic_write(path, write):
+    """
+    Write a file through ``write(f)`` into a temporary file and rename it into place,
+    so concurrent readers never see a partial file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _save_array(path, array):
+    _atomic_write(path, lambda f: np.save(f, np.ascontiguousarray(array)))
@@ -0,0 +1,225 @@
+import json
+import os
+import random
+import signal
+import threading
+import time
+
+import numpy as np
+
+from .cache import _atomic_write, _save_array
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def save_checkpoint(solver, path):
+    """
+    Write the complete run state of a solver to the directory ``path``.
+
+    Scalars, RNG states and array metadata go to ``state.json``, every array to
+    its own ``.npy`` file. Arrays of a new checkpoint get a new generation
+    suffix and ``state.json`` is replaced atomically after they are written, so
+    an interrupted save leaves the previous checkpoint intact.
+
+    Parameters
+    ----------
+    solver : AntColony, SimulatedAnnealing or ParticleSwarmOptimization
+        An initialized solver (see SteppingSolver); its ``checkpoint_state``
+        provides the state.
+    path : str
+        Checkpoint directory, created if needed.
+    """
+    path = os.fspath(path)
+    os.makedirs(path, exist_ok=True)
+    state, arrays = solver.checkpoint_state()
+    previous = _read_state(path)
+    generation = 0 if previous is None else previous["generation"] + 1
+
+    files = {}
+    for name, array in arrays.items():
+        files[name] = f"{name}-{generation}.npy"
+        _save_array(os.path.join(path, files[name]), array)
+
+    meta = {
+        "format": CHECKPOINT_FORMAT_VERSION,
+        "solver": type(solver).__name__,
+        "generation": generation,
+        "time": time.time(),
+        "python_random": _encode_random_state(random.getstate()),
+        "arrays": files,
+        "state": state,
+    }
+    _atomic_write(os.path.join(path, "state.json"), lambda f: f.write(json.dumps(meta).encode()))
+
+    # Arrays of the previous generation are no longer referenced; other files
+    # in the directory are not ours to delete
+    if previous is not None:
+        current = set(files.values())
+        for old in previous["arrays"].values():
+            if old not in current:
+                try:
+                    os.unlink(os.path.join(path, old))
+                except FileNotFoundError:
+                    pass
+
+
+def load_checkpoint(solver, instance, path):
+    """
+    Restore a run saved by save_checkpoint into ``solver``.
+
+    The solver must be configured like the one that was saved. Arrays are
+    memory-mapped and copied straight into the solver's buffers; derived data
+    (distance heuristics, candidate lists, position indices) is rebuilt from
+    the instance. The global ``random`` state used by SA and PSO is restored
+    too, so continuing the run gives the same results as an uninterrupted one.
+
+    Parameters
+    ----------
+    solver : AntColony, SimulatedAnnealing or ParticleSwarmOptimization
+    instance : TSPInstance
+        The instance of the saved run.
+    path : str
+        Checkpoint directory.
+
+    Returns
+    -------
+    solver
+        The restored solver, ready for ``run``/``solve_step``.
+    """
+    meta = _read_state(os.fspath(path))
+    if meta is None:
+        raise FileNotFoundError(f"No checkpoint in {path}")
+    if meta["format"] != CHECKPOINT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format {meta['format']}")
+    if meta["solver"] != type(solver).__name__:
+        raise ValueError(f"Checkpoint was written by {meta['solver']}, not {type(solver).__name__}")
+    if meta["state"]["dimension"] != instance.dimension:
+        raise ValueError(
+            f"Checkpoint is for {meta['state']['dimension']} cities, the instance has {instance.dimension}"
+        )
+
+    arrays = {name: np.load(os.path.join(path, file), mmap_mode="r") for name, file in meta["arrays"].items()}
+    solver.restore_state(instance, meta["state"], arrays)
+    random.setstate(_decode_random_state(meta["python_random"]))
+    return solver
+
+
+class Checkpointer:
+    """
+    Drive a solver's run while writing checkpoints periodically and on signals.
+
+    A checkpoint is written every ``every_steps`` steps and/or ``every_seconds``
+    seconds, whenever one of ``signals`` is received (the handler only sets a
+    flag; the checkpoint is written at the next step boundary) and when the run
+    ends. SIGTERM and SIGINT additionally stop the run after the checkpoint.
+
+    Attributes
+    ----------
+    solver : SteppingSolver
+        The solver, initialized or restored with load_checkpoint.
+    path : str
+        Checkpoint directory.
+    saved : int
+        Number of checkpoints written by this object.
+    """
+
+    def __init__(self, solver, path, every_steps=None, every_seconds=None, signals=None):
+        """
+        Parameters
+        ----------
+        solver : SteppingSolver
+        path : str
+        every_steps : int, optional
+            Checkpoint every this many steps.
+        every_seconds : float, optional
+            Checkpoint when this many seconds passed since the last one.
+        signals : iterable of int, optional
+            Signals requesting a checkpoint. Default is SIGUSR1 and SIGTERM where
+            available. Handlers are only installed from the main thread.
+        """
+        self.solver = solver
+        self.path = path
+        self.every_steps = every_steps
+        self.every_seconds = every_seconds
+        if signals is None:
+            signals = [getattr(signal, name) for name in ("SIGUSR1", "SIGTERM") if hasattr(signal, name)]
+        self.signals = list(signals)
+        self.saved = 0
+        self._requested = False
+        self._stop = False
+
+    def save(self):
+        save_checkpoint(self.solver, self.path)
+        self.saved += 1
+        self._requested = False
+        self._last_save = time.monotonic()
+
+    def _on_signal(self, signum, frame):
+        self._requested = True
+        if signum in (getattr(signal, "SIGTERM", None), signal.SIGINT):
+            self._stop = True
+
+    def run(self, instance, **run_kwargs):
+        """
+        Continue the solver's run step by step with checkpointing.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+        **run_kwargs
+            Passed to ``solver.run`` (deadline, max_evaluations, on_iteration_callback, ...).
+
+        Returns
+        -------
+        bool
+            True if the run can be continued (a budget or a stop signal ended it).
+        """
+        handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in self.signals:
+                handlers[signum] = signal.signal(signum, self._on_signal)
+        self._last_save = time.monotonic()
+        self._stop = False
+        steps = 0
+        due = False
+        try:
+            while not self.solver.finished:
+                iteration = self.solver.current_iter
+                self.solver.run(instance, steps=1, **run_kwargs)
+                if self.solver.current_iter == iteration and not self.solver.finished:
+                    # A budget of run_kwargs is exhausted
+                    break
+                steps += 1
+                due = self._requested
+                if self.every_steps is not None and steps % self.every_steps == 0:
+                    due = True
+                if self.every_seconds is not None and time.monotonic() - self._last_save >= self.every_seconds:
+                    due = True
+                if due:
+                    self.save()
+                if self._stop:
+                    break
+            if not due:
+                self.save()
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+        return not self.solver.finished
+
+
+def _read_state(path):
+    state_path = os.path.join(path, "state.json")
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path) as f:
+        return json.load(f)
+
+
+def _encode_random_state(state):
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def _decode_random_state(state):
+    version, internal, gauss_next = state
+    return (version, tuple(internal), gauss_next)
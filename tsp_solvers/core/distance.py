@@ -0,0 +1,395 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+# Supported storage types for distance matrices. Integer matrices follow the
+# TSPLIB convention of rounding to the nearest integer (nint).
+DISTANCE_DTYPES = {
+    "float64": np.float64,
+    "float32": np.float32,
+    "int32": np.int32,
+}
+
+# Supported TSPLIB EDGE_WEIGHT_TYPEs computed from coordinates
+METRICS = ("EUC_2D", "CEIL_2D", "ATT", "GEO")
+
+# Constants of the TSPLIB GEO distance function
+_GEO_PI = 3.141592
+_GEO_RADIUS = 6378.388
+
+# Dense matrices larger than this are replaced by a LazyDistanceMatrix
+DEFAULT_MEMORY_LIMIT = 1 << 30
+
+# Number of rows computed per vectorized block when building a dense matrix.
+# Keeps the temporary (block, n, 2) difference array small on large instances.
+_BLOCK_ROWS = 256
+
+
+def resolve_dtype(dtype, float_dist=True):
+    """
+    Normalize a user supplied dtype to one of DISTANCE_DTYPES.
+
+    Parameters
+    ----------
+    dtype : str, numpy dtype or None
+        Requested storage type. If None, float64 is used for float distances
+        and int32 otherwise.
+    float_dist : bool
+        Whether the instance uses real-valued distances.
+
+    Returns
+    -------
+    numpy.dtype
+        The resolved dtype.
+    """
+    if dtype is None:
+        return np.dtype(np.float64 if float_dist else np.int32)
+    resolved = np.dtype(dtype)
+    if resolved.name not in DISTANCE_DTYPES:
+        raise ValueError(
+            f"Unsupported distance dtype {resolved.name!r}, expected one of {sorted(DISTANCE_DTYPES)}"
+        )
+    return resolved
+
+
+def nint(values):
+    """
+    Round distances to the nearest integer the way TSPLIB does: (int)(x + 0.5).
+    """
+    return np.floor(values + 0.5)
+
+
+def _cast(block, dtype, rounded=False):
+    if rounded or np.issubdtype(dtype, np.integer):
+        return nint(block).astype(dtype)
+    return block.astype(dtype, copy=False)
+
+
+def geo_radians(coords):
+    """
+    Convert TSPLIB GEO coordinates (DDD.MM latitude, longitude) to radians.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    degrees = np.trunc(coords)
+    return _GEO_PI * (degrees + 5.0 * (coords - degrees) / 3.0) / 180.0
+
+
+def pair_distances(a, b, metric="EUC_2D"):
+    """
+    Distances between points ``a`` and ``b`` under a TSPLIB EDGE_WEIGHT_TYPE.
+
+    Parameters
+    ----------
+    a, b : numpy.ndarray of shape (..., 2)
+        Point coordinates; the leading dimensions are broadcast.
+    metric : str
+        One of METRICS. EUC_2D distances are returned unrounded, the other
+        metrics are integral by definition.
+
+    Returns
+    -------
+    numpy.ndarray of float64
+    """
+    if metric == "GEO":
+        a, b = geo_radians(a), geo_radians(b)
+        q1 = np.cos(a[..., 1] - b[..., 1])
+        q2 = np.cos(a[..., 0] - b[..., 0])
+        q3 = np.cos(a[..., 0] + b[..., 0])
+        arc = np.arccos(np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0))
+        return np.floor(_GEO_RADIUS * arc + 1.0)
+
+    dx = a[..., 0] - b[..., 0]
+    dy = a[..., 1] - b[..., 1]
+    squared = dx * dx + dy * dy
+    if metric == "ATT":
+        r = np.sqrt(squared / 10.0)
+        t = nint(r)
+        return np.where(t < r, t + 1.0, t)
+    d = np.sqrt(squared)
+    if metric == "CEIL_2D":
+        return np.ceil(d)
+    if metric != "EUC_2D":
+        raise ValueError(f"Unsupported metric {metric!r}, expected one of {METRICS}")
+    return d
+
+
+def scalar_distance(p, q, metric="EUC_2D"):
+    """
+    Distance between two points given as (x, y) pairs, computed with Python floats.
+    Same semantics as pair_distances, but much cheaper for a single pair.
+    """
+    if metric == "EUC_2D":
+        return math.hypot(p[0] - q[0], p[1] - q[1])
+    if metric == "CEIL_2D":
+        return float(math.ceil(math.hypot(p[0] - q[0], p[1] - q[1])))
+    if metric == "ATT":
+        r = math.sqrt(((p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2) / 10.0)
+        t = math.floor(r + 0.5)
+        return float(t + 1 if t < r else t)
+    return float(pair_distances(np.asarray(p), np.asarray(q), metric))
+
+
+def distance_block(coords, rows, cols=None, metric="EUC_2D"):
+    """
+    Distances between coords[rows] and coords[cols] (all cities by default).
+
+    Parameters
+    ----------
+    coords : numpy.ndarray of shape (n, 2)
+    rows : slice or array of int
+    cols : slice or array of int, optional
+    metric : str
+        One of METRICS.
+
+    Returns
+    -------
+    numpy.ndarray of float64
+    """
+    a = coords[rows]
+    b = coords if cols is None else coords[cols]
+    return pair_distances(a[:, None, :], b[None, :, :], metric)
+
+
+def build_distance_matrix(coords, dtype=np.float64, packed=False, rounded=False, metric="EUC_2D"):
+    """
+    Build the full distance matrix with vectorized NumPy operations.
+
+    Parameters
+    ----------
+    coords : array-like of shape (n, 2)
+        City coordinates.
+    dtype : numpy dtype
+        Storage type of the result. Integer types use TSPLIB nint rounding.
+    packed : bool
+        If True, return a PackedDistanceMatrix storing only the strict upper
+        triangle (n * (n - 1) / 2 entries) instead of a dense (n, n) array.
+    rounded : bool
+        Round to the nearest integer even when ``dtype`` is a float type.
+    metric : str
+        TSPLIB distance function, one of METRICS.
+
+    Returns
+    -------
+    numpy.ndarray or PackedDistanceMatrix
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+    dtype = np.dtype(dtype)
+    n = len(coords)
+
+    if packed:
+        data = np.empty(n * (n - 1) // 2, dtype=dtype)
+        offset = 0
+        for i in range(n - 1):
+            row = distance_block(coords, slice(i, i + 1), slice(i + 1, n), metric)[0]
+            data[offset:offset + len(row)] = _cast(row, dtype, rounded)
+            offset += len(row)
+        return PackedDistanceMatrix(data, n)
+
+    matrix = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, _BLOCK_ROWS):
+        stop = min(start + _BLOCK_ROWS, n)
+        matrix[start:stop] = _cast(distance_block(coords, slice(start, stop), metric=metric), dtype, rounded)
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+class PackedDistanceMatrix:
+    """
+    Symmetric distance matrix stored as its strict upper triangle.
+
+    Supports the same access patterns as a dense matrix: ``m[i][j]``,
+    ``m[i, j]`` (also with integer arrays for fancy indexing) and ``m[i]``
+    for a full row. Uses roughly half the memory of a dense matrix.
+
+    Attributes
+    ----------
+    data : numpy.ndarray
+        Condensed upper triangle, row-major, length n * (n - 1) / 2.
+    n : int
+        Number of cities.
+    """
+
+    def __init__(self, data, n):
+        self.data = data
+        self.n = n
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def __len__(self):
+        return self.n
+
+    def index(self, i, j):
+        """
+        Position of the (i, j) entry in ``data``. Requires i != j; arrays are accepted.
+        """
+        lo = np.minimum(i, j)
+        hi = np.maximum(i, j)
+        return self.n * lo - lo * (lo + 1) // 2 + (hi - lo - 1)
+
+    def lookup(self, i, j):
+        """
+        Vectorized distance lookup for (arrays of) city pairs. Diagonal entries are 0.
+        """
+        i, j = np.broadcast_arrays(np.asarray(i, dtype=np.int64), np.asarray(j, dtype=np.int64))
+        values = np.zeros(i.shape, dtype=self.dtype)
+        off_diagonal = i != j
+        values[off_diagonal] = self.data[self.index(i[off_diagonal], j[off_diagonal])]
+        return values
+
+    def row(self, i):
+        """
+        Full row i as a dense array of length n.
+        """
+        cols = np.arange(self.n)
+        return self.lookup(np.full(self.n, i), cols)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            if np.ndim(i) == 0 and np.ndim(j) == 0:
+                if i == j:
+                    return self.dtype.type(0)
+                return self.data[self.index(int(i), int(j))]
+            return self.lookup(i, j)
+        return self.row(key)
+
+    def to_dense(self):
+        """
+        Expand into a dense (n, n) array.
+        """
+        dense = np.zeros((self.n, self.n), dtype=self.dtype)
+        rows, cols = np.triu_indices(self.n, k=1)
+        dense[rows, cols] = self.data
+        dense[cols, rows] = self.data
+        return dense
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype)
+
+
+class LazyDistanceMatrix:
+    """
+    Matrix-free distance oracle computing distances on demand.
+
+    Distances are computed from a contiguous coordinate array, so memory use is
+    O(n) instead of O(n^2). Full rows requested through ``m[i]`` (and therefore
+    ``m[i][j]``) are kept in a bounded LRU cache. A scalar ``m[i, j]`` is read
+    from the cached row of i or j when there is one and computed directly
+    otherwise; ``m[i, j]`` also accepts integer arrays of any (broadcastable) shape.
+
+    Attributes
+    ----------
+    coords : numpy.ndarray of shape (n, 2)
+        City coordinates.
+    cache_rows : int
+        Maximum number of cached rows.
+    """
+
+    def __init__(self, coords, dtype=np.float64, cache_rows=1024, rounded=False, metric="EUC_2D"):
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.n = len(self.coords)
+        self._dtype = np.dtype(dtype)
+        self._rounded = rounded or np.issubdtype(self._dtype, np.integer)
+        self.metric = metric
+        # Python floats make scalar lookups much cheaper than NumPy indexing
+        self._xy = self.coords.tolist()
+        self.cache_rows = cache_rows
+        self._rows = OrderedDict()
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def nbytes(self):
+        """
+        Memory held by the row cache.
+        """
+        return sum(row.nbytes for row in self._rows.values())
+
+    def __len__(self):
+        return self.n
+
+    def distance(self, i, j):
+        """
+        Distance between cities i and j as a Python number, taken from a cached
+        row of i or j when there is one.
+        """
+        rows = self._rows
+        if rows:
+            row = rows.get(i)
+            if row is not None:
+                rows.move_to_end(i)
+                return row.item(j)
+            row = rows.get(j)
+            if row is not None:
+                rows.move_to_end(j)
+                return row.item(i)
+        if i == j:
+            return 0
+        dist = scalar_distance(self._xy[i], self._xy[j], self.metric)
+        if self._rounded:
+            return int(math.floor(dist + 0.5))
+        if self._dtype != np.float64:
+            # Same value as in a cached row of a narrower dtype
+            return float(self._dtype.type(dist))
+        return dist
+
+    def lookup(self, i, j):
+        """
+        Vectorized distance lookup for (arrays of) city pairs.
+        """
+        i = np.asarray(i, dtype=np.intp)
+        j = np.asarray(j, dtype=np.intp)
+        values = _cast(pair_distances(self.coords[i], self.coords[j], self.metric), self._dtype, self._rounded)
+        values[np.broadcast_to(i == j, values.shape)] = 0
+        return values
+
+    def row(self, i):
+        """
+        Full row i, served from the LRU cache when possible.
+        """
+        i = int(i)
+        row = self._rows.get(i)
+        if row is not None:
+            self._rows.move_to_end(i)
+            return row
+        row = _cast(distance_block(self.coords, slice(i, i + 1), metric=self.metric)[0], self._dtype, self._rounded)
+        row[i] = 0
+        row.flags.writeable = False
+        self._rows[i] = row
+        if len(self._rows) > self.cache_rows:
+            self._rows.popitem(last=False)
+        return row
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            if np.ndim(i) == 0 and np.ndim(j) == 0:
+                return self.distance(int(i), int(j))
+            return self.lookup(i, j)
+        return self.row(key)
+
+    def clear_cache(self):
+        self._rows.clear()
+
+    def __array__(self, dtype=None, copy=None):
+        # Materializes the full matrix, only sensible for moderate sizes
+        dense = build_distance_matrix(self.coords, self._dtype, rounded=self._rounded, metric=self.metric)
+        return dense if dtype is None else dense.astype(dtype)
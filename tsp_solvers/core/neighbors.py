@@ -0,0 +1,126 @@
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - scipy is optional
+    cKDTree = None
+
+
+def k_nearest_neighbors(coords, k):
+    """
+    Find the k nearest other cities for every city.
+
+    Uses a KD-tree when scipy is available and a uniform grid otherwise.
+    Neither approach looks at the full distance matrix.
+
+    Parameters
+    ----------
+    coords : array-like of shape (n, d)
+        City coordinates (d = 2, or 3 for points on a sphere).
+    k : int
+        Number of neighbors per city. Clipped to n - 1.
+
+    Returns
+    -------
+    numpy.ndarray of int32, shape (n, k)
+        Row i lists the neighbors of city i, nearest first.
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64)
+    n = len(coords)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int32)
+
+    if cKDTree is not None:
+        _, idx = cKDTree(coords).query(coords, k=k + 1)
+        return _drop_self(idx, k)
+    if coords.shape[1] != 2:
+        diff = coords[:, None, :] - coords[None, :, :]
+        return matrix_k_nearest_neighbors(np.sqrt((diff ** 2).sum(axis=-1)), k)
+    return _grid_knn(coords, k)
+
+
+def matrix_k_nearest_neighbors(matrix, k, block_rows=256):
+    """
+    Find the k nearest other cities for every city from a distance matrix.
+
+    Only used when there is no geometry to index (EXPLICIT instances).
+
+    Parameters
+    ----------
+    matrix : numpy.ndarray or PackedDistanceMatrix
+        Distance matrix; rows are read in blocks.
+    k : int
+        Number of neighbors per city. Clipped to n - 1.
+
+    Returns
+    -------
+    numpy.ndarray of int32, shape (n, k)
+    """
+    n = len(matrix)
+    k = min(k, n - 1)
+    result = np.empty((n, max(k, 0)), dtype=np.int32)
+    if k <= 0:
+        return result
+    for start in range(0, n, block_rows):
+        rows = np.arange(start, min(start + block_rows, n))
+        block = np.array(matrix[rows[:, None], np.arange(n)[None, :]], dtype=np.float64)
+        block[np.arange(len(rows)), rows] = np.inf
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        rank = np.argsort(np.take_along_axis(block, nearest, axis=1), axis=1, kind="stable")
+        result[rows] = np.take_along_axis(nearest, rank, axis=1)
+    return result
+
+
+def _drop_self(idx, k):
+    """
+    Remove each city from its own neighbor row. With duplicate coordinates
+    the city itself is not necessarily the first hit, so it is masked out.
+    """
+    n = len(idx)
+    is_self = idx == np.arange(n)[:, None]
+    # Rows that do not contain the city itself drop their farthest hit instead
+    no_self = ~is_self.any(axis=1)
+    is_self[no_self, -1] = True
+    return idx[~is_self].reshape(n, k).astype(np.int32)
+
+
+def _grid_knn(coords, k):
+    n = len(coords)
+    lo = coords.min(axis=0)
+    span = np.maximum(coords.max(axis=0) - lo, 1e-12)
+    # About two cities per cell on average
+    side = max(1, int(np.ceil(np.sqrt(n / 2.0))))
+    cell_size = float(span.max()) / side
+    cells = np.minimum(((coords - lo) / cell_size).astype(np.int64), side - 1)
+    cell_id = cells[:, 0] * side + cells[:, 1]
+
+    order = np.argsort(cell_id, kind="stable")
+    starts = np.searchsorted(cell_id[order], np.arange(side * side + 1))
+
+    result = np.empty((n, k), dtype=np.int32)
+    for cid in np.unique(cell_id):
+        cx, cy = divmod(int(cid), side)
+        members = order[starts[cid]:starts[cid + 1]]
+        radius = 1
+        while True:
+            block = [
+                order[starts[x * side + y]:starts[x * side + y + 1]]
+                for x in range(max(0, cx - radius), min(side, cx + radius + 1))
+                for y in range(max(0, cy - radius), min(side, cy + radius + 1))
+            ]
+            pool = np.concatenate(block)
+            if len(pool) > k:
+                diff = coords[members, None, :] - coords[None, pool, :]
+                d = np.sqrt((diff ** 2).sum(axis=-1))
+                d[members[:, None] == pool[None, :]] = np.inf
+                nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+                kth = np.take_along_axis(d, nearest, axis=1).max(axis=1)
+                # The block covers at least radius * cell_size around each member
+                whole_grid = radius >= side
+                if whole_grid or np.all(kth <= radius * cell_size):
+                    rank = np.argsort(np.take_along_axis(d, nearest, axis=1), axis=1)
+                    result[members] = pool[np.take_along_axis(nearest, rank, axis=1)]
+                    break
+            radius += 1
+    return result
@@ -0,0 +1,72 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArray:
+    """
+    NumPy array backed by a named shared memory block.
+
+    The owner creates the block with ``SharedArray.create``; its child processes
+    attach to it with ``SharedArray.attach(spec)`` where ``spec`` is the small,
+    picklable ``(name, shape, dtype)`` tuple. The data itself is never pickled.
+
+    Attributes
+    ----------
+    array : numpy.ndarray
+        View of the shared block.
+    spec : tuple
+        (name, shape, dtype string) identifying the block.
+    """
+
+    def __init__(self, shm, shape, dtype, owner):
+        self._shm = shm
+        self._owner = owner
+        self.array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        self.spec = (shm.name, tuple(shape), np.dtype(dtype).str)
+
+    @classmethod
+    def create(cls, shape, dtype, fill=None):
+        """
+        Allocate a new shared block, optionally filled with ``fill`` (an array or scalar).
+        """
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        shared = cls(shared_memory.SharedMemory(create=True, size=size), shape, dtype, owner=True)
+        if fill is not None:
+            shared.array[...] = fill
+        return shared
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Copy an existing array into a new shared block.
+        """
+        array = np.asarray(array)
+        return cls.create(array.shape, array.dtype, fill=array)
+
+    @classmethod
+    def attach(cls, spec):
+        """
+        Attach to a block created by another process.
+        """
+        name, shape, dtype = spec
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 always registers the block with the resource tracker.
+            # Child processes share the owner's tracker, so this is a no-op for them.
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, shape, dtype, owner=False)
+
+    def close(self):
+        """
+        Release this process' mapping. The owner also unlinks the block.
+        """
+        if self._shm is None:
+            return
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
@@ -0,0 +1,110 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Counters reported by every solver (unused ones stay at 0). stagnation_events
+# counts how often the stagnation limit was reached: each one ends an SA or PSO
+# run, while ACO resets its pheromones and continues.
+COUNTERS = (
+    "iterations",
+    "distance_lookups",
+    "tour_evaluations",
+    "moves_proposed",
+    "moves_accepted",
+    "moves_improving",
+    "pheromone_resets",
+    "stagnation_events",
+)
+
+_DISABLED_PHASE = nullcontext()
+
+
+class SolverStats:
+    """
+    Counters and per-phase wall time of a solver run.
+
+    Solvers update the stats at the granularity of an iteration (or a temperature
+    level for SA), never inside their innermost loops, and every method returns
+    immediately while ``enabled`` is False, so a disabled instance costs nothing
+    measurable. Stats accumulate over runs until ``reset``.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether updates are recorded. Can be switched at any time.
+    counters : dict of str to int
+        Event counts, see COUNTERS.
+    phases : dict of str to float
+        Accumulated wall time in seconds per phase (e.g. "construction",
+        "update", "callback").
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.phases = {}
+        self._started = time.time()
+
+    def count(self, name, amount=1):
+        """
+        Add ``amount`` to counter ``name``.
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_time(self, phase, seconds):
+        if self.enabled:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def phase(self, name):
+        """
+        Context manager adding the wall time of its block to phase ``name``.
+        """
+        if not self.enabled:
+            return _DISABLED_PHASE
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def as_dict(self, **fields):
+        """
+        Snapshot of the stats as a JSON-serializable dict.
+
+        Parameters
+        ----------
+        **fields
+            Extra fields to include (e.g. solver name, instance name).
+        """
+        return {
+            "time": time.time(),
+            "elapsed": time.time() - self._started,
+            **fields,
+            "counters": dict(self.counters),
+            "phases": dict(self.phases),
+        }
+
+    def to_json_line(self, **fields):
+        """
+        The snapshot of ``as_dict`` as one line of JSON (without the newline).
+        """
+        return json.dumps(self.as_dict(**fields), sort_keys=True)
+
+    def write_jsonl(self, file, **fields):
+        """
+        Append a snapshot as a JSON line to an open text file or a path.
+        """
+        line = self.to_json_line(**fields) + "\n"
+        if hasattr(file, "write"):
+            file.write(line)
+        else:
+            with open(file, "a") as f:
+                f.write(line)
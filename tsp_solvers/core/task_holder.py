@@ -1,5 +1,20 @@
+import numpy as np
+
+from .distance import (
+    DEFAULT_MEMORY_LIMIT, LazyDistanceMatrix, build_distance_matrix, geo_radians, nint, resolve_dtype,
+    scalar_distance,
+)
+from .cache import InstanceCache
+from .neighbors import k_nearest_neighbors, matrix_k_nearest_neighbors
+from .tsplib import read_tsplib
+
+
 class TSPInstance:
-    def __init__(self, name, comment, dimension, coords, float_dist: bool = True):
+    def __init__(
+        self, name, comment, dimension, coords, float_dist: bool = True, dtype=None, packed: bool = False,
+        lazy=None, memory_limit: int = DEFAULT_MEMORY_LIMIT, cache_rows: int = 1024,
+        edge_weight_type: str = "EUC_2D", distance_matrix=None
+    ):
         """
         Initialize the TSP Instance.
 
@@ -11,79 +26,85 @@ class TSPInstance:
             Any comment or description about the instance.
         dimension : int
             Number of cities.
-        coords : list of (float, float)
-            A list of tuples (x, y) representing city coordinates.
+        coords : list of (float, float) or numpy.ndarray of shape (n, 2)
+            City coordinates (x, y). May be None for EXPLICIT instances.
+        float_dist : bool
+            If False, EUC_2D distances are rounded to the nearest integer (TSPLIB nint).
+            The other edge weight types are integral by definition.
+        dtype : str or numpy dtype, optional
+            Storage type of the distance matrix: "float64", "float32" or "int32".
+            Defaults to float64 for float distances and int32 otherwise.
+        packed : bool
+            Store only the upper triangle of the (symmetric) distance matrix.
+        lazy : bool, optional
+            Use a matrix-free LazyDistanceMatrix that computes distances on demand.
+            By default it is enabled when the matrix would exceed ``memory_limit`` bytes.
+        memory_limit : int
+            Size in bytes above which the lazy mode is chosen automatically.
+        cache_rows : int
+            Number of distance rows kept in the lazy mode's LRU cache.
+        edge_weight_type : str
+            TSPLIB distance function: "EUC_2D", "CEIL_2D", "ATT", "GEO" or "EXPLICIT".
+        distance_matrix : numpy.ndarray or PackedDistanceMatrix, optional
+            Precomputed distances, required for EXPLICIT instances.
         """
         self.name = name
         self.comment = comment
         self.dimension = dimension
         self.coords = coords
         self.float_dist = float_dist
-        # We can precompute the distance matrix if desired
-        self._distance_matrix = None
+        self.dtype = resolve_dtype(dtype, float_dist)
+        self.packed = packed
+        self.edge_weight_type = edge_weight_type
+        self.coords_array = None if coords is None else np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        if dimension is None:
+            self.dimension = dimension = len(self.coords_array)
+        if distance_matrix is not None:
+            # Explicit distances cannot be recomputed on demand
+            lazy = False
+        elif edge_weight_type == "EXPLICIT":
+            raise ValueError("EXPLICIT instances need a distance_matrix")
+        if lazy is None:
+            num_cities = dimension
+            entries = num_cities * (num_cities - 1) // 2 if packed else num_cities * num_cities
+            lazy = entries * self.dtype.itemsize > memory_limit
+        self.lazy = lazy
+        self.memory_limit = memory_limit
+        self.cache_rows = cache_rows
+        # The distance matrix is built lazily on first access
+        self._distance_matrix = distance_matrix
+        # Candidate neighbor lists, keyed by k
+        self._candidates = {}
 
     @classmethod
-    def from_file(cls, file_path, float_dist: bool = True):
-        name = None
-        comment_lines = []
-        dimension = None
-        coords = []
-        reading_coords = False
-
-        with open(file_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                # If we're reading the NODE_COORD_SECTION
-                if reading_coords:
-                    parts = line.split()
-                    if len(parts) >= 3 and parts[0].isdigit():
-                        x = float(parts[1])
-                        y = float(parts[2])
-                        coords.append((x, y))
-                        if dimension and len(coords) == dimension:
-                            break
-                    continue
-
-                # Try to parse known lines by splitting on ':'
-                # This handles variations like "DIMENSION : 38"
-                if ':' in line:
-                    key_val = line.split(':', 1)
-                    key = key_val[0].strip().upper()
-                    value = key_val[1].strip()
-
-                    if key == "NAME":
-                        name = value
-                    elif key == "COMMENT":
-                        comment_lines.append(value)
-                    elif key == "DIMENSION":
-                        dimension = int(value)
-                    elif key == "TYPE":
-                        # We can store or ignore TYPE if we want
-                        pass
-                    elif key == "EDGE_WEIGHT_TYPE":
-                        # Typically EUC_2D
-                        pass
-                    elif "NODE_COORD_SECTION" in key:
-                        reading_coords = True
-                        continue
-                else:
-                    # Some lines might not have ':'
-                    # For example, the line with NODE_COORD_SECTION might appear alone
-                    # Try to detect NODE_COORD_SECTION here as well
-                    if "NODE_COORD_SECTION" in line.upper():
-                        reading_coords = True
-                        continue
-
-        comment = "\n".join(comment_lines)
-
-        # Validate that we got the expected number of coords
-        if dimension is not None and len(coords) != dimension:
-            raise ValueError(f"Expected {dimension} cities, but got {len(coords)}")
-
-        return cls(name=name, comment=comment, dimension=dimension, coords=coords, float_dist=float_dist)
+    def from_file(cls, file_path, float_dist: bool = True, cache_dir=None, **kwargs):
+        """
+        Parse a TSPLIB file.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the .tsp file.
+        float_dist : bool
+            If False, distances are rounded to the nearest integer.
+        cache_dir : str, optional
+            If given, load through an InstanceCache in this directory: the parsed
+            coordinates and the distance matrix are stored as binary arrays and
+            memory-mapped on later loads.
+        **kwargs
+            Other constructor options (dtype, packed, lazy, memory_limit, cache_rows).
+        """
+        if cache_dir is not None:
+            return InstanceCache(cache_dir).load(cls, file_path, float_dist, **kwargs)
+
+        packed = kwargs.get("packed", False)
+        data = read_tsplib(file_path, resolve_dtype(kwargs.get("dtype"), float_dist), packed)
+
+        return cls(
+            name=data["name"], comment=data["comment"], dimension=data["dimension"], coords=data["coords"],
+            float_dist=float_dist, edge_weight_type=data["edge_weight_type"], distance_matrix=data["matrix"],
+            **kwargs
+        )
 
     def distance(self, i, j):
         """
@@ -99,14 +120,20 @@ class TSPInstance:
         Returns
         -------
         float
-            The Euclidean distance between city i and city j.
+            The distance between city i and city j under ``edge_weight_type``.
         """
-        (x1, y1) = self.coords[i]
-        (x2, y2) = self.coords[j]
-        dist = ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+        if self.edge_weight_type == "EXPLICIT":
+            return self.distance_matrix[i, j]
+        if i == j:
+            return 0.0
 
-        if not self.float_dist:
-            dist = int(dist)
+        dist = scalar_distance(self.coords[i], self.coords[j], self.edge_weight_type)
+
+        # Same value as the matrix entry: integer storage is nint-rounded even with float_dist
+        if not self.float_dist or np.issubdtype(self.dtype, np.integer):
+            dist = int(nint(dist))
+        elif self.dtype != np.float64:
+            dist = float(self.dtype.type(dist))
 
         return dist
 
@@ -115,25 +142,179 @@ class TSPInstance:
         """
         Compute (or return cached) full distance matrix for all cities.
 
+        The matrix is built in a single vectorized pass. Element [i][j]
+        (or [i, j]) is the distance from city i to city j.
+
         Returns
         -------
-        list of list of float
-            A 2D list (matrix) where element [i][j] is the distance
-            from city i to city j.
+        numpy.ndarray, PackedDistanceMatrix or LazyDistanceMatrix
+            A dense (n, n) array of ``self.dtype``, a packed upper-triangular
+            matrix if the instance was created with ``packed=True``, or an
+            on-demand oracle in lazy mode.
         """
         if self._distance_matrix is None:
-            self._distance_matrix = []
-            for i in range(self.dimension):
-                row = []
-                for j in range(self.dimension):
-                    if i == j:
-                        row.append(0.0)
-                    else:
-                        d = self.distance(i, j)
-                        row.append(d)
-                self._distance_matrix.append(row)
+            if self.lazy:
+                self._distance_matrix = LazyDistanceMatrix(
+                    self.coords_array, self.dtype, self.cache_rows, rounded=not self.float_dist,
+                    metric=self.edge_weight_type
+                )
+            else:
+                self._distance_matrix = build_distance_matrix(
+                    self.coords_array, self.dtype, self.packed, rounded=not self.float_dist,
+                    metric=self.edge_weight_type
+                )
         return self._distance_matrix
 
+    def candidate_lists(self, k: int = 10):
+        """
+        Compute (or return cached) the k nearest neighbors of every city.
+
+        Built with a spatial index, so it never needs the full distance matrix
+        (except for EXPLICIT instances, which have no coordinates to index).
+        Solvers use these lists to restrict their moves to short candidate edges.
+
+        Parameters
+        ----------
+        k : int
+            Number of neighbors per city (clipped to dimension - 1).
+
+        Returns
+        -------
+        numpy.ndarray of int32, shape (dimension, k)
+            Row i holds the neighbors of city i sorted by increasing distance.
+        """
+        if k not in self._candidates:
+            points = self.spatial_points()
+            if points is None:
+                self._candidates[k] = matrix_k_nearest_neighbors(self.distance_matrix, k)
+            else:
+                self._candidates[k] = k_nearest_neighbors(points, k)
+        return self._candidates[k]
+
+    def spatial_points(self):
+        """
+        Points whose Euclidean nearest neighbors are the nearest cities, for spatial indexing.
+
+        Returns
+        -------
+        numpy.ndarray or None
+            The coordinates, points on the unit sphere for GEO instances (chord
+            length is monotone in the great-circle distance), or None for
+            EXPLICIT instances, which have no geometry to index.
+        """
+        if self.edge_weight_type == "EXPLICIT":
+            return None
+        if self.edge_weight_type == "GEO":
+            lat, lon = geo_radians(self.coords_array).T
+            return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+        return self.coords_array
+
+    def edge_distances(self, u, v):
+        """
+        Distances of many city pairs at once.
+
+        Dense matrices are read with a single ``np.take`` on the flattened
+        matrix, which is markedly faster than 2-D fancy indexing; packed and
+        lazy matrices use their own vectorized lookups.
+
+        Parameters
+        ----------
+        u, v : array-like of int
+            City indices of broadcastable shapes.
+
+        Returns
+        -------
+        numpy.ndarray of float64
+            Distances with the broadcast shape of ``u`` and ``v``.
+        """
+        matrix = self.distance_matrix
+        u = np.asarray(u)
+        v = np.asarray(v)
+        if isinstance(matrix, np.ndarray) and matrix.flags.c_contiguous:
+            if u.shape != v.shape:
+                u, v = np.broadcast_arrays(u, v)
+            flat = u.astype(np.intp)
+            flat *= matrix.shape[1]
+            flat += v
+            return np.take(matrix.reshape(-1), flat).astype(np.float64, copy=False)
+        return np.asarray(matrix[u, v], dtype=np.float64)
+
+    def route_lengths(self, routes, closed=True, counts=None, chunk_size=1 << 18):
+        """
+        Lengths of many routes in one vectorized pass.
+
+        Parameters
+        ----------
+        routes : array-like of int, shape (m, k)
+            One route per row.
+        closed : bool
+            Include the edge from the last city back to the first (tours).
+            False scores open paths.
+        counts : array-like of int, shape (m,), optional
+            Partial tours: only the first ``counts[r]`` cities of row r are part
+            of its route, the rest of the row is padding and ignored. The
+            closing edge then runs from city ``counts[r] - 1`` to city 0.
+        chunk_size : int
+            Rows are processed in chunks of about this many edges, which bounds
+            the temporary index arrays for large swarms.
+
+        Returns
+        -------
+        numpy.ndarray of float64, shape (m,)
+        """
+        # Any integer dtype; int32 swarms are not widened as a whole
+        routes = np.asarray(routes)
+        if routes.ndim != 2:
+            raise ValueError(f"routes must be a 2-D array, got shape {routes.shape}")
+        m, k = routes.shape
+        lengths = np.zeros(m, dtype=np.float64)
+        if k < 2:
+            return lengths
+        if counts is not None:
+            counts = np.asarray(counts, dtype=np.intp)
+            # Edge j (routes[:, j] -> routes[:, j + 1]) exists while j + 1 < counts
+            inside = np.arange(1, k) < counts[:, None]
+
+        # Full tours gather their closing edge together with the others
+        wrap = closed and counts is None
+        rows = max(1, chunk_size // k)
+        for first in range(0, m, rows):
+            block = routes[first:first + rows]
+            if wrap:
+                edges = self.edge_distances(block, np.roll(block, -1, axis=1))
+            else:
+                edges = self.edge_distances(block[:, :-1], block[:, 1:])
+            if counts is not None:
+                edges *= inside[first:first + rows]
+            lengths[first:first + rows] = edges.sum(axis=1)
+
+        if closed and counts is not None:
+            last = routes[np.arange(m), np.clip(counts - 1, 0, k - 1)]
+            lengths += np.where(counts > 1, self.edge_distances(last, routes[:, 0]), 0.0)
+        return lengths
+
+    def segment_costs(self, route, starts, ends):
+        """
+        Lengths of many subpaths of one route, each in O(1) after an O(n) prefix sum.
+
+        Parameters
+        ----------
+        route : array-like of int
+            The route (not wrapped around).
+        starts, ends : array-like of int
+            Positions in ``route``; the cost of ``route[start..end]`` (both
+            inclusive, start <= end) is the sum of its end - start edges.
+
+        Returns
+        -------
+        numpy.ndarray of float64
+            Costs with the broadcast shape of ``starts`` and ``ends``.
+        """
+        route = np.asarray(route, dtype=np.intp)
+        prefix = np.zeros(len(route), dtype=np.float64)
+        np.cumsum(self.edge_distances(route[:-1], route[1:]), out=prefix[1:])
+        return prefix[np.asarray(ends, dtype=np.intp)] - prefix[np.asarray(starts, dtype=np.intp)]
+
     def total_distance(self, route):
         """
         Compute the total distance of a given route.
@@ -148,9 +329,7 @@ class TSPInstance:
         float
             The total round-trip distance of the route.
         """
-        dist = 0.0
-        for idx in range(len(route)):
-            current_city = route[idx]
-            next_city = route[(idx + 1) % len(route)]
-            dist += self.distance_matrix[current_city][next_city]
-        return dist
+        if len(route) == 0:
+            return 0.0
+        route = np.asarray(route, dtype=np.intp)
+        return float(self.edge_distances(route, np.roll(route, -1)).sum())
@@ -0,0 +1,508 @@
+from array import array
+import math
+
+import numpy as np
+
+# Tours of at least this many cities get a TwoLevelTour from make_tour. Below it
+# the vectorized O(n) reversals of ArrayTour win on constants: with LocalSearch on
+# uniform random instances the two break even at about 300k cities.
+TWO_LEVEL_THRESHOLD = 300000
+
+
+def make_tour(cities, two_level=None):
+    """
+    Tour object for local search: an ArrayTour, or a TwoLevelTour for large tours.
+
+    Parameters
+    ----------
+    cities : sequence of int
+        Permutation of 0..n-1 in visiting order; it is copied.
+    two_level : bool, optional
+        Force the representation. By default TwoLevelTour is used from
+        TWO_LEVEL_THRESHOLD cities on.
+    """
+    if two_level is None:
+        two_level = len(cities) >= TWO_LEVEL_THRESHOLD
+    return TwoLevelTour(cities) if two_level else ArrayTour(cities)
+
+
+class ArrayTour:
+    """
+    Tour stored as an ``array('i')`` of cities plus the inverse position index.
+
+    ``next``, ``prev`` and ``between`` are O(1); ``reverse_path`` reverses the
+    shorter side of the cycle, i.e. at most n / 2 cities. Long reversals and
+    segment moves run on int32 numpy views of the two buffers, so the arrays
+    are never resized.
+
+    Attributes
+    ----------
+    order : array.array of int
+        order[k] is the k-th city of the tour.
+    pos : array.array of int
+        pos[city] is the index of city in order.
+    """
+
+    # Reversals of at least this many cities are done with numpy
+    VECTOR_MIN = 48
+
+    def __init__(self, cities):
+        self.order = array("i", np.asarray(cities, dtype=np.int32).tobytes())
+        self.pos = array("i", bytes(4 * len(self.order)))
+        self._order = np.frombuffer(self.order, dtype=np.int32)
+        self._pos = np.frombuffer(self.pos, dtype=np.int32)
+        self._pos[self._order] = np.arange(len(self.order), dtype=np.int32)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def __getitem__(self, index):
+        return self.order[index]
+
+    def to_list(self):
+        return self.order.tolist()
+
+    def as_array(self):
+        """
+        The tour as an int32 numpy view of ``order`` (no copy).
+        """
+        return self._order
+
+    def __array__(self, dtype=None, copy=None):
+        # np.asarray(tour) copies the buffer instead of indexing city by city
+        return self._order.astype(np.int32 if dtype is None else dtype)
+
+    def next(self, city):
+        try:
+            return self.order[self.pos[city] + 1]
+        except IndexError:
+            return self.order[0]
+
+    def prev(self, city):
+        return self.order[self.pos[city] - 1]
+
+    def between(self, a, b, c):
+        """
+        Whether b lies on the tour path from a to c (in tour order, inclusive).
+        """
+        pos = self.pos
+        i, j, k = pos[a], pos[b], pos[c]
+        if i <= k:
+            return i <= j <= k
+        return j >= i or j <= k
+
+    def reverse_path(self, u, v):
+        """
+        Reverse the tour path from city u to city v (in tour order), in place.
+        The complementary path is reversed instead when it is shorter; both give
+        the same cycle.
+        """
+        order, pos = self.order, self.pos
+        n = len(order)
+        i, j = pos[u], pos[v]
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        if length < 2:
+            return
+        if length >= self.VECTOR_MIN:
+            index = np.arange(i, i + length) if i <= j else np.r_[i:n, 0:j + 1]
+            cities = self._order[index][::-1]
+            self._order[index] = cities
+            self._pos[cities] = index
+        elif i <= j:
+            order[i:j + 1] = order[i:j + 1][::-1]
+            for k in range(i, j + 1):
+                pos[order[k]] = k
+        else:
+            for _ in range(length // 2):
+                order[i], order[j] = order[j], order[i]
+                pos[order[i]] = i
+                pos[order[j]] = j
+                i = i + 1 if i + 1 < n else 0
+                j = j - 1 if j > 0 else n - 1
+
+    def move_segment(self, first, last, left, right, reverse=False):
+        """
+        Move the tour path first..last between the adjacent cities left and
+        right = next(left), which must not be on the path. The result reads
+        left, first, ..., last, right, or left, last, ..., first, right if
+        ``reverse`` is set. Shifts the cities in between, O(n).
+        """
+        order, pos = self._order, self._pos
+        n = len(order)
+        i = int(pos[first])
+        length = (int(pos[last]) - i) % n + 1
+        if i + length > n:
+            # Rotate so the segment does not wrap around the end of the array
+            order[:] = np.roll(order, -i)
+            pos[order] = np.arange(n, dtype=np.int32)
+            i = 0
+
+        segment = order[i:i + length].copy()
+        if reverse:
+            segment = segment[::-1]
+        k = int(pos[left])
+        if k > i:
+            # The cities up to left move back over the segment
+            order[i:k - length + 1] = order[i + length:k + 1]
+            order[k - length + 1:k + 1] = segment
+            lo, hi = i, k + 1
+        else:
+            order[k + 1 + length:i + length] = order[k + 1:i]
+            order[k + 1:k + 1 + length] = segment
+            lo, hi = k + 1, i + length
+        pos[order[lo:hi]] = np.arange(lo, hi, dtype=np.int32)
+
+
+class TwoLevelTour:
+    """
+    Tour stored as a two-level doubly-linked list.
+
+    The cities are grouped into about sqrt(n) segments of consecutive cities.
+    Each segment carries a reversal bit and a rank (its position in the ring of
+    segments), each city its segment and a sequence number within it. ``next``,
+    ``prev`` and ``between`` are O(1). ``reverse_path`` relinks the cities of a
+    path that lies inside one segment; otherwise it splits the segments at the
+    path ends, then relinks the whole segments in between and flips their bits.
+    Either way a reversal costs O(sqrt(n)) instead of O(n).
+
+    City links are kept in plain lists: they are read in the innermost loops of
+    local search, where list indexing is cheapest.
+    """
+
+    def __init__(self, cities, group_size=None):
+        """
+        Parameters
+        ----------
+        cities : sequence of int
+            Permutation of 0..n-1 in visiting order; it is copied.
+        group_size : int, optional
+            Target number of cities per segment. Default is about sqrt(n).
+        """
+        cities = [int(city) for city in cities]
+        n = len(cities)
+        self.group_size = group_size or max(8, math.isqrt(n))
+        self._n = n
+        self._build(cities)
+
+    def _build(self, cities):
+        n = self._n
+        count = max(2, -(-n // self.group_size)) if n >= 4 else 1
+        self.succ = [0] * n
+        self.pred = [0] * n
+        self.parent = [0] * n
+        self.seq = [0] * n
+        self.reversed = [False] * count
+        self.first = [0] * count
+        self.last = [0] * count
+        self.size = [0] * count
+        self.rank = list(range(count))
+        self.seg_next = [(s + 1) % count for s in range(count)]
+        self.seg_prev = [(s - 1) % count for s in range(count)]
+        bounds = [n * s // count for s in range(count + 1)]
+        for s in range(count):
+            self._fill(s, cities[bounds[s]:bounds[s + 1]])
+        # Segments grow when pieces are spliced into them; past this size they
+        # hand cities over to a neighbor
+        self._max_size = 2 * max(self.size)
+
+    def _fill(self, s, cities):
+        """
+        Make segment s hold ``cities`` in tour order, unreversed.
+        """
+        succ, pred, parent, seq = self.succ, self.pred, self.parent, self.seq
+        prev_city = None
+        for k, city in enumerate(cities):
+            parent[city] = s
+            seq[city] = k
+            if prev_city is not None:
+                succ[prev_city] = city
+                pred[city] = prev_city
+            prev_city = city
+        self.first[s] = cities[0]
+        self.last[s] = cities[-1]
+        self.size[s] = len(cities)
+        self.reversed[s] = False
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        start = self._head(0)
+        city = start
+        for _ in range(self._n):
+            yield city
+            city = self.next(city)
+
+    def to_list(self):
+        return list(self)
+
+    def as_array(self):
+        """
+        The tour as an int32 numpy array, starting at the head of a segment.
+        """
+        return np.fromiter(self, dtype=np.int32, count=self._n)
+
+    def _head(self, s):
+        return self.last[s] if self.reversed[s] else self.first[s]
+
+    def _tail(self, s):
+        return self.first[s] if self.reversed[s] else self.last[s]
+
+    def next(self, city):
+        s = self.parent[city]
+        if self.reversed[s]:
+            if city == self.first[s]:
+                return self._head(self.seg_next[s])
+            return self.pred[city]
+        if city == self.last[s]:
+            return self._head(self.seg_next[s])
+        return self.succ[city]
+
+    def prev(self, city):
+        s = self.parent[city]
+        if self.reversed[s]:
+            if city == self.last[s]:
+                return self._tail(self.seg_prev[s])
+            return self.succ[city]
+        if city == self.first[s]:
+            return self._tail(self.seg_prev[s])
+        return self.pred[city]
+
+    def _key(self, city):
+        s = self.parent[city]
+        return self.rank[s], -self.seq[city] if self.reversed[s] else self.seq[city]
+
+    def between(self, a, b, c):
+        """
+        Whether b lies on the tour path from a to c (in tour order, inclusive).
+        """
+        i, j, k = self._key(a), self._key(b), self._key(c)
+        if i <= k:
+            return i <= j <= k
+        return j >= i or j <= k
+
+    def _split(self, city, keep_head=None):
+        """
+        Make city the head of its segment by splicing the smaller of the two
+        pieces around it into the neighboring segment. The piece that would
+        take ``keep_head`` away from the head of its segment is never moved.
+        Returns the segment that grew, if any.
+        """
+        s = self.parent[city]
+        head = self._head(s)
+        if city == head:
+            return None
+        to_prev = 2 * self._offset(city) <= self.size[s]
+        if keep_head is not None:
+            if keep_head == head:
+                to_prev = False
+            elif keep_head == self._head(self.seg_next[s]):
+                to_prev = True
+        return self._move_piece(city, to_prev)
+
+    def _offset(self, city):
+        # Position of city in its segment, in tour order
+        s = self.parent[city]
+        if self.reversed[s]:
+            return self.seq[self.last[s]] - self.seq[city]
+        return self.seq[city] - self.seq[self.first[s]]
+
+    def _move_piece(self, city, to_prev):
+        """
+        Splice the cities of city's segment before city (in tour order) behind
+        the tail of the previous segment, or city and the cities after it in
+        front of the head of the next segment. O(size of the piece).
+        """
+        succ, pred, parent, seq = self.succ, self.pred, self.parent, self.seq
+        s = parent[city]
+        rev = self.reversed[s]
+        cut = self._offset(city)
+        step = pred if rev else succ
+        piece = []
+        c = self._head(s) if to_prev else city
+        for _ in range(cut if to_prev else self.size[s] - cut):
+            piece.append(c)
+            c = step[c]
+        if to_prev:
+            if rev:
+                self.last[s] = city
+            else:
+                self.first[s] = city
+            grown = self.seg_prev[s]
+            t = self._tail(grown)
+            forward = not self.reversed[grown]
+        else:
+            if rev:
+                self.first[s] = succ[city]
+            else:
+                self.last[s] = pred[city]
+            # Prepending in tour order is appending backwards from the head
+            piece.reverse()
+            grown = self.seg_next[s]
+            t = self._head(grown)
+            forward = self.reversed[grown]
+        self.size[s] -= len(piece)
+        self.size[grown] += len(piece)
+        for c in piece:
+            parent[c] = grown
+            if forward:
+                seq[c] = seq[t] + 1
+                succ[t] = c
+                pred[c] = t
+            else:
+                seq[c] = seq[t] - 1
+                pred[t] = c
+                succ[c] = t
+            t = c
+        if forward:
+            self.last[grown] = t
+        else:
+            self.first[grown] = t
+        return grown
+
+    def _rebalance(self, s):
+        """
+        Move cities of an oversized segment s into its smaller neighbor until
+        the two have about the same size.
+        """
+        p, q = self.seg_prev[s], self.seg_next[s]
+        if self.size[p] <= self.size[q]:
+            count = (self.size[s] - self.size[p]) // 2
+            if count > 0:
+                city = self._head(s)
+                step = self.pred if self.reversed[s] else self.succ
+                for _ in range(count):
+                    city = step[city]
+                self._move_piece(city, True)
+        else:
+            count = (self.size[s] - self.size[q]) // 2
+            if count > 0:
+                city = self._tail(s)
+                step = self.succ if self.reversed[s] else self.pred
+                for _ in range(count - 1):
+                    city = step[city]
+                self._move_piece(city, False)
+
+    def _reverse_segments(self, first, last):
+        """
+        Reverse the run of whole segments first..last (in ring order).
+        """
+        run = [first]
+        while run[-1] != last:
+            run.append(self.seg_next[run[-1]])
+        before, after = self.seg_prev[first], self.seg_next[last]
+        ranks = [self.rank[s] for s in run]
+        seg_next, seg_prev, rev = self.seg_next, self.seg_prev, self.reversed
+        for s, r in zip(reversed(run), ranks):
+            seg_next[s], seg_prev[s] = seg_prev[s], seg_next[s]
+            rev[s] = not rev[s]
+            self.rank[s] = r
+        seg_next[before] = last
+        seg_prev[last] = before
+        seg_next[first] = after
+        seg_prev[after] = first
+
+    def reverse_path(self, u, v):
+        """
+        Reverse the tour path from city u to city v (in tour order), in place.
+        The complementary path is reversed instead when it spans fewer
+        segments; both give the same cycle.
+        """
+        w = self.next(v)
+        if w == u or u == v:
+            # The whole cycle or a single city
+            return
+        if len(self.size) == 1:
+            self._reverse_list(u, v)
+            return
+        # A path inside one segment (or with such a complement) is reversed in place
+        parent = self.parent
+        if parent[u] == parent[v] and self._offset(u) <= self._offset(v):
+            self._reverse_inside(u, v)
+            return
+        x = self.prev(u)
+        if parent[w] == parent[x] and self._offset(w) <= self._offset(x):
+            self._reverse_inside(w, x)
+            return
+        grown = [self._split(u), self._split(w, keep_head=u)]
+        first, last = self.parent[u], self.parent[v]
+        count = 1
+        s = first
+        while s != last:
+            s = self.seg_next[s]
+            count += 1
+        if 2 * count > len(self.size):
+            first, last = self.seg_next[last], self.seg_prev[first]
+        self._reverse_segments(first, last)
+        for s in grown:
+            if s is not None and self.size[s] > self._max_size:
+                self._rebalance(s)
+
+    def _reverse_inside(self, u, v):
+        """
+        Reverse the path u..v lying inside one segment by relinking its cities, O(length).
+        """
+        s = self.parent[u]
+        succ, pred, seq = self.succ, self.pred, self.seq
+        if self.reversed[s]:
+            u, v = v, u
+        # Cities of the path in raw (sequence number) order
+        cities = [u]
+        while cities[-1] != v:
+            cities.append(succ[cities[-1]])
+        before = None if u == self.first[s] else pred[u]
+        after = None if v == self.last[s] else succ[v]
+        numbers = [seq[c] for c in cities]
+        cities.reverse()
+        for c, number in zip(cities, numbers):
+            seq[c] = number
+        for a, b in zip(cities, cities[1:]):
+            succ[a] = b
+            pred[b] = a
+        if before is None:
+            self.first[s] = cities[0]
+        else:
+            succ[before] = cities[0]
+            pred[cities[0]] = before
+        if after is None:
+            self.last[s] = cities[-1]
+        else:
+            pred[after] = cities[-1]
+            succ[cities[-1]] = after
+
+    def _reverse_list(self, u, v):
+        # Single segment (tiny tours): rewrite it with the path reversed
+        cities = self.to_list()
+        i = cities.index(u)
+        cities = cities[i:] + cities[:i]
+        j = cities.index(v)
+        cities[:j + 1] = cities[j::-1]
+        self._fill(0, cities)
+
+    def move_segment(self, first, last, left, right, reverse=False):
+        """
+        Move the tour path first..last between the adjacent cities left and
+        right = next(left), which must not be on the path. The result reads
+        left, first, ..., last, right, or left, last, ..., first, right if
+        ``reverse`` is set. Done with three reversals.
+        """
+        p = self.prev(first)
+        nx = self.next(last)
+        # p [first..last] [nx..left] right  ->  p [left..nx] [last..first] right
+        self.reverse_path(first, left)
+        # -> p [nx..left] [last..first] right (read in either direction)
+        if self.next(p) == left:
+            self.reverse_path(left, nx)
+        else:
+            self.reverse_path(nx, left)
+        if not reverse:
+            if self.next(left) == last:
+                self.reverse_path(last, first)
+            else:
+                self.reverse_path(first, last)
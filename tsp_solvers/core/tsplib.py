@@ -0,0 +1,211 @@
+import os
+
+import numpy as np
+
+from .distance import METRICS, PackedDistanceMatrix
+
+# EDGE_WEIGHT_FORMATs of EXPLICIT instances: which triangle each row covers.
+# (first column of row i relative to i, or None for "from column 0";
+#  last column of row i relative to i, or None for "up to column n - 1")
+EXPLICIT_FORMATS = {
+    "FULL_MATRIX": (None, None),
+    "UPPER_ROW": (1, None),
+    "UPPER_DIAG_ROW": (0, None),
+    "LOWER_ROW": (None, -1),
+    "LOWER_DIAG_ROW": (None, 0),
+}
+# Common alias used by TSPLIB files
+EXPLICIT_FORMATS["LOWER_DIAG"] = EXPLICIT_FORMATS["LOWER_DIAG_ROW"]
+
+
+def read_tsplib(file_path, dtype=np.float64, packed=False):
+    """
+    Parse a TSPLIB file, reading numeric sections in bulk.
+
+    NODE_COORD_SECTION (and DISPLAY_DATA_SECTION) are read with a single
+    ``np.fromfile`` call into a float array. EDGE_WEIGHT_SECTION of EXPLICIT
+    instances is read row by row straight into the distance matrix storage.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the .tsp file.
+    dtype : numpy dtype
+        Storage type of an explicit distance matrix.
+    packed : bool
+        Store an explicit (symmetric) matrix as a PackedDistanceMatrix.
+
+    Returns
+    -------
+    dict
+        Keys: ``name``, ``comment``, ``dimension``, ``edge_weight_type``,
+        ``coords`` (numpy.ndarray of shape (n, 2) or None) and ``matrix``
+        (distance matrix for EXPLICIT instances, otherwise None).
+    """
+    header = {}
+    comment_lines = []
+    coords = None
+    display_coords = None
+    matrix = None
+
+    with open(file_path, "rb") as f:
+        while True:
+            raw = f.readline()
+            if not raw:
+                break
+            line = raw.decode().strip()
+            if not line:
+                continue
+
+            # Handles "KEY: value", "KEY : value" and bare section names
+            key, _, value = line.partition(":")
+            key = key.strip().upper()
+            value = value.strip()
+
+            if key == "EOF":
+                break
+            elif key == "COMMENT":
+                comment_lines.append(value)
+            elif key == "NODE_COORD_SECTION":
+                coords = _read_coords(f, _dimension(header))
+            elif key == "DISPLAY_DATA_SECTION":
+                display_coords = _read_coords(f, _dimension(header))
+            elif key == "EDGE_WEIGHT_SECTION":
+                matrix = _read_edge_weights(
+                    f, _dimension(header), header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper(), dtype, packed
+                )
+            elif key.endswith("_SECTION"):
+                raise ValueError(f"Unsupported TSPLIB section {key}")
+            else:
+                header[key] = value
+
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    if edge_weight_type == "EXPLICIT":
+        if matrix is None:
+            raise ValueError("EXPLICIT instance without EDGE_WEIGHT_SECTION")
+        coords = coords if coords is not None else display_coords
+    elif edge_weight_type not in METRICS:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE {edge_weight_type}, expected one of {METRICS + ('EXPLICIT',)}")
+    elif coords is None:
+        raise ValueError("Missing NODE_COORD_SECTION")
+
+    return {
+        "name": header.get("NAME"),
+        "comment": "\n".join(comment_lines),
+        "dimension": _dimension(header),
+        "edge_weight_type": edge_weight_type,
+        "coords": coords,
+        "matrix": matrix,
+    }
+
+
+def write_tour(file_path, tour, name=None, comment=None):
+    """
+    Write a tour in the TSPLIB ``.tour`` format (1-based city numbers, ``-1`` terminated).
+
+    Parameters
+    ----------
+    file_path : str
+        Output path.
+    tour : sequence of int
+        0-based city indices in visiting order.
+    name : str, optional
+        NAME field; defaults to the file name.
+    comment : str, optional
+        COMMENT field, e.g. the tour length.
+    """
+    if name is None:
+        name = os.path.basename(file_path)
+    lines = [f"NAME : {name}"]
+    if comment:
+        lines.append(f"COMMENT : {comment}")
+    lines += ["TYPE : TOUR", f"DIMENSION : {len(tour)}", "TOUR_SECTION"]
+    lines += [str(city) for city in np.asarray(tour, dtype=np.int64) + 1]
+    lines += ["-1", "EOF", ""]
+    with open(file_path, "w") as f:
+        f.write("\n".join(lines))
+
+
+def _dimension(header):
+    if "DIMENSION" not in header:
+        raise ValueError("DIMENSION must be given before the data sections")
+    return int(header["DIMENSION"])
+
+
+def _read_numbers(f, count):
+    values = np.fromfile(f, dtype=np.float64, count=count, sep=" ")
+    if len(values) != count:
+        raise ValueError(f"Expected {count} numbers, but got {len(values)}")
+    return values
+
+
+def _read_coords(f, dimension):
+    """
+    Read ``dimension`` lines of "index x y" into an (n, 2) array ordered by index.
+    """
+    values = _read_numbers(f, 3 * dimension).reshape(dimension, 3)
+    index = values[:, 0].astype(np.int64) - 1
+    if np.array_equal(index, np.arange(dimension)):
+        return np.ascontiguousarray(values[:, 1:3])
+    if index.min() < 0 or index.max() >= dimension or np.bincount(index, minlength=dimension).max() != 1:
+        raise ValueError(f"Expected {dimension} cities numbered 1..{dimension}")
+    coords = np.empty((dimension, 2), dtype=np.float64)
+    coords[index] = values[:, 1:3]
+    return coords
+
+
+def _read_edge_weights(f, dimension, edge_weight_format, dtype, packed):
+    """
+    Read an EDGE_WEIGHT_SECTION row by row into a dense or packed matrix.
+    Triangular formats are mirrored, FULL_MATRIX is kept as is (it may be asymmetric).
+    A packed matrix is symmetric, so an asymmetric FULL_MATRIX raises ValueError there.
+    """
+    if edge_weight_format not in EXPLICIT_FORMATS:
+        raise ValueError(
+            f"Unsupported EDGE_WEIGHT_FORMAT {edge_weight_format}, expected one of {sorted(EXPLICIT_FORMATS)}"
+        )
+    first, last = EXPLICIT_FORMATS[edge_weight_format]
+    n = dimension
+
+    if packed:
+        storage = PackedDistanceMatrix(np.empty(n * (n - 1) // 2, dtype=dtype), n)
+    else:
+        storage = np.zeros((n, n), dtype=dtype)
+
+    for i in range(n):
+        start = 0 if first is None else i + first
+        stop = n if last is None else i + last + 1
+        count = max(0, stop - start)
+        if count == 0:
+            continue
+        row = _read_numbers(f, count)
+        if packed:
+            # Only the strict upper triangle is stored
+            if start <= i:
+                cols = np.arange(start, min(stop, i))
+                if edge_weight_format == "FULL_MATRIX":
+                    # The upper triangle came first; the lower one must mirror it
+                    if not np.array_equal(storage.data[storage.index(cols, i)], row[:len(cols)].astype(dtype)):
+                        raise ValueError(
+                            f"FULL_MATRIX is not symmetric (row {i + 1}), it cannot be stored packed; "
+                            "load it with packed=False"
+                        )
+                else:
+                    storage.data[storage.index(cols, i)] = row[:len(cols)]
+            if stop > i + 1:
+                offset = max(start, i + 1)
+                head = storage.index(i, i + 1)
+                storage.data[head + offset - i - 1:head + stop - i - 1] = row[offset - start:]
+        else:
+            storage[i, start:stop] = row
+
+    if not packed:
+        if first is not None:
+            # Upper triangle given: mirror it below the diagonal
+            for i in range(1, n):
+                storage[i, :i] = storage[:i, i]
+        elif last is not None:
+            for i in range(n - 1):
+                storage[i, i + 1:] = storage[i + 1:, i]
+        np.fill_diagonal(storage, 0)
+    return storage
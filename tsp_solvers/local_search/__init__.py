@@ -0,0 +1,2 @@
+from .two_opt import LocalSearch
+from .lin_kernighan import LinKernighan
@@ -0,0 +1,210 @@
+import time
+from collections import deque
+
+from ..core.tour import make_tour
+from .two_opt import LocalSearch
+
+
+class LinKernighan(LocalSearch):
+    """
+    Lin-Kernighan style variable-depth k-opt improvement.
+
+    A move starts by breaking a tour edge (t1, t2) and then repeatedly adds an
+    edge (t2, t3) to a candidate neighbor and breaks the tour edge (t3, t4) that
+    keeps the tour closable, so that the last city t4 takes the role of t2 in the
+    next step. Each step is carried out as a 2-opt exchange, hence the tour is a
+    valid Hamiltonian cycle at every level and a k-opt move is a chain of k - 1
+    such exchanges. The chain is extended while the partial gain stays positive
+    and is committed as soon as closing it with (t4, t1) shortens the tour;
+    otherwise it is undone. Added edges are never broken again within a move.
+
+    The first levels try several alternatives (``breadth``), deeper levels follow
+    only the most promising one, up to ``max_depth`` exchanges. Cities are
+    scheduled with don't-look bits as in LocalSearch, and Or-opt moves are tried
+    when no k-opt move improves a city.
+
+    Attributes
+    ----------
+    max_depth : int
+        Maximum number of exchanges in one move.
+    breadth : tuple of int
+        Number of alternatives tried at the first levels.
+    time_limit : float or None
+        Wall-clock limit in seconds for one ``improve`` call.
+    history : list of tuple
+        (seconds since the start of the last ``improve`` call, tour length)
+        after every improving move, starting with the initial tour. Gives the
+        time-to-quality profile of the run.
+    """
+
+    def __init__(self, neighbors=10, or_opt=True, max_segment=3, max_depth=50, breadth=(5, 3), time_limit=None,
+                 two_level=None):
+        """
+        Parameters
+        ----------
+        neighbors : int, optional
+            Candidate list size. Default is 10.
+        or_opt : bool, optional
+            Enable Or-opt moves. Default is True.
+        max_segment : int, optional
+            Longest segment moved by Or-opt. Default is 3.
+        max_depth : int, optional
+            Maximum number of exchanges in one move. Default is 50.
+        breadth : tuple of int, optional
+            Alternatives tried at the first levels. Default is (5, 3).
+        time_limit : float, optional
+            Stop improving after this many seconds. Default is None (no limit).
+        two_level : bool, optional
+            Tour representation, see LocalSearch.
+        """
+        super().__init__(neighbors, or_opt, max_segment, two_level)
+        self.max_depth = max_depth
+        self.breadth = tuple(breadth)
+        self.time_limit = time_limit
+        self.history = []
+
+    def improve(self, instance, tour, active=None):
+        """
+        Apply improving k-opt (and Or-opt) moves until a local optimum is
+        reached or the time limit expires.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance the tour belongs to.
+        tour : sequence of int
+            Initial tour, e.g. the best solution of a metaheuristic; it is copied.
+        active : iterable of int, optional
+            Cities to start from. By default all cities are active.
+
+        Returns
+        -------
+        tuple
+            The improved tour (list of int) and its total distance.
+        """
+        tour = [int(city) for city in tour]
+        n = len(tour)
+        start = time.perf_counter()
+        length = instance.total_distance(tour)
+        self.history = [(0.0, length)]
+        if n < 5:
+            return tour, length
+
+        dist = instance.distance_matrix
+        candidates = instance.candidate_lists(self.neighbors).tolist()
+        self._tour = make_tour(tour, self.two_level)
+        # Bound once, these are the innermost calls of the search
+        self._next, self._prev = self._tour.next, self._tour.prev
+
+        queue = deque(range(n) if active is None else active)
+        queued = [False] * n
+        for city in queue:
+            queued[city] = True
+
+        deadline = None if self.time_limit is None else start + self.time_limit
+        while queue:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            a = queue.popleft()
+            queued[a] = False
+            touched = self._improve_city(a, dist, candidates)
+            if touched is None and self.or_opt:
+                touched = self._or_opt_city(a, dist, candidates)
+            if touched is not None:
+                # Tracked from the move gains: summing a large tour after every move would dominate
+                length -= float(self._gain)
+                self.history.append((time.perf_counter() - start, length))
+                for city in touched:
+                    if not queued[city]:
+                        queued[city] = True
+                        queue.append(city)
+
+        tour = self._tour.to_list()
+        self._tour = self._next = self._prev = None
+        length = instance.total_distance(tour)
+        self.history.append((time.perf_counter() - start, length))
+        return tour, length
+
+    def time_to_quality(self, target):
+        """
+        Seconds until the last ``improve`` call first reached a tour of length
+        at most ``target``, or None if it never did.
+        """
+        for elapsed, length in self.history:
+            if length <= target:
+                return elapsed
+        return None
+
+    def _improve_city(self, t1, dist, candidates):
+        """
+        Search a k-opt move starting at t1, in both tour directions. Returns the
+        cities whose tour edges changed, or None if no improving move was found.
+        """
+        for t2 in (self._next(t1), self._prev(t1)):
+            moves = []
+            self._best_gain = 1e-9
+            self._best_depth = 0
+            if self._step(t1, t2, dist[t1, t2], 0, dist, candidates, moves, []):
+                self._gain = self._best_gain
+                return {city for move in moves for city in move}
+        return None
+
+    def _step(self, t1, t2, gain, level, dist, candidates, moves, added):
+        """
+        Extend the move whose open end is the tour edge (t1, t2) by one exchange.
+        ``gain`` is the total length of the broken edges minus the added ones,
+        counting (t1, t2) as broken. The best closed move seen along the chain is
+        remembered; when the chain cannot be extended any further it is cut back
+        to that move and True is returned. Otherwise the tour is left as it was
+        on entry and False is returned.
+        """
+        # t4 must lie on the same side of t3 as t1 lies of t2 for the exchange to close the tour
+        forward = self._next(t2) == t1
+        alternatives = []
+        for t3 in candidates[t2]:
+            g1 = gain - dist[t2, t3]
+            if g1 <= 1e-9:
+                # Candidates are sorted, no later one keeps the gain positive
+                break
+            if t3 == t1 or t3 == self._next(t2) or t3 == self._prev(t2):
+                continue
+            t4 = self._next(t3) if forward else self._prev(t3)
+            if t4 == t1 or (t3, t4) in added or (t4, t3) in added:
+                continue
+            alternatives.append((dist[t3, t4] - dist[t2, t3], t3, t4))
+
+        alternatives.sort(reverse=True)
+        limit = self.breadth[level] if level < len(self.breadth) else 1
+        for _, t3, t4 in alternatives[:limit]:
+            self._exchange(t2, t1, t3, t4)
+            moves.append((t2, t1, t3, t4))
+            added.append((t2, t3))
+            g2 = gain - dist[t2, t3] + dist[t3, t4]
+            if g2 - dist[t4, t1] > self._best_gain:
+                self._best_gain = g2 - dist[t4, t1]
+                self._best_depth = len(moves)
+            if level + 1 < self.max_depth and self._step(t1, t4, g2, level + 1, dist, candidates, moves, added):
+                return True
+            if self._best_depth:
+                # Dead end below an improving move: keep the chain up to the best one
+                while len(moves) > self._best_depth:
+                    a, b, c, d = moves.pop()
+                    self._exchange(a, c, b, d)
+                return True
+            added.pop()
+            a, b, c, d = moves.pop()
+            self._exchange(a, c, b, d)
+        return False
+
+    def _exchange(self, a, b, c, d):
+        """
+        Replace the tour edges (a, b) and (c, d) by (a, c) and (b, d). Requires b
+        and d to lie on the same side of a and c respectively (both successors or
+        both predecessors). Applying it to (a, c, b, d) undoes the exchange.
+        """
+        if self._next(a) == b:
+            # a b ... c d  ->  a c ... b d
+            self._reverse_path(b, c)
+        else:
+            # d c ... b a  ->  d b ... c a
+            self._reverse_path(c, b)
@@ -0,0 +1,190 @@
+from collections import deque
+
+from ..core.tour import make_tour
+
+
+class LocalSearch:
+    """
+    2-opt and Or-opt local search over candidate neighbor lists.
+
+    Polishes a tour until no improving 2-opt move and no improving Or-opt move
+    (moving a segment of up to ``max_segment`` cities elsewhere in the tour)
+    exists among the candidate edges. Cities whose neighborhood did not yield an
+    improvement are switched off with a don't-look bit and only reconsidered when
+    one of their tour edges changes. Moves are applied in place on a tour object
+    (see core.tour.make_tour), reversing the shorter side of the cycle for 2-opt;
+    large tours use a two-level list with O(sqrt(n)) reversals.
+
+    Attributes
+    ----------
+    neighbors : int
+        Size of the candidate lists (see TSPInstance.candidate_lists).
+    or_opt : bool
+        Whether to try Or-opt segment moves in addition to 2-opt.
+    max_segment : int
+        Longest segment moved by Or-opt.
+    two_level : bool or None
+        Tour representation, see core.tour.make_tour (None: chosen by size).
+    """
+
+    def __init__(self, neighbors=10, or_opt=True, max_segment=3, two_level=None):
+        """
+        Parameters
+        ----------
+        neighbors : int, optional
+            Candidate list size. Default is 10.
+        or_opt : bool, optional
+            Enable Or-opt moves. Default is True.
+        max_segment : int, optional
+            Longest segment moved by Or-opt. Default is 3.
+        two_level : bool, optional
+            Force (True) or disable (False) the two-level list tour. By default
+            it is used from core.tour.TWO_LEVEL_THRESHOLD cities on.
+        """
+        self.neighbors = neighbors
+        self.or_opt = or_opt
+        self.max_segment = max_segment
+        self.two_level = two_level
+
+    def improve(self, instance, tour, active=None):
+        """
+        Apply improving moves until a local optimum is reached.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance the tour belongs to.
+        tour : sequence of int
+            Initial tour; it is copied, not modified.
+        active : iterable of int, optional
+            Cities to start from. By default all cities are active; passing only
+            the endpoints of recently changed edges makes repeated calls cheap.
+
+        Returns
+        -------
+        tuple
+            The improved tour (list of int) and its total distance.
+        """
+        tour = [int(city) for city in tour]
+        n = len(tour)
+        if n < 5:
+            return tour, instance.total_distance(tour)
+
+        dist = instance.distance_matrix
+        candidates = instance.candidate_lists(self.neighbors).tolist()
+        self._tour = make_tour(tour, self.two_level)
+        # Bound once, these are the innermost calls of the search
+        self._next, self._prev = self._tour.next, self._tour.prev
+
+        queue = deque(range(n) if active is None else active)
+        queued = [False] * n
+        for city in queue:
+            queued[city] = True
+
+        while queue:
+            a = queue.popleft()
+            queued[a] = False
+            touched = self._improve_city(a, dist, candidates[a])
+            if touched is None and self.or_opt:
+                touched = self._or_opt_city(a, dist, candidates)
+            if touched is not None:
+                for city in touched:
+                    if not queued[city]:
+                        queued[city] = True
+                        queue.append(city)
+
+        tour = self._tour.to_list()
+        self._tour = self._next = self._prev = None
+        return tour, instance.total_distance(tour)
+
+    def _improve_city(self, a, dist, candidates):
+        """
+        Try the 2-opt moves that add a candidate edge (a, c). Returns the cities
+        whose tour edges changed, or None if no improving move was found.
+        """
+        for forward in (True, False):
+            b = self._next(a) if forward else self._prev(a)
+            d_ab = dist[a, b]
+            for c in candidates:
+                d_ac = dist[a, c]
+                if d_ac >= d_ab:
+                    # Candidates are sorted, no later one can give a gain
+                    break
+                d = self._next(c) if forward else self._prev(c)
+                if c == b or d == a:
+                    continue
+                delta = d_ac + dist[b, d] - d_ab - dist[c, d]
+                if delta < -1e-9:
+                    # Length decrease of the applied move
+                    self._gain = -delta
+                    if forward:
+                        # a b ... c d  ->  a c ... b d
+                        self._reverse_path(b, c)
+                    else:
+                        # d c ... b a  ->  d b ... c a
+                        self._reverse_path(c, b)
+                    return (a, b, c, d)
+        return None
+
+    def _or_opt_city(self, a, dist, candidates):
+        """
+        Try moving the segment of 1..max_segment cities starting at a (in tour
+        order) next to one of a's candidate neighbors, in either orientation.
+        """
+        n = len(self._tour)
+        s1 = a
+        s2 = a
+        for length in range(1, self.max_segment + 1):
+            if length > 1:
+                s2 = self._next(s2)
+            p = self._prev(s1)
+            nx = self._next(s2)
+            if nx == p or length + 2 > n:
+                break
+            removal_gain = dist[p, s1] + dist[s2, nx] - dist[p, nx]
+            if removal_gain <= 1e-9:
+                continue
+            segment = set(self._segment(s1, length))
+            for end in (s1, s2):
+                for c in candidates[end]:
+                    if c in segment:
+                        continue
+                    d_end = dist[end, c]
+                    if d_end >= removal_gain:
+                        break
+                    # Insert between c and its successor or its predecessor,
+                    # with `end` adjacent to c
+                    for after in (True, False):
+                        e = self._next(c) if after else self._prev(c)
+                        if e in segment:
+                            continue
+                        other = s2 if end == s1 else s1
+                        added = d_end + dist[other, e] - dist[c, e]
+                        if removal_gain - added > 1e-9:
+                            self._gain = removal_gain - added
+                            self._move_segment(s1, length, c, e, end, after)
+                            return (p, nx, s1, s2, c, e)
+        return None
+
+    def _segment(self, start, length):
+        cities = [start]
+        for _ in range(length - 1):
+            cities.append(self._next(cities[-1]))
+        return cities
+
+    def _reverse_path(self, u, v):
+        """
+        Reverse the tour path from city u to city v (in tour order), in place.
+        The complementary path is reversed instead when it is shorter; both give
+        the same cycle.
+        """
+        self._tour.reverse_path(u, v)
+
+    def _move_segment(self, s1, length, c, e, end, after):
+        """
+        Move the segment of ``length`` cities starting at s1 between c and e,
+        so that ``end`` (s1 or the last city of the segment) is adjacent to c.
+        """
+        s2 = self._segment(s1, length)[-1]
+        left, right = (c, e) if after else (e, c)
+        self._tour.move_segment(s1, s2, left, right, reverse=(end == s1) != after)
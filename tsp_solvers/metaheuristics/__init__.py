@@ -1,3 +1,4 @@
 from .ant_colony import AntColony
 from .simulated_annealing import SimulatedAnnealing
-from .particle_sworm import ParticleSwarmOptimization
\ No newline at end of file
+from .particle_sworm import ParticleSwarmOptimization
+from .base import STOP_REASONS, SolverState, SolveResult, SteppingSolver
@@ -1,7 +1,18 @@
+import multiprocessing
 import random
+import time
 from typing import Callable, List, Optional, Tuple
 
-class AntColony:
+import numpy as np
+
+from ..construction import construct_tour
+from ..core.distance import LazyDistanceMatrix
+from ..core.shared import SharedArray
+from ..core.stats import SolverStats
+from ..core.tour import ArrayTour
+from .base import SolveResult, SteppingSolver
+
+class AntColony(SteppingSolver):
     """
     Класс для решения задачи коммивояжера (TSP) с использованием метода муравьиной колонии (ACO).
 
@@ -31,6 +42,28 @@ class AntColony:
             Ожидаемая оптимальная стоимость маршрута. Используется вместе с convergence_threshold.
         verbose:
             Если True, выводит дополнительную информацию для отладки.
+        candidate_k:
+            Если задано, муравей выбирает следующий город только среди
+            candidate_k ближайших соседей текущего города (см. TSPInstance.candidate_lists).
+            Если все кандидаты уже посещены, выбор делается среди всех оставшихся городов.
+        seed:
+            Зерно генератора случайных чисел для воспроизводимых запусков.
+        num_workers:
+            Количество процессов, между которыми делятся муравьи одной итерации.
+            При 1 все муравьи строятся в текущем процессе. Результат воспроизводим
+            при одинаковых seed и num_workers.
+        local_search:
+            Локальный поиск (например, tsp_solvers.local_search.LocalSearch), которым
+            на каждой итерации улучшается лучший маршрут итерации до отложения феромона.
+        init:
+            Эвристика построения начального маршрута ("nearest_neighbor", "greedy",
+            "space_filling_curve", "christofides" или функция, см. construct_tour).
+            Если задана, маршрут становится начальным лучшим путем и усиливается
+            феромоном на первой итерации.
+        stats:
+            Объект SolverStats для счетчиков и времени фаз (construction,
+            local_search, update, callback). По умолчанию выключен;
+            включается через solver.stats.enabled = True.
     """
     def __init__(
           self
@@ -45,6 +78,12 @@ class AntColony:
         , convergence_threshold  : Optional[float] = None
         , optimal_cost           : Optional[float] = None
         , verbose                : bool = False
+        , candidate_k            : Optional[int] = None
+        , seed                   : Optional[int] = None
+        , num_workers            : int = 1
+        , local_search           : Optional[object] = None
+        , init                   : Optional[object] = None
+        , stats                  : Optional[SolverStats] = None
         ):
         
         self.num_ants = num_ants
@@ -58,10 +97,36 @@ class AntColony:
         self.convergence_threshold = convergence_threshold
         self.optimal_cost = optimal_cost
         self.verbose = verbose
+        self.candidate_k = candidate_k
+        self.seed = seed
+        self.num_workers = num_workers
+        self.local_search = local_search
+        self.init = init
+        self.stats = stats if stats is not None else SolverStats(enabled=False)
+        self._pool = None
+        self._shared = []
+        # Best tour as an ArrayTour; best_path is its list form, built on demand
+        self.best_tour = None
+        self._best_path = None
 
         # Store pheromone data for visualization
         self.pheromones = None
 
+    @property
+    def best_path(self) -> Optional[List[int]]:
+        """
+        Лучший найденный путь (список индексов городов) или None.
+        Хранится в best_tour; список строится при первом обращении после изменения.
+        """
+        if self._best_path is None and self.best_tour is not None:
+            self._best_path = self.best_tour.to_list()
+        return self._best_path
+
+    @best_path.setter
+    def best_path(self, path: Optional[List[int]]):
+        self.best_tour = None if path is None else ArrayTour(path)
+        self._best_path = None
+
     def select_index(self, probabilities: List[float]) -> int:
         """
         Выбирает следующий город на основе переданных вероятностей.
@@ -81,41 +146,225 @@ class AntColony:
                 return i
         return len(probabilities) - 1
     
+    def inject_solution(self, path: List[int], path_length: float):
+        """
+        Принимает внешний маршрут (например, найденный другим решателем).
+        Если он лучше текущего best_path, становится лучшим путем, а его ребра
+        усиливаются феромоном Q / path_length на следующем обновлении.
+
+        Args:
+            path: Маршрут (список индексов городов).
+            path_length: Длина маршрута.
+
+        Returns:
+            True, если маршрут был принят.
+        """
+        if path_length >= self.best_path_len:
+            return False
+        self.best_path = path
+        self.best_path_len = path_length
+        self.deposit_pheromones(np.asarray([path]), np.asarray([path_length], dtype=np.float64))
+        return True
+
     def reset_pheromones(self, best_path: Optional[List[int]], best_distance: Optional[float]):
         """
         Обновляет феромоны к initial_pheromone_level и ставит больше феромонов на лучший путь.
 
         Args:
-            best_path: Лучший путь 
+            best_path: Лучший путь (список или ArrayTour)
             best_distance: Лучшая длина
         """
-        num_cities = len(self.pheromones)
-        # Reset all pheromones to the initial level
-        self.pheromones = [
-            [self.initial_pheromone_level] * num_cities for _ in range(num_cities)
-        ]
+        # Reset all pheromones to the initial level, reusing the buffer
+        self.pheromones.fill(self.initial_pheromone_level)
 
         # Apply enforced pheromone level on the best path if it exists
         if best_path and best_distance:
             pheromone_level = self.Q / best_distance
-            for i in range(len(best_path) - 1):
-                city_i = best_path[i]
-                city_j = best_path[i + 1]
-                self.pheromones[city_i][city_j] = pheromone_level
-                self.pheromones[city_j][city_i] = pheromone_level
+            path = np.asarray(best_path)
+            self.pheromones[path[:-1], path[1:]] = pheromone_level
+            self.pheromones[path[1:], path[:-1]] = pheromone_level
 
         if self.verbose:
             print("Pheromones have been reset and enforced on the best path.")
 
     def initialize(self, instance):
         num_cities = instance.dimension
-        self.pheromones = [[self.initial_pheromone_level] * num_cities for _ in range(num_cities)]
-        self.delta_pheromones = [[0.0] * num_cities for _ in range(num_cities)]
+        if instance.lazy and 4 * num_cities * num_cities * 8 > instance.memory_limit:
+            # Pheromones, their increments, choice_info and the heuristic are n x n each
+            raise ValueError(
+                f"AntColony keeps four {num_cities} x {num_cities} float64 matrices, which exceed the "
+                f"instance memory_limit of {instance.memory_limit} bytes; use SimulatedAnnealing or "
+                f"ParticleSwarmOptimization for lazy instances of this size"
+            )
+        # Preallocated buffers, updated in place on every iteration
+        self.pheromones = np.full((num_cities, num_cities), self.initial_pheromone_level, dtype=np.float64)
+        self.delta_pheromones = np.zeros((num_cities, num_cities), dtype=np.float64)
+        self.choice_info = np.empty((num_cities, num_cities), dtype=np.float64)
         self.current_iter = 0
         self.stagnation_count = 0
         self.best_path = None
         self.best_path_len = float('inf')
         self.reset_flag = False
+        self.finished = False
+        self.stop_reason = None
+        # Constructed ant tours
+        self.evaluations = 0
+        self.rng = np.random.default_rng(self.seed)
+
+        # Heuristic information (1/d)**beta does not change between iterations
+        self.heuristic = heuristic_matrix(instance.distance_matrix, self.beta)
+        self.candidates = instance.candidate_lists(self.candidate_k) if self.candidate_k else None
+
+        if self.init is not None:
+            path = construct_tour(instance, self.init)
+            self.inject_solution(path, instance.total_distance(path))
+
+        self.close()
+        if self.num_workers > 1:
+            self._start_pool(num_cities)
+
+    def checkpoint_state(self):
+        """
+        Состояние прогона для save_checkpoint (см. core.checkpoint).
+
+        Returns:
+            Кортеж (скаляры, пригодные для JSON, словарь массивов):
+            феромоны, delta_pheromones, лучший путь, счетчики и состояние генератора rng.
+        """
+        state = {
+            "dimension": self.pheromones.shape[0],
+            "num_ants": self.num_ants,
+            "best_path_len": self.best_path_len,
+            "current_iter": self.current_iter,
+            "stagnation_count": self.stagnation_count,
+            "reset_flag": self.reset_flag,
+            "finished": self.finished,
+            "stop_reason": self.stop_reason,
+            "evaluations": self.evaluations,
+            "rng": self.rng.bit_generator.state,
+        }
+        arrays = {"pheromones": self.pheromones, "delta_pheromones": self.delta_pheromones}
+        if self.best_tour is not None:
+            arrays["best_path"] = np.asarray(self.best_tour)
+        return state, arrays
+
+    def restore_state(self, instance, state, arrays):
+        """
+        Восстанавливает прогон из checkpoint_state. Эвристика, списки кандидатов
+        и пул процессов строятся заново через initialize.
+
+        Args:
+            instance: Объект задачи сохраненного прогона.
+            state: Скаляры из checkpoint_state.
+            arrays: Массивы из checkpoint_state (могут быть memory-mapped).
+        """
+        if state["num_ants"] != self.num_ants:
+            raise ValueError(f"Checkpoint was written with num_ants={state['num_ants']}, not {self.num_ants}")
+        self.initialize(instance)
+        np.copyto(self.pheromones, arrays["pheromones"])
+        np.copyto(self.delta_pheromones, arrays["delta_pheromones"])
+        self.best_path = arrays["best_path"] if "best_path" in arrays else None
+        self.best_path_len = state["best_path_len"]
+        self.current_iter = state["current_iter"]
+        self.stagnation_count = state["stagnation_count"]
+        self.reset_flag = state["reset_flag"]
+        self.finished = state["finished"]
+        self.stop_reason = state["stop_reason"]
+        self.evaluations = state["evaluations"]
+        self.rng.bit_generator.state = state["rng"]
+
+    def construct_tours(self, instance) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Строит маршруты всех муравьев одновременно.
+
+        Матрица choice_info = pheromone**alpha * (1/d)**beta вычисляется один раз
+        за итерацию, после чего все муравьи продвигаются на один город за шаг
+        (см. construct_ant_tours). При num_workers > 1 муравьи делятся между
+        процессами пула, которые читают choice_info из общей памяти.
+
+        Args:
+            instance: Объект задачи.
+
+        Returns:
+            Кортеж из двух массивов:
+            - маршруты муравьев, форма (num_ants, dimension),
+            - длины маршрутов, форма (num_ants,).
+        """
+        choice_info = np.power(self.pheromones, self.alpha, out=self.choice_info)
+        choice_info *= self.heuristic
+
+        if self._pool is None:
+            paths = construct_ant_tours(choice_info, self.candidates, self.num_ants, self.rng)
+        else:
+            # One chunk per worker with its own seed drawn from the master generator,
+            # so results depend only on seed and num_workers
+            chunks = [len(chunk) for chunk in np.array_split(np.arange(self.num_ants), self.num_workers)]
+            seeds = self.rng.integers(2**63, size=len(chunks))
+            tasks = [(size, int(seed)) for size, seed in zip(chunks, seeds) if size > 0]
+            paths = np.concatenate(self._pool.starmap(_construct_in_worker, tasks))
+
+        return paths, instance.route_lengths(paths)
+
+    def _start_pool(self, num_cities: int):
+        """
+        Запускает пул процессов для построения маршрутов. Матрица choice_info
+        и списки кандидатов размещаются в общей памяти один раз и не передаются
+        процессам на каждой итерации.
+        """
+        self._shared = [SharedArray.create((num_cities, num_cities), np.float64)]
+        self.choice_info = self._shared[0].array
+        try:
+            specs = [self._shared[0].spec, None]
+            if self.candidates is not None:
+                self._shared.append(SharedArray.from_array(self.candidates))
+                specs[1] = self._shared[1].spec
+            self._pool = multiprocessing.Pool(self.num_workers, initializer=_init_worker, initargs=tuple(specs))
+        except BaseException:
+            # Без пула общая память никому не нужна, освобождаем ее сразу
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Останавливает пул процессов и освобождает общую память.
+        Дальнейшие итерации (если будут) выполняются в текущем процессе.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._shared:
+            self.choice_info = np.array(self.choice_info)
+            for shared in self._shared:
+                shared.close()
+            self._shared = []
+
+    def deposit_pheromones(self, paths: np.ndarray, lengths: np.ndarray):
+        """
+        Добавляет в delta_pheromones феромон Q / length на каждое ребро маршрутов муравьев
+        (scatter-add по всем муравьям сразу, в обе стороны ребра).
+
+        Args:
+            paths: Маршруты муравьев, форма (num_ants, dimension).
+            lengths: Длины маршрутов, форма (num_ants,).
+        """
+        num_cities = self.delta_pheromones.shape[0]
+        deposits = np.divide(self.Q, lengths, out=np.zeros_like(lengths), where=lengths > 0)
+        deposits = np.broadcast_to(deposits[:, None], (len(paths), paths.shape[1] - 1)).ravel()
+        city_i = paths[:, :-1].ravel()
+        city_j = paths[:, 1:].ravel()
+        flat_delta = self.delta_pheromones.reshape(-1)
+        np.add.at(flat_delta, city_i * num_cities + city_j, deposits)
+        np.add.at(flat_delta, city_j * num_cities + city_i, deposits)
+
+    def update_pheromones(self):
+        """
+        Испаряет феромоны и добавляет накопленные за итерацию delta_pheromones на месте,
+        после чего обнуляет буфер delta_pheromones для следующей итерации.
+        """
+        self.pheromones *= 1 - self.evaporation
+        self.pheromones += self.delta_pheromones
+        self.delta_pheromones.fill(0.0)
 
     def solve_step(
           self
@@ -146,65 +395,26 @@ class AntColony:
             - длина лучшего пути.
         """
         if self.current_iter >= self.max_iter:
+            self.stop_reason = "max_iterations"
             return False
 
+        stats = self.stats
         improved = False
-        for ant in range(self.num_ants):
-            current_path = [-1] * instance.dimension
-            available_cities = list(range(instance.dimension))
-            start_city = random.choice(available_cities)
-            current_path[0] = start_city
-            available_cities.remove(start_city)
-            current_city = start_city
-
-            while available_cities:
-                probabilities = []
-                sum_of_probabilities = 0.0
-                for city in available_cities:
-                    distance = instance.distance(current_city, city)
-                    if distance == 0:
-                        desirability = 0
-                    else:
-                        desirability = (self.pheromones[current_city][city] ** self.alpha) * (
-                            (1 / distance) ** self.beta
-                        )
-                    probabilities.append(desirability)
-                    sum_of_probabilities += desirability
-
-                if sum_of_probabilities == 0:
-                    # Avoid division by zero; choose randomly
-                    next_city = random.choice(available_cities)
-                else:
-                    probabilities = [prob / sum_of_probabilities for prob in probabilities]
-                    next_city_index = self.select_index(probabilities)
-                    next_city = available_cities[next_city_index]
-
-                current_path[len(current_path) - len(available_cities)] = next_city
-                current_city = next_city
-                available_cities.remove(next_city)
-
-            path_length = instance.total_distance(current_path)
-            if path_length < self.best_path_len:
-                self.best_path = current_path[:]
-                self.best_path_len = path_length
-                improved = True
-
-            pheromone_deposit = self.Q / path_length if path_length > 0 else 0
-            for i in range(len(current_path) - 1):
-                city_i = current_path[i]
-                city_j = current_path[i + 1]
-                self.delta_pheromones[city_i][city_j] += pheromone_deposit
-                self.delta_pheromones[city_j][city_i] += pheromone_deposit
-
-        # Update pheromones
-        num_cities = instance.dimension
-        for i in range(num_cities):
-            for j in range(i + 1, num_cities):
-                self.pheromones[i][j] = (1 - self.evaporation) * self.pheromones[i][j] + self.delta_pheromones[i][j]
-                self.pheromones[j][i] = self.pheromones[i][j]
+        with stats.phase("construction"):
+            paths, lengths = self.construct_tours(instance)
+        best_ant = int(np.argmin(lengths))
+        if self.local_search is not None:
+            with stats.phase("local_search"):
+                path, lengths[best_ant] = self.local_search.improve(instance, paths[best_ant])
+            paths[best_ant] = path
+        if lengths[best_ant] < self.best_path_len:
+            self.best_path = paths[best_ant]
+            self.best_path_len = float(lengths[best_ant])
+            improved = True
 
-        # Reset delta pheromones for the next iteration
-        self.delta_pheromones = [[0.0] * num_cities for _ in range(num_cities)]
+        with stats.phase("update"):
+            self.deposit_pheromones(paths, lengths)
+            self.update_pheromones()
 
         if improved:
             self.stagnation_count = 0
@@ -212,21 +422,35 @@ class AntColony:
             self.stagnation_count += 1
 
         if self.stagnation_count >= self.stagnation_limit:
-            self.reset_pheromones(self.best_path, self.best_path_len)
+            stats.count("stagnation_events")
+            with stats.phase("update"):
+                self.reset_pheromones(self.best_tour, self.best_path_len)
             self.stagnation_count = 0
+            stats.count("pheromone_resets")
 
         self.current_iter += 1
+        self.evaluations += len(paths)
+
+        if stats.enabled:
+            stats.count("iterations")
+            stats.count("tour_evaluations", len(paths))
+            stats.count("distance_lookups", paths.size)
+            stats.count("moves_proposed", len(paths))
+            stats.count("moves_improving", int(improved))
 
         if on_iteration_callback and self.current_iter % 1 == 0:
-            on_iteration_callback(self.current_iter, self.best_path, self.best_path_len, self.pheromones)
+            with stats.phase("callback"):
+                on_iteration_callback(self.current_iter, self.best_path, self.best_path_len, self.pheromones)
 
         # Check for convergence
         if self.convergence_threshold is not None and self.optimal_cost is not None:
             if self.best_path_len <= self.optimal_cost * (1 + self.convergence_threshold):
+                self.stop_reason = "converged"
                 return False
 
         # Check if maximum iterations reached
         if self.current_iter >= self.max_iter:
+            self.stop_reason = "max_iterations"
             return False
 
         return True
@@ -236,13 +460,161 @@ class AntColony:
         , instance
         , on_iteration_callback: Optional[Callable[[int, List[int], float, List[List[float]]], None]] = None
         , callback_interval: int = 1
-        ) -> Tuple[List[int], float]:
-        
+        , time_limit: Optional[float] = None
+        , max_evaluations: Optional[int] = None
+        ) -> SolveResult:
+        """
+        Запускает алгоритм до max_iter итераций, сходимости или исчерпания бюджета.
+
+        Args:
+            instance: Объект задачи.
+            on_iteration_callback: См. solve_step.
+            callback_interval: Не используется, оставлен для совместимости.
+            time_limit: Бюджет времени в секундах, проверяется после каждой итерации.
+            max_evaluations: Бюджет числа построенных маршрутов муравьев,
+                проверяется после каждой итерации.
+
+        Returns:
+            SolveResult, который распаковывается как (лучший путь, длина лучшего пути);
+            stop_reason указывает причину остановки.
+        """
+        start = time.monotonic()
+        deadline = None if time_limit is None else start + time_limit
         self.initialize(instance)
 
-        for _ in range(self.max_iter):
-            continue_solving = self.solve_step(instance, on_iteration_callback)
-            if not continue_solving:
-                break
+        try:
+            self.run(
+                instance, deadline=deadline, max_evaluations=max_evaluations,
+                on_iteration_callback=on_iteration_callback,
+            )
+        finally:
+            self.close()
+
+        return self._result(time.monotonic() - start)
+
+
+def heuristic_matrix(distances, beta: float, block_rows: int = 256) -> np.ndarray:
+    """
+    Матрица эвристической информации (1/d)**beta; для d = 0 (диагональ,
+    совпадающие города) значение 0.
+
+    Ленивая матрица расстояний (LazyDistanceMatrix) читается блоками по
+    block_rows строк, так что полная матрица расстояний не строится.
+
+    Args:
+        distances: Матрица расстояний экземпляра (плотная, упакованная или ленивая).
+        beta: Показатель степени.
+        block_rows: Число строк в блоке для ленивой матрицы.
+
+    Returns:
+        Массив float64 формы (n, n).
+    """
+    if not isinstance(distances, LazyDistanceMatrix):
+        distances = np.asarray(distances, dtype=np.float64)
+        heuristic = np.zeros_like(distances)
+        nonzero = distances > 0
+        heuristic[nonzero] = (1.0 / distances[nonzero]) ** beta
+        return heuristic
+
+    num_cities = len(distances)
+    heuristic = np.zeros((num_cities, num_cities), dtype=np.float64)
+    columns = np.arange(num_cities)
+    for start in range(0, num_cities, block_rows):
+        rows = np.arange(start, min(start + block_rows, num_cities))
+        block = np.asarray(distances[rows[:, None], columns], dtype=np.float64)
+        nonzero = block > 0
+        target = heuristic[start:start + len(rows)]
+        target[nonzero] = (1.0 / block[nonzero]) ** beta
+    return heuristic
+
+
+def construct_ant_tours(
+      choice_info: np.ndarray
+    , candidates : Optional[np.ndarray]
+    , num_ants   : int
+    , rng        : np.random.Generator
+    ) -> np.ndarray:
+    """
+    Строит num_ants маршрутов одновременно по матрице choice_info.
+
+    Посещенные города отсекаются маской, следующий город каждого муравья
+    выбирается векторизованной рулеткой. Если заданы candidates, выбор сначала
+    делается среди непосещенных кандидатов текущего города.
+
+    Args:
+        choice_info: Матрица pheromone**alpha * (1/d)**beta, форма (n, n).
+        candidates: Списки ближайших соседей, форма (n, k), или None.
+        num_ants: Количество муравьев.
+        rng: Генератор случайных чисел.
+
+    Returns:
+        Маршруты муравьев, форма (num_ants, n).
+    """
+    num_cities = len(choice_info)
+    ants = np.arange(num_ants)
+
+    paths = np.empty((num_ants, num_cities), dtype=np.intp)
+    unvisited = np.ones((num_ants, num_cities), dtype=bool)
+    current = rng.integers(num_cities, size=num_ants)
+    paths[:, 0] = current
+    unvisited[ants, current] = False
+
+    for step in range(1, num_cities):
+        next_city = np.full(num_ants, -1, dtype=np.intp)
+        if candidates is not None:
+            choices = candidates[current]
+            weights = choice_info[current[:, None], choices] * unvisited[ants[:, None], choices]
+            picked = _roulette(weights, rng)
+            has_choice = picked >= 0
+            next_city[has_choice] = choices[has_choice, picked[has_choice]]
+
+        # Ants without an open candidate choose among all unvisited cities
+        rest = np.flatnonzero(next_city < 0)
+        if len(rest):
+            weights = choice_info[current[rest]] * unvisited[rest]
+            picked = _roulette(weights, rng)
+            # Only zero-desirability cities left (e.g. duplicates): choose uniformly
+            stuck = picked < 0
+            if stuck.any():
+                picked[stuck] = _roulette(unvisited[rest[stuck]].astype(np.float64), rng)
+            next_city[rest] = picked
+
+        paths[:, step] = next_city
+        unvisited[ants, next_city] = False
+        current = next_city
+
+    return paths
+
+
+def _roulette(weights: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Векторизованная рулетка: для каждой строки weights выбирает индекс
+    с вероятностью, пропорциональной весу. Для строк с нулевой суммой возвращает -1.
+    """
+    cumulative = np.cumsum(weights, axis=1)
+    totals = cumulative[:, -1]
+    threshold = rng.random(len(weights)) * totals
+    picked = (cumulative <= threshold[:, None]).sum(axis=1)
+    picked[totals <= 0] = -1
+    return picked
+
+
+# State of a pool worker: shared arrays attached once in _init_worker
+_worker_state = {}
+
+
+def _init_worker(choice_info_spec, candidates_spec):
+    choice_info = SharedArray.attach(choice_info_spec)
+    candidates = SharedArray.attach(candidates_spec) if candidates_spec is not None else None
+    _worker_state["choice_info"] = choice_info
+    _worker_state["candidates"] = candidates
+
 
-        return self.best_path, self.best_path_len
\ No newline at end of file
+def _construct_in_worker(num_ants: int, seed: int) -> np.ndarray:
+    candidates = _worker_state["candidates"]
+    return construct_ant_tours(
+        _worker_state["choice_info"].array,
+        candidates.array if candidates is not None else None,
+        num_ants,
+        np.random.default_rng(seed),
+    )
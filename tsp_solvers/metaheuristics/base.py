@@ -0,0 +1,147 @@
+import time
+from collections import namedtuple
+
+# Cheap view of a solver's progress. best_path is the solver's own list, not a copy.
+SolverState = namedtuple(
+    "SolverState", ["iteration", "best_path", "best_distance", "finished", "evaluations", "stop_reason"]
+)
+
+# Why a run stopped (SteppingSolver.stop_reason):
+#   "time_limit", "max_evaluations"  - a budget of solve()/run() was exhausted
+#   "max_iterations"                 - the solver's iteration limit was reached
+#   "stagnation"                     - no improvement for too long
+#   "temperature"                    - SA cooled below stopping_temp
+#   "converged"                      - ACO reached optimal_cost * (1 + convergence_threshold)
+#   "optimal"                        - trivial instance (3 cities or fewer)
+STOP_REASONS = (
+    "time_limit", "max_evaluations", "max_iterations", "stagnation", "temperature", "converged", "optimal",
+)
+
+
+class SolveResult(tuple):
+    """
+    Result of ``solve``: unpacks like the usual ``(best_path, best_distance)``
+    pair and additionally tells why and after how much work the solver stopped.
+
+    Attributes
+    ----------
+    best_path : list of int
+    best_distance : float
+    stop_reason : str
+        One of STOP_REASONS.
+    iterations : int
+        Steps performed.
+    evaluations : int
+        Evaluations performed (see the solver's ``evaluations`` attribute).
+    elapsed : float
+        Wall-clock seconds spent in solve().
+    """
+
+    def __new__(cls, best_path, best_distance, stop_reason=None, iterations=0, evaluations=0, elapsed=0.0):
+        result = super().__new__(cls, (best_path, best_distance))
+        result.stop_reason = stop_reason
+        result.iterations = iterations
+        result.evaluations = evaluations
+        result.elapsed = elapsed
+        return result
+
+    def __getnewargs__(self):
+        return (self[0], self[1], self.stop_reason, self.iterations, self.evaluations, self.elapsed)
+
+    @property
+    def best_path(self):
+        return self[0]
+
+    @property
+    def best_distance(self):
+        return self[1]
+
+    def __repr__(self):
+        return (
+            f"SolveResult(best_distance={self[1]!r}, stop_reason={self.stop_reason!r}, "
+            f"iterations={self.iterations}, evaluations={self.evaluations}, elapsed={self.elapsed:.3f})"
+        )
+
+
+class SteppingSolver:
+    """
+    Resumable step protocol shared by the metaheuristics.
+
+    Subclasses implement ``initialize(instance, ...)``, which prepares a run,
+    sets ``finished`` to False and ``evaluations`` to 0, and
+    ``solve_step(instance, ...)``, which performs one iteration (one temperature
+    level for SA) and returns False, with ``stop_reason`` set, once the run is
+    over. Both keep ``current_iter``, ``best_path``, ``best_path_len`` and
+    ``evaluations`` up to date. A scheduler can then interleave many solves in
+    one process with ``run``, without per-call setup cost.
+
+    Budgets are checked between steps only: a clock read and a comparison per
+    step, so their cost is amortized over a whole iteration. A run may overshoot
+    ``max_evaluations`` by at most one step's evaluations.
+
+    ``checkpoint_state()`` and ``restore_state(instance, state, arrays)`` export
+    and import the run state for core.checkpoint.
+    """
+
+    finished = True
+    stop_reason = None
+    evaluations = 0
+
+    def run(self, instance, steps=None, deadline=None, max_evaluations=None, **step_kwargs):
+        """
+        Continue an initialized run for a number of steps or until a deadline.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance passed to ``initialize``.
+        steps : int, optional
+            Maximum number of steps to perform. Default is no limit.
+        deadline : float, optional
+            Stop once ``time.monotonic()`` reaches this value. Checked between
+            steps, so a step is never interrupted.
+        max_evaluations : int, optional
+            Stop once ``evaluations`` reaches this value.
+        **step_kwargs
+            Passed to ``solve_step`` (e.g. on_iteration_callback).
+
+        Returns
+        -------
+        bool
+            True if the run can be continued, False once it is finished. When a
+            budget stops the run, ``stop_reason`` says which one, but the run
+            can still be continued with a larger budget.
+        """
+        done = 0
+        while not self.finished:
+            if steps is not None and done >= steps:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                self.stop_reason = "time_limit"
+                break
+            if max_evaluations is not None and self.evaluations >= max_evaluations:
+                self.stop_reason = "max_evaluations"
+                break
+            self.finished = not self.solve_step(instance, **step_kwargs)
+            done += 1
+        return not self.finished
+
+    def _result(self, elapsed):
+        """
+        SolveResult of the current run.
+        """
+        return SolveResult(
+            self.best_path, self.best_path_len, self.stop_reason, self.current_iter, self.evaluations, elapsed
+        )
+
+    def state(self):
+        """
+        Current iteration, best tour and its length, and whether the run is over.
+
+        Returns
+        -------
+        SolverState
+        """
+        return SolverState(
+            self.current_iter, self.best_path, self.best_path_len, self.finished, self.evaluations, self.stop_reason
+        )
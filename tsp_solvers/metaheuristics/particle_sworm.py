@@ -1,6 +1,13 @@
 import random
+import time
 
-class ParticleSwarmOptimization:
+import numpy as np
+
+from ..construction import construct_tour
+from ..core.stats import SolverStats
+from .base import SteppingSolver
+
+class ParticleSwarmOptimization(SteppingSolver):
     """
     Particle Swarm Optimization (PSO) solver for the Traveling Salesman Problem (TSP).
 
@@ -16,9 +23,24 @@ class ParticleSwarmOptimization:
         Maximum number of iterations for the PSO algorithm.
     stagnation_threshold : int
         Number of iterations without improvement before stopping.
+    init : str or callable
+        Construction heuristic for the initial particles (see construct_tour).
+    stats : SolverStats
+        Counters and phase times of the runs (disabled by default).
+    seed : int or None
+        Seed of the swarm's random generator.
+
+    The swarm is kept as arrays: ``particles`` and ``p_best_positions`` of shape
+    (num_particles, dimension) and dtype int32, ``velocities`` of shape
+    (num_particles, 3, 2) holding three swaps per particle, and ``p_best_scores``.
+    Velocities are applied to all particles at once and all particles are scored
+    with one gather-and-sum over the distance matrix, so there is no per-particle
+    Python work.
     """
 
-    def __init__(self, num_particles=20, max_iterations=100, stagnation_threshold=500):
+    def __init__(
+        self, num_particles=20, max_iterations=100, stagnation_threshold=500, init="random", stats=None, seed=None
+    ):
         """
         Initialize the PSO solver with the given parameters.
 
@@ -30,49 +52,271 @@ class ParticleSwarmOptimization:
             Maximum number of iterations before stopping. Default is 100.
         stagnation_threshold : int, optional
             Number of iterations without improvement to trigger early stopping. Default is 500.
+        init : str or callable, optional
+            "random" (default) starts every particle from a random permutation. Any other
+            strategy ("nearest_neighbor", "greedy", "space_filling_curve", "christofides"
+            or a function) builds one tour; the first particle starts from it and the
+            others from copies perturbed by a random velocity.
+        stats : SolverStats, optional
+            Collects counters and phase times. By default a disabled SolverStats is
+            used; set ``solver.stats.enabled = True`` to switch it on.
+        seed : int, optional
+            Seed of the swarm's NumPy generator. By default it is drawn from the
+            ``random`` module, so ``random.seed`` still makes runs reproducible.
         """
         self.num_particles = num_particles
         self.max_iterations = max_iterations
         self.stagnation_threshold = stagnation_threshold
+        self.init = init
+        self.stats = stats if stats is not None else SolverStats(enabled=False)
+        self.seed = seed
 
-    def get_velocity(self):
+    def get_velocity(self, count=None):
         """
-        Generate a random 'velocity' for a particle.
+        Generate random 'velocities', i.e. sequences of three swap operations.
 
-        The velocity is represented as a list of swap operations (pairs of indices),
-        which will be applied to a solution to create a new one.
+        Parameters
+        ----------
+        count : int, optional
+            Number of velocities. By default a single one is returned.
 
         Returns
         -------
-        list of tuple of int
-            A list of swap operations, where each tuple (a, b) represents indices to swap.
+        numpy.ndarray of int32
+            Shape (3, 2), or (count, 3, 2): each row (a, b) swaps the cities at
+            positions a and b.
         """
-        return [(random.randint(0, self.num_cities - 1), random.randint(0, self.num_cities - 1)) for _ in range(3)]
+        shape = (3, 2) if count is None else (count, 3, 2)
+        return self.rng.integers(0, self.num_cities, size=shape, dtype=np.int32)
 
     def apply_velocity(self, solution, velocity):
         """
-        Apply the 'velocity' (swap operations) to a given solution.
+        Apply velocities (swap operations) to one or many solutions.
+
+        Parameters
+        ----------
+        solution : array-like of int
+            A tour of shape (dimension,) or a swarm of shape (m, dimension).
+        velocity : array-like of int
+            Swaps of shape (3, 2), or (m, 3, 2) for a swarm.
+
+        Returns
+        -------
+        numpy.ndarray of int32
+            New solutions; the input is left unchanged.
+        """
+        solutions = np.array(solution, dtype=np.int32, ndmin=2, order="C")
+        velocities = np.asarray(velocity).reshape(len(solutions), -1, 2)
+        rows = np.arange(len(solutions))
+        # Swaps are applied in order, each one to all particles at once
+        for step in range(velocities.shape[1]):
+            a, b = velocities[:, step, 0], velocities[:, step, 1]
+            solutions[rows, a], solutions[rows, b] = solutions[rows, b], solutions[rows, a]
+        return solutions if np.ndim(solution) == 2 else solutions[0]
+
+    def evaluate(self, instance, solutions):
+        """
+        Tour lengths of a whole swarm in one vectorized pass.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+        solutions : numpy.ndarray of int, shape (m, dimension)
+
+        Returns
+        -------
+        numpy.ndarray of float64, shape (m,)
+        """
+        return instance.route_lengths(solutions)
+
+    def initialize(self, instance):
+        """
+        Create the swarm: initial particles, velocities and personal/global bests.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance to solve.
+        """
+        self.num_cities = instance.dimension
+        seed = self.seed if self.seed is not None else random.getrandbits(64)
+        self.rng = np.random.default_rng(seed)
+
+        # Initialize particles and their velocities
+        if self.init == "random":
+            identity = np.broadcast_to(np.arange(self.num_cities, dtype=np.int32), (self.num_particles, self.num_cities))
+            self.particles = np.ascontiguousarray(self.rng.permuted(identity, axis=1))
+        else:
+            start = np.asarray(construct_tour(instance, self.init), dtype=np.int32)
+            self.particles = np.tile(start, (self.num_particles, 1))
+            # A single particle is the start tour itself
+            if self.num_particles > 1:
+                self.particles[1:] = self.apply_velocity(self.particles[1:], self.get_velocity(self.num_particles - 1))
+        self.velocities = self.get_velocity(self.num_particles)
+        self.p_best_positions = self.particles.copy()  # Personal best positions
+        self.p_best_scores = self.evaluate(instance, self.particles)  # Personal best scores
+
+        # Initialize the global best solution
+        best = int(np.argmin(self.p_best_scores))
+        self.best_path = self.particles[best].tolist()
+        self.best_path_len = float(self.p_best_scores[best])
+
+        self.current_iter = 0
+        self.stagnation_count = 0
+        self.finished = False
+        self.stop_reason = None
+        # Scored tours, including the initial particles
+        self.evaluations = self.num_particles
+
+        self.stats.count("tour_evaluations", self.num_particles)
+        self.stats.count("distance_lookups", self.num_particles * self.num_cities)
+
+    def checkpoint_state(self):
+        """
+        Run state for save_checkpoint (see core.checkpoint).
+
+        Returns
+        -------
+        tuple of (dict, dict)
+            JSON-serializable scalars (counters, best length, generator state)
+            and the swarm arrays.
+        """
+        state = {
+            "dimension": self.num_cities,
+            "num_particles": self.num_particles,
+            "best_path_len": float(self.best_path_len),
+            "current_iter": self.current_iter,
+            "stagnation_count": self.stagnation_count,
+            "finished": self.finished,
+            "stop_reason": self.stop_reason,
+            "evaluations": self.evaluations,
+            "rng": self.rng.bit_generator.state,
+        }
+        arrays = {
+            "particles": self.particles,
+            "velocities": self.velocities,
+            "p_best_positions": self.p_best_positions,
+            "p_best_scores": self.p_best_scores,
+            "best_path": np.asarray(self.best_path),
+        }
+        return state, arrays
+
+    def restore_state(self, instance, state, arrays):
+        """
+        Restore a run from checkpoint_state.
 
         Parameters
         ----------
-        solution : list of int
-            The current solution (a tour represented as a list of city indices).
-        velocity : list of tuple of int
-            A list of swap operations to apply to the solution.
+        instance : TSPInstance
+            The instance of the saved run.
+        state : dict
+            Scalars of checkpoint_state.
+        arrays : dict of str to numpy.ndarray
+            Arrays of checkpoint_state (possibly memory-mapped).
+        """
+        if state["num_particles"] != self.num_particles:
+            raise ValueError(
+                f"Checkpoint was written with num_particles={state['num_particles']}, not {self.num_particles}"
+            )
+        self.num_cities = instance.dimension
+        self.particles = np.array(arrays["particles"])
+        self.velocities = np.array(arrays["velocities"])
+        self.p_best_positions = np.array(arrays["p_best_positions"])
+        self.p_best_scores = np.array(arrays["p_best_scores"])
+        self.rng = np.random.default_rng()
+        self.rng.bit_generator.state = state["rng"]
+        self.best_path = arrays["best_path"].tolist()
+        self.best_path_len = state["best_path_len"]
+        self.current_iter = state["current_iter"]
+        self.stagnation_count = state["stagnation_count"]
+        self.finished = state["finished"]
+        self.stop_reason = state["stop_reason"]
+        self.evaluations = state["evaluations"]
+
+    def solve_step(self, instance, on_iteration_callback=None, callback_interval=1):
+        """
+        Move every particle once and update the personal and global bests.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance passed to initialize.
+        on_iteration_callback : callable, optional
+            Called as ``f(iteration, best_path, best_distance)`` every
+            ``callback_interval`` iterations.
+        callback_interval : int, optional
+            Default is 1.
 
         Returns
         -------
-        list of int
-            A new solution obtained after applying the velocity.
+        bool
+            False once max_iterations is reached or the swarm stagnated.
         """
-        new_solution = solution[:]
-        for swap in velocity:
-            a, b = swap
-            # Swap two cities in the tour
-            new_solution[a], new_solution[b] = new_solution[b], new_solution[a]
-        return new_solution
+        if not self._can_continue():
+            return False
+
+        stats = self.stats
+        enabled = stats.enabled
+        if enabled:
+            step_start = time.perf_counter()
+
+        # Move every particle by its velocity and score the whole swarm at once
+        new_solutions = self.apply_velocity(self.particles, self.velocities)
+        new_distances = self.evaluate(instance, new_solutions)
+
+        # Update personal bests (pBest)
+        improving = new_distances < self.p_best_scores
+        self.p_best_positions[improving] = new_solutions[improving]
+        self.p_best_scores[improving] = new_distances[improving]
+        improvement = bool(improving.any())
+
+        # Update the global best (gBest)
+        best = int(np.argmin(new_distances))
+        if new_distances[best] < self.best_path_len:
+            self.best_path = new_solutions[best].tolist()
+            self.best_path_len = float(new_distances[best])
+            improvement = True
+
+        # New velocities; particles always move to the new position
+        self.velocities = self.get_velocity(self.num_particles)
+        self.particles = new_solutions
+
+        if enabled:
+            stats.add_time("move", time.perf_counter() - step_start)
+            stats.count("iterations")
+            stats.count("tour_evaluations", self.num_particles)
+            stats.count("distance_lookups", self.num_particles * self.num_cities)
+            stats.count("moves_proposed", self.num_particles)
+            stats.count("moves_accepted", self.num_particles)
+            stats.count("moves_improving", int(improving.sum()))
+
+        # Check for stagnation
+        if improvement:
+            self.stagnation_count = 0
+        else:
+            self.stagnation_count += 1
+            if self.stagnation_count == self.stagnation_threshold:
+                stats.count("stagnation_events")
 
-    def solve(self, instance, on_iteration_callback=None, callback_interval=1):
+        # Call the callback function to report progress
+        if on_iteration_callback and self.current_iter % callback_interval == 0:
+            with stats.phase("callback"):
+                on_iteration_callback(self.current_iter, self.best_path, self.best_path_len)
+
+        self.current_iter += 1
+        self.evaluations += self.num_particles
+        return self._can_continue()
+
+    def _can_continue(self):
+        if self.current_iter >= self.max_iterations:
+            self.stop_reason = "max_iterations"
+        elif self.stagnation_count >= self.stagnation_threshold:
+            self.stop_reason = "stagnation"
+        else:
+            return True
+        return False
+
+    def solve(self, instance, on_iteration_callback=None, callback_interval=1, time_limit=None, max_evaluations=None):
         """
         Solve the TSP instance using the Particle Swarm Optimization algorithm.
 
@@ -86,67 +330,26 @@ class ParticleSwarmOptimization:
             the best solution, and the best distance.
         callback_interval : int, optional
             Frequency of calling the callback function (e.g., every N iterations). Default is 1.
+        time_limit : float, optional
+            Wall-clock budget in seconds, checked after every iteration.
+        max_evaluations : int, optional
+            Budget of scored tours, checked after every iteration.
 
         Returns
         -------
-        tuple
-            A tuple containing the best solution (list of city indices) and its total distance (float).
+        SolveResult
+            Unpacks as (best solution, total distance); ``stop_reason`` tells why the run stopped.
         """
-        self.num_cities = instance.dimension
-
-        # Initialize particles and their velocities
-        particles = [random.sample(range(self.num_cities), self.num_cities) for _ in range(self.num_particles)]
-        velocities = [self.get_velocity() for _ in range(self.num_particles)]
-        p_best_positions = particles[:]  # Personal best positions
-        p_best_scores = [instance.total_distance(p) for p in particles]  # Personal best scores
-
-        # Initialize the global best solution
-        g_best_position = min(p_best_positions, key=lambda p: instance.total_distance(p))
-        g_best_score = instance.total_distance(g_best_position)
-
-        iteration = 0
-        stagnation_count = 0
-
-        # Main PSO loop
-        while iteration < self.max_iterations and stagnation_count < self.stagnation_threshold:
-            improvement = False
-            for i in range(self.num_particles):
-                # Apply velocity to the current solution
-                new_solution = self.apply_velocity(particles[i], velocities[i])
-                new_distance = instance.total_distance(new_solution)
-
-                # Update personal best (pBest)
-                if new_distance < p_best_scores[i]:
-                    p_best_positions[i] = new_solution
-                    p_best_scores[i] = new_distance
-                    improvement = True
-
-                # Update global best (gBest)
-                if new_distance < g_best_score:
-                    g_best_position = new_solution
-                    g_best_score = new_distance
-                    improvement = True
-
-                # Generate a new velocity for the particle
-                velocities[i] = self.get_velocity()
-
-                # Update particle position
-                particles[i] = new_solution
-
-            # Check for stagnation
-            if improvement:
-                stagnation_count = 0
-            else:
-                stagnation_count += 1
-
-            # Call the callback function to report progress
-            if on_iteration_callback and iteration % callback_interval == 0:
-                on_iteration_callback(iteration, g_best_position, g_best_score)
-
-            iteration += 1
+        start = time.monotonic()
+        deadline = None if time_limit is None else start + time_limit
+        self.initialize(instance)
+        self.run(
+            instance, deadline=deadline, max_evaluations=max_evaluations,
+            on_iteration_callback=on_iteration_callback, callback_interval=callback_interval,
+        )
 
         # Final callback after the algorithm finishes
         if on_iteration_callback:
-            on_iteration_callback(iteration, g_best_position, g_best_score)
+            on_iteration_callback(self.current_iter, self.best_path, self.best_path_len)
 
-        return g_best_position, g_best_score
+        return self._result(time.monotonic() - start)
@@ -1,12 +1,23 @@
 import random
+import time
+
+import numpy as np
+
+from ..construction import construct_tour
+from ..core.stats import SolverStats
+from ..core.tour import ArrayTour
 from ..utils import exp_manual
+from .base import SteppingSolver
 
-class SimulatedAnnealing:
+class SimulatedAnnealing(SteppingSolver):
     def __init__(self, 
                  initial_temp=1000.0, 
                  cooling_rate=0.999, 
                  stopping_temp=1e-8, 
-                 max_iterations=100):
+                 max_iterations=100,
+                 candidate_k=None,
+                 init="random",
+                 stats=None):
         """
         Initialize the Simulated Annealing solver.
 
@@ -20,11 +31,24 @@ class SimulatedAnnealing:
             The temperature below which the algorithm terminates.
         max_iterations : int
             The number of iterations (neighbor evaluations) per temperature level.
+        candidate_k : int, optional
+            If set, 2-opt moves are restricted to ones that create an edge between
+            a city and one of its candidate_k nearest neighbors.
+        init : str or callable
+            Construction heuristic for the initial tour when solve() is not given
+            current_solution: "random", "nearest_neighbor", "greedy",
+            "space_filling_curve", "christofides" or a function (see construct_tour).
+        stats : SolverStats, optional
+            Collects counters and phase times. By default a disabled SolverStats is
+            used; set ``solver.stats.enabled = True`` to switch it on.
         """
         self.initial_temp = initial_temp
         self.cooling_rate = cooling_rate
         self.stopping_temp = stopping_temp
         self.max_iterations = max_iterations
+        self.candidate_k = candidate_k
+        self.init = init
+        self.stats = stats if stats is not None else SolverStats(enabled=False)
 
     def get_neighbor_2opt(self, tour):
         """
@@ -45,56 +69,356 @@ class SimulatedAnnealing:
         new_tour[i:j+1] = reversed(new_tour[i:j+1])
         return new_tour
 
-    def solve(self, instance, on_iteration_callback=None, callback_interval=1, stagnation_threshold=500, current_solution=None):
+    def sample_2opt_move(self, n):
+        """
+        Pick a random 2-opt move, i.e. a segment [i, j] of the tour to reverse.
+
+        Parameters
+        ----------
+        n : int
+            Tour length.
+
+        Returns
+        -------
+        tuple of int
+            Segment bounds (i, j) with 0 <= i < j < n.
+        """
+        i = random.randrange(n)
+        j = random.randrange(n - 1)
+        if j >= i:
+            j += 1
+        return (i, j) if i < j else (j, i)
+
+    def sample_candidate_move(self, tour, position, candidates):
+        """
+        Pick a random 2-opt move that links a random city a to one of its candidate
+        neighbors c, i.e. the segment between them is reversed so that (a, c)
+        becomes a tour edge.
+
+        Parameters
+        ----------
+        tour : sequence of int
+            Current tour (e.g. ArrayTour.order).
+        position : sequence of int
+            position[city] is the index of city in tour.
+        candidates : list of list of int
+            Candidate neighbors of every city.
+
+        Returns
+        -------
+        tuple of int
+            Segment bounds (i, j). If i >= j the move is degenerate (a and c
+            are already adjacent) and should be skipped.
+        """
+        p = random.randrange(len(tour))
+        q = position[random.choice(candidates[tour[p]])]
+        if p < q:
+            return p + 1, q
+        return q + 1, p
+
+    def two_opt_delta(self, tour, i, j, dist):
+        """
+        Change in tour length caused by reversing tour[i..j], computed in O(1).
+
+        The move replaces edges (a, b) and (c, d) by (a, c) and (b, d), where
+        a = tour[i-1], b = tour[i], c = tour[j] and d = tour[j+1].
+
+        Parameters
+        ----------
+        tour : sequence of int
+            Current tour (e.g. ArrayTour.order).
+        i, j : int
+            Segment bounds, 0 <= i < j < len(tour).
+        dist : numpy.ndarray or PackedDistanceMatrix
+            Distance matrix of the instance.
+
+        Returns
+        -------
+        float
+            New length minus old length.
+        """
+        n = len(tour)
+        if i == 0 and j == n - 1:
+            # Reversing the whole tour yields the same cycle
+            return 0.0
+        a, b = tour[i - 1], tour[i]
+        c, d = tour[j], tour[(j + 1) % n]
+        return float(dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d])
+
+    def apply_2opt(self, tour, i, j):
+        """
+        Apply the 2-opt move of reversing tour[i..j] to an ArrayTour, in place.
+
+        The shorter side of the cycle is reversed (see ArrayTour.reverse_path),
+        so positions outside [i, j] may change, but the resulting cycle is the same.
+        """
+        tour.reverse_path(tour.order[i], tour.order[j])
+
+    def initialize(self, instance, current_solution=None, stagnation_threshold=500):
+        """
+        Prepare a run: build the initial tour and reset the temperature.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance to solve.
+        current_solution : list of int, optional
+            Initial tour (copied). By default it is built with the ``init`` strategy.
+        stagnation_threshold : int, optional
+            Number of temperature levels without a new best tour after which the
+            run stops. Default is 500.
+        """
         n = instance.dimension
+        self.dist = instance.distance_matrix
+
+        if current_solution is None or len(current_solution) == 0:
+            current_solution = construct_tour(instance, self.init)
+        # Moves are applied in place on a copy, the caller's tour stays untouched
+        self.current_solution = ArrayTour(current_solution)
+        self.current_distance = instance.total_distance(self.current_solution.as_array())
+
+        self.candidates = None
+        if self.candidate_k:
+            self.candidates = instance.candidate_lists(self.candidate_k).tolist()
 
-        if not current_solution:
-            current_solution = list(range(n))
-            random.shuffle(current_solution)
-        current_distance = instance.total_distance(current_solution)
-
-        best_solution = current_solution[:]
-        best_distance = current_distance
-
-        temp = self.initial_temp
-        iteration = 0
-        stagnation_count = 0
-
-        # Loop until we either reach the stopping_temp or have stagnated for too long
-        while (temp > self.stopping_temp) and (stagnation_count < stagnation_threshold):
-            stagnation = True
-            for _ in range(self.max_iterations):
-                new_solution = self.get_neighbor_2opt(current_solution)
-                new_distance = instance.total_distance(new_solution)
-
-                if new_distance < current_distance:
-                    current_solution = new_solution
-                    current_distance = new_distance
-                    if current_distance < best_distance:
-                        best_distance = current_distance
-                        best_solution = current_solution[:]
-                        stagnation = False
-                else:
-                    diff = current_distance - new_distance
-                    # Accept worse solution with a probability
-                    if random.random() < exp_manual(diff / temp):
-                        current_solution = new_solution
-                        current_distance = new_distance
-            
-            if stagnation:
-                stagnation_count += 1
+        self.best_path = self.current_solution.to_list()
+        self.best_path_len = self.current_distance
+        # Array copy of the best tour, taken only when the tour moves away from a new best
+        self._best_order = self.current_solution.as_array().copy()
+
+        self.temp = self.initial_temp
+        self.current_iter = 0
+        self.stagnation_count = 0
+        self.stagnation_threshold = stagnation_threshold
+        self.finished = False
+        self.stop_reason = None
+        # Proposed 2-opt moves
+        self.evaluations = 0
+        self.stats.count("tour_evaluations")
+        self.stats.count("distance_lookups", n)
+
+    def checkpoint_state(self):
+        """
+        Run state for save_checkpoint (see core.checkpoint).
+
+        Returns
+        -------
+        tuple of (dict, dict)
+            JSON-serializable scalars (temperature, counters) and the current and
+            best tours as arrays.
+        """
+        state = {
+            "dimension": len(self.current_solution),
+            "current_distance": float(self.current_distance),
+            "best_path_len": float(self.best_path_len),
+            "temp": self.temp,
+            "current_iter": self.current_iter,
+            "stagnation_count": self.stagnation_count,
+            "stagnation_threshold": self.stagnation_threshold,
+            "finished": self.finished,
+            "stop_reason": self.stop_reason,
+            "evaluations": self.evaluations,
+        }
+        arrays = {
+            "current_solution": self.current_solution.as_array().copy(),
+            "best_path": np.asarray(self.best_path),
+        }
+        return state, arrays
+
+    def restore_state(self, instance, state, arrays):
+        """
+        Restore a run from checkpoint_state. Candidate lists and the position
+        index of the tour are rebuilt.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance of the saved run.
+        state : dict
+            Scalars of checkpoint_state.
+        arrays : dict of str to numpy.ndarray
+            Arrays of checkpoint_state (possibly memory-mapped).
+        """
+        self.initialize(instance, arrays["current_solution"].tolist(), state["stagnation_threshold"])
+        self.current_distance = state["current_distance"]
+        self.best_path = arrays["best_path"].tolist()
+        self._best_order = np.array(arrays["best_path"], dtype=np.int32)
+        self.best_path_len = state["best_path_len"]
+        self.temp = state["temp"]
+        self.current_iter = state["current_iter"]
+        self.stagnation_count = state["stagnation_count"]
+        self.finished = state["finished"]
+        self.stop_reason = state["stop_reason"]
+        self.evaluations = state["evaluations"]
+
+    def solve_step(self, instance, on_iteration_callback=None, callback_interval=1):
+        """
+        Run one temperature level: ``max_iterations`` proposed 2-opt moves, then cool down.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance passed to initialize.
+        on_iteration_callback : callable, optional
+            Called as ``f(iteration, best_path, best_distance)`` every
+            ``callback_interval`` levels.
+        callback_interval : int, optional
+            Default is 1.
+
+        Returns
+        -------
+        bool
+            False once the temperature is below stopping_temp or the run stagnated.
+        """
+        n = instance.dimension
+        # Stop once we either reach the stopping_temp or have stagnated for too long
+        if not self._can_continue(n):
+            return False
+
+        dist = self.dist
+        current_solution = self.current_solution
+        # Moves are sampled and evaluated on the raw arrays of the ArrayTour
+        order = current_solution.order
+        position = current_solution.pos
+        current_distance = self.current_distance
+        candidates = self.candidates
+        best_distance = self.best_path_len
+        best_order = self._best_order
+        tour_order = current_solution.as_array()
+        temp = self.temp
+        stats = self.stats
+
+        stagnation = True
+        # The current tour is a new best that is not copied to best_order yet
+        unsaved = False
+        # Read once per level, the inner loop only touches local counters
+        enabled = stats.enabled
+        if enabled:
+            level_start = time.perf_counter()
+            skipped = accepted = improving = 0
+        for _ in range(self.max_iterations):
+            if candidates is None:
+                i, j = self.sample_2opt_move(n)
             else:
-                stagnation_count = 0
+                i, j = self.sample_candidate_move(order, position, candidates)
+                if i >= j:
+                    if enabled:
+                        skipped += 1
+                    continue
+            delta = self.two_opt_delta(order, i, j, dist)
+
+            if delta < 0:
+                if unsaved and current_distance + delta >= best_distance:
+                    np.copyto(best_order, tour_order)
+                    unsaved = False
+                self.apply_2opt(current_solution, i, j)
+                current_distance += delta
+                if current_distance < best_distance:
+                    best_distance = current_distance
+                    unsaved = True
+                    stagnation = False
+                if enabled:
+                    improving += 1
+            # Accept worse solution with a probability
+            elif random.random() < exp_manual(-delta / temp):
+                if unsaved:
+                    np.copyto(best_order, tour_order)
+                    unsaved = False
+                self.apply_2opt(current_solution, i, j)
+                current_distance += delta
+                if enabled:
+                    accepted += 1
+
+        self.current_distance = current_distance
+        self.best_path_len = best_distance
+        # One list per level instead of one per new best
+        if unsaved:
+            np.copyto(best_order, tour_order)
+        if not stagnation:
+            self.best_path = best_order.tolist()
+
+        if enabled:
+            stats.add_time("search", time.perf_counter() - level_start)
+            stats.count("iterations")
+            evaluated = self.max_iterations - skipped
+            stats.count("moves_proposed", evaluated)
+            stats.count("moves_accepted", accepted + improving)
+            stats.count("moves_improving", improving)
+            stats.count("distance_lookups", 4 * evaluated)
+
+        if stagnation:
+            self.stagnation_count += 1
+            if self.stagnation_count == self.stagnation_threshold:
+                stats.count("stagnation_events")
+        else:
+            self.stagnation_count = 0
+
+        # Every iteration (of the outer loop), we record/update via callback
+        if on_iteration_callback and self.current_iter % callback_interval == 0:
+            with stats.phase("callback"):
+                on_iteration_callback(self.current_iter, self.best_path, self.best_path_len)
 
-            # Every iteration (of the outer loop), we record/update via callback
-            if on_iteration_callback and iteration % callback_interval == 0:
-                on_iteration_callback(iteration, best_solution, best_distance)
+        self.temp *= self.cooling_rate
+        self.current_iter += 1
+        self.evaluations += self.max_iterations
+        return self._can_continue(n)
+
+    def _can_continue(self, n):
+        if n <= 3:
+            self.stop_reason = "optimal"
+        elif self.temp <= self.stopping_temp:
+            self.stop_reason = "temperature"
+        elif self.stagnation_count >= self.stagnation_threshold:
+            self.stop_reason = "stagnation"
+        else:
+            return True
+        return False
+
+    def solve(
+        self, instance, on_iteration_callback=None, callback_interval=1, stagnation_threshold=500,
+        current_solution=None, time_limit=None, max_evaluations=None
+    ):
+        """
+        Run simulated annealing until it cools down, stagnates or exhausts a budget.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance to solve.
+        on_iteration_callback : callable, optional
+            Called as ``f(iteration, best_path, best_distance)`` every
+            ``callback_interval`` temperature levels and once at the end.
+        callback_interval : int, optional
+            Default is 1.
+        stagnation_threshold : int, optional
+            Levels without a new best tour before stopping. Default is 500.
+        current_solution : list of int, optional
+            Initial tour. By default it is built with the ``init`` strategy.
+        time_limit : float, optional
+            Wall-clock budget in seconds, checked after every temperature level.
+        max_evaluations : int, optional
+            Budget of proposed moves, checked after every temperature level.
+
+        Returns
+        -------
+        SolveResult
+            Unpacks as (best_path, best_distance); ``stop_reason`` tells why the run stopped.
+        """
+        start = time.monotonic()
+        deadline = None if time_limit is None else start + time_limit
+        self.initialize(instance, current_solution, stagnation_threshold)
+        self.run(
+            instance, deadline=deadline, max_evaluations=max_evaluations,
+            on_iteration_callback=on_iteration_callback, callback_interval=callback_interval,
+        )
 
-            temp *= self.cooling_rate
-            iteration += 1
+        # The running cost accumulates rounding error over many deltas
+        self.best_path_len = instance.total_distance(self.best_path)
+        self.stats.count("tour_evaluations")
+        self.stats.count("distance_lookups", instance.dimension)
 
         # Final callback after completion (optional)
         if on_iteration_callback:
-            on_iteration_callback(iteration, best_solution, best_distance)
+            on_iteration_callback(self.current_iter, self.best_path, self.best_path_len)
 
-        return best_solution, best_distance
+        return self._result(time.monotonic() - start)
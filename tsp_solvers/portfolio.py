@@ -0,0 +1,248 @@
+import multiprocessing
+import queue
+import random
+import time
+
+import numpy as np
+
+from .core.shared import SharedArray
+from .metaheuristics import AntColony, ParticleSwarmOptimization, SimulatedAnnealing
+
+
+class SharedIncumbent:
+    """
+    Best tour found so far by any process of a portfolio run.
+
+    The tour lives in shared memory, its length and a version counter in shared
+    values; updates are serialized by a lock. Can be passed to child processes.
+    """
+
+    def __init__(self, num_cities, ctx=multiprocessing):
+        self._tour = SharedArray.create((num_cities,), np.int32)
+        self._length = ctx.RawValue("d", float("inf"))
+        self._version = ctx.RawValue("q", 0)
+        self._lock = ctx.Lock()
+
+    def __getstate__(self):
+        return (self._tour.spec, self._length, self._version, self._lock)
+
+    def __setstate__(self, state):
+        spec, self._length, self._version, self._lock = state
+        self._tour = SharedArray.attach(spec)
+
+    @property
+    def length(self):
+        return self._length.value
+
+    @property
+    def version(self):
+        return self._version.value
+
+    def offer(self, tour, length):
+        """
+        Replace the incumbent if ``length`` is shorter.
+
+        Returns
+        -------
+        bool
+            True if the incumbent was updated.
+        """
+        if length >= self._length.value:
+            return False
+        with self._lock:
+            if length >= self._length.value:
+                return False
+            self._tour.array[:] = tour
+            self._length.value = length
+            self._version.value += 1
+        return True
+
+    def snapshot(self):
+        """
+        Returns
+        -------
+        tuple
+            (tour as list of int or None, length, version).
+        """
+        with self._lock:
+            if self._version.value == 0:
+                return None, self._length.value, 0
+            return self._tour.array.tolist(), self._length.value, self._version.value
+
+    def close(self):
+        self._tour.close()
+
+
+class Portfolio:
+    """
+    Run several solvers on the same instance at the same time, each in its own
+    process, sharing the best tour found so far.
+
+    Members publish every improvement to a SharedIncumbent. SimulatedAnnealing
+    restarts from the incumbent (via ``current_solution``), AntColony adopts it
+    as ``best_path`` and reinforces its edges with pheromone, and
+    ParticleSwarmOptimization only publishes.
+
+    Attributes
+    ----------
+    solvers : dict of str to solver
+        Portfolio members by name.
+    time_limit : float
+        Wall-clock budget in seconds.
+    grace_period : float
+        Extra seconds given to members to report their result after the budget.
+    seed : int or None
+        Base seed; member i is seeded with seed + i.
+    results : dict of str to tuple
+        (best_path, best_distance) reported by each member after solve().
+    winner : str or None
+        Name of the member that produced the returned tour.
+    """
+
+    def __init__(self, solvers=None, time_limit=10.0, grace_period=2.0, seed=None):
+        """
+        Parameters
+        ----------
+        solvers : dict of str to solver, optional
+            Members to run. Defaults to one SimulatedAnnealing, AntColony and
+            ParticleSwarmOptimization with default parameters.
+        time_limit : float, optional
+            Wall-clock budget in seconds. Default is 10.
+        grace_period : float, optional
+            Seconds to wait for members after the budget before terminating them. Default is 2.
+        seed : int, optional
+            Base seed for reproducible member runs.
+        """
+        if solvers is None:
+            solvers = {
+                "sa": SimulatedAnnealing(),
+                "aco": AntColony(seed=seed),
+                "pso": ParticleSwarmOptimization(),
+            }
+        self.solvers = solvers
+        self.time_limit = time_limit
+        self.grace_period = grace_period
+        self.seed = seed
+        self.results = {}
+        self.winner = None
+
+    def solve(self, instance):
+        """
+        Run all members until the time limit and return the best tour.
+
+        Parameters
+        ----------
+        instance : TSPInstance
+            The instance to solve.
+
+        Returns
+        -------
+        tuple
+            The best tour (list of city indices) and its total distance.
+        """
+        ctx = multiprocessing.get_context()
+        # Build the matrix once so forked members share its pages
+        instance.distance_matrix
+        incumbent = SharedIncumbent(instance.dimension, ctx)
+        result_queue = ctx.Queue()
+        deadline = time.monotonic() + self.time_limit
+
+        processes = []
+        for index, (name, solver) in enumerate(self.solvers.items()):
+            seed = None if self.seed is None else self.seed + index
+            process = ctx.Process(
+                target=_run_member,
+                args=(name, solver, instance, incumbent, deadline, seed, result_queue),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        self.results = {}
+        try:
+            while len(self.results) < len(processes):
+                remaining = deadline + self.grace_period - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    name, path, distance = result_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                self.results[name] = (path, distance)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        best_path, best_distance, _ = incumbent.snapshot()
+        incumbent.close()
+        self.winner = None
+        for name, (path, distance) in self.results.items():
+            if path is not None and distance <= best_distance:
+                best_path, best_distance, self.winner = path, distance, name
+        return best_path, best_distance
+
+
+def _run_member(name, solver, instance, incumbent, deadline, seed, result_queue):
+    if seed is not None:
+        random.seed(seed)
+    if isinstance(solver, AntColony):
+        path, distance = _run_ant_colony(solver, instance, incumbent, deadline)
+    else:
+        path, distance = _run_stepping_solver(solver, instance, incumbent, deadline)
+    result_queue.put((name, path, distance))
+
+
+class _Publisher:
+    """
+    Iteration callback shared by SA and PSO members: keeps the member's best tour
+    and publishes improvements to the incumbent.
+    """
+
+    def __init__(self, instance, incumbent):
+        self.instance = instance
+        self.incumbent = incumbent
+        self.best_path = None
+        self.best_distance = float("inf")
+
+    def __call__(self, iteration, best_solution, best_distance):
+        if best_distance < self.best_distance:
+            self.best_path = list(best_solution)
+            # Solvers may report a running cost; publish the exact length
+            self.best_distance = self.instance.total_distance(self.best_path)
+            self.incumbent.offer(self.best_path, self.best_distance)
+
+
+def _run_stepping_solver(solver, instance, incumbent, deadline):
+    """
+    Run SA or PSO until the deadline, restarting when a run finishes early.
+    SA restarts from the incumbent tour.
+    """
+    publisher = _Publisher(instance, incumbent)
+    while time.monotonic() < deadline:
+        if isinstance(solver, SimulatedAnnealing):
+            start, _, _ = incumbent.snapshot()
+            solver.initialize(instance, current_solution=start)
+        else:
+            solver.initialize(instance)
+        solver.run(instance, deadline=deadline, on_iteration_callback=publisher)
+        publisher(solver.current_iter, solver.best_path, solver.best_path_len)
+    return publisher.best_path, publisher.best_distance
+
+
+def _run_ant_colony(solver, instance, incumbent, deadline):
+    solver.initialize(instance)
+    seen_version = 0
+    try:
+        while time.monotonic() < deadline:
+            if incumbent.version != seen_version:
+                path, length, seen_version = incumbent.snapshot()
+                solver.inject_solution(path, length)
+            continue_solving = solver.solve_step(instance)
+            incumbent.offer(solver.best_path, solver.best_path_len)
+            if not continue_solving:
+                break
+    finally:
+        solver.close()
+    return solver.best_path, solver.best_path_len
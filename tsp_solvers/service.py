@@ -0,0 +1,555 @@
+"""
+Local asyncio solve service with a warm pool of worker processes.
+
+Clients connect over a UNIX socket or localhost TCP and either send one JSON
+request per line (and read JSON event lines back) or speak HTTP: ``POST /solve``
+with a JSON body streams the events as newline-delimited JSON, ``GET /health``
+reports the pool. A request looks like::
+
+    {"id": "r1", "instance": {"path": "data/qa194.tsp"}, "solver": "sa",
+     "params": {"candidate_k": 8}, "time_limit": 5}
+
+``instance`` is either a server-side ``path`` or inline ``coords`` (a list of
+[x, y], with optional ``edge_weight_type``); ``float_dist`` selects TSPLIB
+rounding. Events are ``progress`` (iteration, best distance, elapsed), then
+one ``result`` (tour, length, stop reason, counters) or ``error``.
+
+Workers are started once and keep the most recently used instances, with their
+distance matrices and candidate lists, in memory; requests are routed to a
+worker that already has the instance when one is free. A worker that dies fails
+its pending requests with an ``error`` event and is replaced; a request whose
+client went away is skipped or stopped at its next iteration.
+
+Usage::
+
+    python -m tsp_solvers.service --unix /tmp/tsp.sock --workers 4
+    python -m tsp_solvers.service --port 8765
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from .core.task_holder import TSPInstance
+from .metaheuristics import AntColony, ParticleSwarmOptimization, SimulatedAnnealing
+
+SOLVERS = {
+    "sa": SimulatedAnnealing,
+    "aco": AntColony,
+    "pso": ParticleSwarmOptimization,
+}
+
+_HTTP_METHODS = (b"GET ", b"POST ", b"HEAD ", b"PUT ", b"DELETE ", b"OPTIONS ")
+
+# Largest accepted HTTP request body (inline coords of about a million cities)
+MAX_BODY_SIZE = 64 * 2**20
+
+
+class SolveService:
+    """
+    Dispatch solve requests to persistent worker processes and stream their events.
+
+    Attributes
+    ----------
+    num_workers : int
+        Number of worker processes.
+    cache_size : int
+        Instances kept warm per worker (least recently used ones are dropped).
+    progress_interval : float
+        Minimum seconds between two progress events of a request.
+    cache_dir : str or None
+        Optional InstanceCache directory used by the workers for ``path`` instances.
+    """
+
+    def __init__(self, num_workers=None, cache_size=8, progress_interval=0.1, cache_dir=None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.cache_size = cache_size
+        self.progress_interval = progress_interval
+        self.cache_dir = cache_dir
+        self.restarts = 0
+        self._workers = []
+        self._streams = {}
+        self._ids = itertools.count()
+        self._tokens = itertools.count()
+        self._loop = None
+        self._reader = None
+        self._closing = False
+
+    async def start(self):
+        """
+        Start the worker processes and the event reader.
+        """
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._closing = False
+        self._workers = [self._start_worker(index) for index in range(self.num_workers)]
+        self._wake, self._wake_sender = multiprocessing.Pipe(duplex=False)
+        self._reader = threading.Thread(target=self._read_events, daemon=True)
+        self._reader.start()
+
+    def _start_worker(self, index):
+        ctx = multiprocessing.get_context()
+        tasks = ctx.Queue()
+        cancels = ctx.Queue()
+        # One pipe per worker: a worker dying in the middle of a write cannot block the others
+        events, sender = ctx.Pipe(duplex=False)
+        # Not daemonic, so AntColony(num_workers > 1) can still start its own pool
+        process = ctx.Process(
+            target=_worker_main, args=(tasks, cancels, sender, self.cache_size, self.cache_dir),
+            name=f"tsp-worker-{index}",
+        )
+        process.start()
+        sender.close()
+        return _Worker(process, tasks, cancels, events, self.cache_size)
+
+    async def close(self):
+        """
+        Stop the workers after their current request.
+        """
+        self._closing = True
+        for worker in self._workers:
+            worker.tasks.put(None)
+        for worker in self._workers:
+            await self._loop.run_in_executor(None, worker.process.join)
+        if self._reader is not None:
+            self._wake_sender.send(None)
+            self._reader.join()
+            self._reader = None
+            self._wake.close()
+            self._wake_sender.close()
+        for worker in self._workers:
+            worker.close()
+        self._workers = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def health(self):
+        return {
+            "workers": len(self._workers),
+            "alive": sum(worker.process.is_alive() for worker in self._workers),
+            "restarts": self.restarts,
+            "pending": [worker.pending for worker in self._workers],
+            "warm": [list(worker.warm) for worker in self._workers],
+        }
+
+    async def solve(self, request):
+        """
+        Solve one request, yielding its events as they arrive.
+
+        Parameters
+        ----------
+        request : dict
+            See the module docstring.
+
+        Yields
+        ------
+        dict
+            ``progress`` events, then one ``result`` or ``error`` event. Every
+            event carries the request ``id``.
+        """
+        request_id = str(request.get("id", f"req-{next(self._ids)}"))
+        try:
+            task = self._make_task(request_id, request)
+        except (KeyError, TypeError, ValueError, OSError) as error:
+            yield {"event": "error", "id": request_id, "message": f"{type(error).__name__}: {error}"}
+            return
+        if not self._workers:
+            await self.start()
+
+        stream = asyncio.Queue()
+        token, key = task[0], task[2]
+        worker = self._pick_worker(key)
+        worker.assign(key, request_id)
+        self._streams[request_id] = stream
+        worker.tasks.put(task)
+        finished = False
+        try:
+            while not finished:
+                event = await stream.get()
+                finished = event["event"] != "progress"
+                if not finished:
+                    yield event
+        finally:
+            worker.release(request_id)
+            del self._streams[request_id]
+            if not finished and worker in self._workers:
+                # Closed before the end (client disconnected): the worker skips or stops the task
+                worker.cancels.put(token)
+        yield event
+
+    def _make_task(self, request_id, request):
+        if request_id in self._streams:
+            raise ValueError(f"Request id {request_id!r} is already running")
+        solver = request.get("solver", "sa")
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver {solver!r}, expected one of {sorted(SOLVERS)}")
+        spec = dict(request["instance"])
+        spec["float_dist"] = bool(request.get("float_dist", spec.get("float_dist", True)))
+        if "path" in spec:
+            stat = os.stat(spec["path"])
+            spec["path"] = os.path.abspath(spec["path"])
+            key = f"path:{spec['path']}:{stat.st_mtime_ns}:{stat.st_size}:{spec['float_dist']}"
+        elif "coords" in spec:
+            coords = np.asarray(spec["coords"], dtype=np.float64)
+            if coords.ndim != 2 or coords.shape[1] != 2 or len(coords) < 2:
+                raise ValueError("coords must be a list of at least two [x, y] pairs")
+            digest = hashlib.blake2b(coords.tobytes(), digest_size=16).hexdigest()
+            key = f"coords:{digest}:{spec.get('edge_weight_type', 'EUC_2D')}:{spec['float_dist']}"
+        else:
+            raise ValueError("instance needs a 'path' or 'coords'")
+        budgets = {"time_limit": request.get("time_limit"), "max_evaluations": request.get("max_evaluations")}
+        interval = request.get("progress_interval", self.progress_interval)
+        return (next(self._tokens), request_id, key, spec, solver, dict(request.get("params", {})), budgets, interval)
+
+    def _pick_worker(self, key):
+        # A free worker with the instance warm, else any free worker, else the least loaded one
+        ranked = sorted(self._workers, key=lambda worker: (worker.pending > 0, key not in worker.warm, worker.pending))
+        return ranked[0]
+
+    def _read_events(self):
+        # Forwards worker events to the loop and reports exited workers; woken
+        # through _wake when the workers change (True) or the service closes (None)
+        exited = set()
+        while True:
+            workers = [worker for worker in self._workers if worker not in exited]
+            pipes = {worker.events: worker for worker in workers}
+            sentinels = {worker.process.sentinel: worker for worker in workers}
+            ready = multiprocessing.connection.wait([self._wake, *pipes, *sentinels])
+            if self._wake in ready and self._wake.recv() is None:
+                break
+            for item in ready:
+                if item in pipes:
+                    try:
+                        self._loop.call_soon_threadsafe(self._dispatch, item.recv())
+                    except (EOFError, OSError):
+                        pass
+            for item in ready:
+                if item in sentinels:
+                    worker = sentinels[item]
+                    # Events sent before the exit still arrive before the failure
+                    try:
+                        while worker.events.poll():
+                            self._loop.call_soon_threadsafe(self._dispatch, worker.events.recv())
+                    except (EOFError, OSError):
+                        pass
+                    exited.add(worker)
+                    self._loop.call_soon_threadsafe(self._replace_worker, worker)
+
+    def _dispatch(self, event):
+        stream = self._streams.get(event["id"])
+        if stream is not None:
+            stream.put_nowait(event)
+
+    def _replace_worker(self, worker):
+        if self._closing or worker not in self._workers:
+            return
+        worker.process.join()
+        index = self._workers.index(worker)
+        self._workers[index] = self._start_worker(index)
+        self.restarts += 1
+        self._wake_sender.send(True)
+        message = f"Worker {worker.process.name} exited with code {worker.process.exitcode}"
+        for request_id in list(worker.requests):
+            self._dispatch({"event": "error", "id": request_id, "message": message})
+        worker.close()
+
+    async def serve(self, unix_path=None, host="127.0.0.1", port=None):
+        """
+        Accept connections until cancelled.
+
+        Parameters
+        ----------
+        unix_path : str, optional
+            Listen on this UNIX socket.
+        host : str
+            TCP host, localhost by default.
+        port : int, optional
+            Listen on this TCP port.
+        """
+        await self.start()
+        servers = []
+        if unix_path is not None:
+            servers.append(await asyncio.start_unix_server(self._handle_connection, path=unix_path))
+        if port is not None:
+            servers.append(await asyncio.start_server(self._handle_connection, host, port))
+        if not servers:
+            raise ValueError("Give a unix_path or a port")
+        try:
+            await asyncio.gather(*(server.serve_forever() for server in servers))
+        finally:
+            for server in servers:
+                server.close()
+            await self.close()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            first = await reader.readline()
+            if first.startswith(_HTTP_METHODS):
+                await self._handle_http(first, reader, writer)
+            else:
+                await self._handle_lines(first, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_lines(self, line, reader, writer):
+        # Requests of one connection run concurrently; their events interleave
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(request):
+            events = self.solve(request)
+            try:
+                async for event in events:
+                    async with lock:
+                        writer.write(json.dumps(event).encode() + b"\n")
+                        await writer.drain()
+            finally:
+                # Cancels the task right away when the client is gone
+                await events.aclose()
+
+        while line:
+            if line.strip():
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    request = None
+                    async with lock:
+                        writer.write(json.dumps({"event": "error", "message": f"Invalid JSON: {error}"}).encode() + b"\n")
+                        await writer.drain()
+                if request is not None:
+                    task = asyncio.ensure_future(answer(request))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            line = await reader.readline()
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _handle_http(self, request_line, reader, writer):
+        method, target = request_line.decode("latin-1").split()[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            _write_http(writer, 400, b'{"message": "Invalid Content-Length"}', "application/json")
+            await writer.drain()
+            return
+        if length > MAX_BODY_SIZE:
+            _write_http(writer, 413, b'{"message": "Request body too large"}', "application/json")
+            await writer.drain()
+            return
+        body = await reader.readexactly(length)
+
+        if method == "GET" and target == "/health":
+            _write_http(writer, 200, json.dumps(self.health()).encode(), "application/json")
+        elif method == "POST" and target == "/solve":
+            try:
+                request = json.loads(body)
+            except ValueError as error:
+                _write_http(writer, 400, json.dumps({"message": f"Invalid JSON: {error}"}).encode(), "application/json")
+            else:
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                    b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+                )
+                events = self.solve(request)
+                try:
+                    async for event in events:
+                        chunk = json.dumps(event).encode() + b"\n"
+                        writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        await writer.drain()
+                finally:
+                    await events.aclose()
+                writer.write(b"0\r\n\r\n")
+        else:
+            _write_http(writer, 404, b'{"message": "Not found"}', "application/json")
+        await writer.drain()
+
+
+class _Worker:
+    """
+    Main-process view of a worker: its task, cancellation and event channels,
+    requests in flight and a mirror of its instance cache (used for routing only).
+    """
+
+    def __init__(self, process, tasks, cancels, events, cache_size):
+        self.process = process
+        self.tasks = tasks
+        self.cancels = cancels
+        self.events = events
+        self.cache_size = cache_size
+        self.requests = set()
+        self.warm = OrderedDict()
+
+    @property
+    def pending(self):
+        return len(self.requests)
+
+    def assign(self, key, request_id):
+        self.requests.add(request_id)
+        self.warm[key] = None
+        self.warm.move_to_end(key)
+        while len(self.warm) > self.cache_size:
+            self.warm.popitem(last=False)
+
+    def release(self, request_id):
+        self.requests.discard(request_id)
+
+    def close(self):
+        # Queued items of a dead worker are dropped instead of blocking the exit
+        for channel in (self.tasks, self.cancels):
+            channel.cancel_join_thread()
+            channel.close()
+        self.events.close()
+
+
+def _write_http(writer, status, body, content_type):
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large"}[status]
+    writer.write(
+        f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _poll_cancels(cancels, cancelled):
+    while not cancels.empty():
+        try:
+            cancelled.add(cancels.get_nowait())
+        except queue.Empty:
+            break
+
+
+class _ProgressReporter:
+    """
+    on_iteration_callback of worker solves: sends a progress event at most every
+    ``interval`` seconds and stops the solve (raises _Cancelled) once its task
+    is cancelled. Accepts the extra pheromone argument of AntColony.
+    """
+
+    def __init__(self, events, request_id, interval, start, cancels, cancelled, token):
+        self.events = events
+        self.request_id = request_id
+        self.interval = interval
+        self.start = start
+        self.last = start
+        self.cancels = cancels
+        self.cancelled = cancelled
+        self.token = token
+
+    def __call__(self, iteration, best_path, best_distance, *extra):
+        _poll_cancels(self.cancels, self.cancelled)
+        if self.token in self.cancelled:
+            raise _Cancelled
+        now = time.monotonic()
+        if now - self.last < self.interval:
+            return
+        self.last = now
+        self.events.send({
+            "event": "progress", "id": self.request_id, "iteration": int(iteration),
+            "best_distance": float(best_distance), "elapsed": now - self.start,
+        })
+
+
+def _worker_main(tasks, cancels, events, cache_size, cache_dir):
+    instances = OrderedDict()
+    cancelled = set()
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        token, request_id, key, spec, solver, params, budgets, interval = task
+        _poll_cancels(cancels, cancelled)
+        # Tokens increase, so cancellations of earlier tasks are stale
+        cancelled.difference_update([other for other in cancelled if other < token])
+        if token in cancelled:
+            continue
+        start = time.monotonic()
+        try:
+            warm = key in instances
+            if warm:
+                instances.move_to_end(key)
+            else:
+                instances[key] = _load_instance(spec, cache_dir)
+                if len(instances) > cache_size:
+                    instances.popitem(last=False)
+            instance = instances[key]
+            # Built once per cached instance
+            instance.distance_matrix
+            setup = time.monotonic() - start
+
+            reporter = _ProgressReporter(events, request_id, interval, start, cancels, cancelled, token)
+            solver = SOLVERS[solver](**params)
+            result = solver.solve(instance, on_iteration_callback=reporter, **budgets)
+            events.send({
+                "event": "result", "id": request_id, "tour": [int(city) for city in result.best_path],
+                "length": float(result.best_distance), "stop_reason": result.stop_reason,
+                "iterations": result.iterations, "evaluations": result.evaluations,
+                "elapsed": time.monotonic() - start, "setup": setup, "warm": warm, "worker": os.getpid(),
+            })
+        except _Cancelled:
+            pass
+        except Exception as error:
+            events.send({"event": "error", "id": request_id, "message": f"{type(error).__name__}: {error}"})
+
+
+def _load_instance(spec, cache_dir):
+    if "path" in spec:
+        return TSPInstance.from_file(spec["path"], float_dist=spec["float_dist"], cache_dir=cache_dir)
+    return TSPInstance(
+        name=spec.get("name", "inline"), comment="", dimension=None, coords=spec["coords"],
+        float_dist=spec["float_dist"], edge_weight_type=spec.get("edge_weight_type", "EUC_2D"),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--unix", metavar="PATH", help="listen on this UNIX socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="listen on this TCP port (HTTP or JSON lines)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--cache-size", type=int, default=8, help="instances kept warm per worker")
+    parser.add_argument("--cache-dir", help="InstanceCache directory for path instances")
+    args = parser.parse_args(argv)
+    if args.unix is None and args.port is None:
+        parser.error("give --unix and/or --port")
+
+    service = SolveService(args.workers, args.cache_size, cache_dir=args.cache_dir)
+    try:
+        asyncio.run(service.serve(args.unix, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,109 @@
 import tkinter as tk
 
+import numpy as np
+
+from .solver_thread import SolverThread
+
+
+class PheromoneRenderer:
+    """
+    Incremental pheromone view on a Tk canvas.
+
+    Only the ``top_k`` strongest edges are shown. In edge mode every shown edge
+    is a persistent line item: items are recycled between edges leaving and
+    entering the top-k, and an item is only re-colored when the pheromone
+    bucket of its edge changes. Above ``raster_threshold`` cities the edges are
+    rasterized with NumPy into a single image item instead.
+    """
+
+    def __init__(self, canvas, scaled_coords, canvas_size, top_k=None, levels=16, raster_threshold=400):
+        self.canvas = canvas
+        self.points = np.asarray(scaled_coords, dtype=np.float64).reshape(-1, 2)
+        self.canvas_size = canvas_size
+        num_cities = len(self.points)
+        self.top_k = top_k if top_k is not None else min(num_cities * (num_cities - 1) // 2, 4 * num_cities, 3000)
+        self.levels = levels
+        self.raster = num_cities > raster_threshold
+        # Upper triangle pairs, flattened once
+        self.rows, self.cols = np.triu_indices(num_cities, k=1)
+        # Edge mode: pair index -> [item id, bucket]
+        self.items = {}
+        # Line items currently hidden, ready for reuse
+        self.spare = []
+        self.colors = [f"#FF{255 - int(255 * level / (levels - 1)):02x}FF" for level in range(levels)]
+        self.widths = [1 + int(3 * level / (levels - 1)) for level in range(levels)]
+        self.image = None
+        self.image_item = None
+
+    def draw(self, pheromones):
+        values = np.asarray(pheromones, dtype=np.float64)[self.rows, self.cols]
+        low, high = values.min(), values.max()
+        if high == low:
+            high += 1  # Prevent division by zero
+        # Strongest edges, unordered
+        k = min(self.top_k, len(values))
+        top = np.argpartition(values, len(values) - k)[len(values) - k:] if k < len(values) else np.arange(len(values))
+        top = top[values[top] > 0]
+        buckets = ((values[top] - low) / (high - low) * (self.levels - 1)).astype(np.int64)
+        np.clip(buckets, 0, self.levels - 1, out=buckets)
+        if self.raster:
+            self._draw_raster(top, buckets)
+        else:
+            self._draw_edges(top, buckets)
+
+    def _draw_edges(self, top, buckets):
+        canvas = self.canvas
+        shown = dict(zip(top.tolist(), buckets.tolist()))
+        for edge in [edge for edge in self.items if edge not in shown]:
+            item, _ = self.items.pop(edge)
+            canvas.itemconfigure(item, state="hidden")
+            self.spare.append(item)
+        for edge, bucket in shown.items():
+            entry = self.items.get(edge)
+            if entry is None:
+                a, b = self.points[self.rows[edge]], self.points[self.cols[edge]]
+                if self.spare:
+                    item = self.spare.pop()
+                    canvas.coords(item, a[0], a[1], b[0], b[1])
+                    canvas.itemconfigure(item, state="normal", fill=self.colors[bucket], width=self.widths[bucket])
+                else:
+                    item = canvas.create_line(
+                        a[0], a[1], b[0], b[1], fill=self.colors[bucket], width=self.widths[bucket], tags="pheromone"
+                    )
+                    canvas.tag_lower(item)
+                self.items[edge] = [item, bucket]
+            elif entry[1] != bucket:
+                canvas.itemconfigure(entry[0], fill=self.colors[bucket], width=self.widths[bucket])
+                entry[1] = bucket
+
+    def _draw_raster(self, top, buckets):
+        size = self.canvas_size
+        start, end = self.points[self.rows[top]], self.points[self.cols[top]]
+        # One sample per pixel along every edge
+        counts = np.ceil(np.hypot(*(end - start).T)).astype(np.int64) + 1
+        edge = np.repeat(np.arange(len(top)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = (offsets / np.maximum(counts - 1, 1)[edge])[:, None]
+        pixels = np.rint(start[edge] + t * (end - start)[edge]).astype(np.int64)
+        np.clip(pixels, 0, size - 1, out=pixels)
+        grid = np.zeros(size * size, dtype=np.int64)
+        np.maximum.at(grid, pixels[:, 1] * size + pixels[:, 0], buckets[edge] + 1)
+
+        # White background, edges from light to full magenta like the line colors
+        green = np.full(size * size, 255, dtype=np.uint8)
+        drawn = grid > 0
+        green[drawn] = 255 - (255 * (grid[drawn] - 1) // (self.levels - 1))
+        rgb = np.full((size * size, 3), 255, dtype=np.uint8)
+        rgb[:, 1] = green
+        data = b"P6 %d %d 255\n" % (size, size) + rgb.tobytes()
+        if self.image is None:
+            self.image = tk.PhotoImage(data=data, format="PPM")
+            self.image_item = self.canvas.create_image(0, 0, image=self.image, anchor="nw", tags="pheromone")
+            self.canvas.tag_lower(self.image_item)
+        else:
+            self.image.configure(data=data, format="PPM")
+
+
 class AntColonyApp:
     def __init__(self, master, instance, solver):
         self.master = master
@@ -36,8 +140,16 @@ class AntColonyApp:
         self.coords = instance.coords
         self.scaled_coords = self.scale_coords(self.coords)
 
+        # Persistent canvas items, updated in place on every frame
+        self.renderer = PheromoneRenderer(self.canvas, self.scaled_coords, self.canvas_size)
+        self.path_item = None
+        # The solver runs in a SolverThread; its latest snapshot is drawn max_fps times per second
+        self.worker = None
+        self.max_fps = 20
+
         # Initial drawing
-        self.draw_pheromones([[self.solver.initial_pheromone_level]*len(self.coords)]*len(self.coords))
+        num_cities = len(self.coords)
+        self.draw_pheromones(np.full((num_cities, num_cities), self.solver.initial_pheromone_level))
         self.draw_cities()
 
     def scale_coords(self, coords):
@@ -52,47 +164,29 @@ class AntColonyApp:
         return [(scale(x, min_x, max_x), scale(y, min_y, max_y)) for x, y in coords]
 
     def draw_cities(self):
+        radius = 5 if len(self.scaled_coords) <= 200 else 2
         for x, y in self.scaled_coords:
-            self.canvas.create_oval(x - 5, y - 5, x + 5, y + 5, fill="blue")
+            self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, fill="blue", tags="city")
 
     def draw_path(self, path, color="red", width=2):
-        if not path:
+        if path is None or len(path) == 0:
             return
-        for i in range(len(path)):
-            city_a = self.scaled_coords[path[i]]
-            city_b = self.scaled_coords[path[(i + 1) % len(path)]]
-            self.canvas.create_line(city_a[0], city_a[1], city_b[0], city_b[1], fill=color, width=width)
+        # A single closed polyline item, moved instead of redrawn
+        points = np.asarray(self.scaled_coords)[np.append(path, path[0])].ravel().tolist()
+        if self.path_item is None:
+            self.path_item = self.canvas.create_line(*points, fill=color, width=width, tags="path")
+        else:
+            self.canvas.coords(self.path_item, *points)
+            self.canvas.itemconfigure(self.path_item, fill=color, width=width)
+        self.canvas.tag_raise(self.path_item)
 
     def draw_pheromones(self, pheromones):
-        self.canvas.delete("pheromone")
-        num_cities = len(pheromones)
-        max_pheromone = max(max(row) for row in pheromones) if pheromones else 1
-        min_pheromone = min(min(row) for row in pheromones) if pheromones else 0
-
-        if max_pheromone == min_pheromone:
-            max_pheromone += 1  # Prevent division by zero
-
-        for i in range(num_cities):
-            for j in range(i + 1, num_cities):
-                if pheromones[i][j] > 0:
-                    city_a = self.scaled_coords[i]
-                    city_b = self.scaled_coords[j]
-                    # Normalize pheromone intensity between 0 and 255
-                    intensity = int(255 * (pheromones[i][j] - min_pheromone) / (max_pheromone - min_pheromone))
-                    intensity = max(0, min(255, intensity))  # Clamp to [0, 255]
-                    color = f"#FF{255 - intensity:02x}FF"  # Example color mapping
-                    line_width = 1 + int(3 * (pheromones[i][j] - min_pheromone) / (max_pheromone - min_pheromone))
-                    self.canvas.create_line(
-                        city_a[0], city_a[1], city_b[0], city_b[1],
-                        fill=color, width=line_width, tags="pheromone"
-                    )
+        self.renderer.draw(pheromones)
 
     def update_visuals(self, iteration, best_path, best_distance, pheromones):
         self.master.title(f"Iteration {iteration}, Best Distance: {best_distance:.2f}")
-        self.canvas.delete("all")
-        self.draw_pheromones(pheromones)  # Draw pheromone trails first
-        self.draw_cities()  # Draw cities on top
-        self.draw_path(best_path, width=2, color='black')  # Draw the best path last
+        self.draw_pheromones(pheromones)  # Pheromone items stay below the cities
+        self.draw_path(best_path, width=2, color='black')  # Best path on top
 
     def create_input_fields(self):
         tk.Label(self.input_frame, text="ACO Parameters", font=("Arial", 14, "bold")).pack(pady=5)
@@ -161,37 +255,45 @@ class AntColonyApp:
             # Set running flag
             self.running = True
 
-            # Start the iterative solving process
-            self.run_solver_step()
+            # Solve in the background, copying the pheromones only for snapshots the GUI will draw
+            self.worker = SolverThread(self.solver, self.instance, snapshot=lambda solver: solver.pheromones.copy())
+            self.worker.start()
+            self.poll_solver()
 
         except ValueError as e:
             tk.messagebox.showerror("Input Error", str(e))
 
-    def run_solver_step(self):
-        if not self.running:
+    def poll_solver(self):
+        worker = self.worker
+        if worker is None:
             return
-
-        continue_solving = self.solver.solve_step(
-            self.instance,
-            on_iteration_callback=self.update_visuals
-        )
-
-        if not continue_solving:
-            self.running = False
-            self.start_button.config(state="normal")
-            self.stop_button.config(state="disabled")
+        snapshot = worker.latest()
+        if snapshot is not None and snapshot.best_path is not None:
+            self.update_visuals(snapshot.iteration, snapshot.best_path, snapshot.best_distance, snapshot.extra)
+        if worker.is_alive() or not worker.snapshots.empty():
+            self.master.after(1000 // self.max_fps, self.poll_solver)
             return
-
-        # Schedule the next iteration
-        self.master.after(1, self.run_solver_step)
+        if worker.error is not None:
+            self.master.title(f"ACO failed: {worker.error}")
+        self.worker = None
+        self.running = False
+        self.solver.close()
+        self.start_button.config(state="normal")
+        self.stop_button.config(state="disabled")
 
     def stop_solver(self):
         if not self.running:
             return
+        if self.worker is not None:
+            # The poll loop resets the buttons once the thread has finished its step
+            self.worker.stop(timeout=0)
+            return
         self.running = False
         self.start_button.config(state="normal")
         self.stop_button.config(state="disabled")
 
     def on_close(self):
-        self.stop_solver()
+        if self.worker is not None:
+            self.worker.stop()
+            self.solver.close()
         self.master.destroy()
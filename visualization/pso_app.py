@@ -1,5 +1,7 @@
 import tkinter as tk
 
+from .solver_thread import SolverThread
+
 class ParticleSwormApp:
     def __init__(self, instance, solver):
         self.instance = instance
@@ -15,6 +17,10 @@ class ParticleSwormApp:
         # Scale the coordinates to fit within the canvas
         self.coords = self.scale_coordinates(instance.coords)
 
+        # The solver runs in a SolverThread; its latest snapshot is drawn fps times per second
+        self.worker = None
+        self.fps = 25
+
     def scale_coordinates(self, coords):
         """Scale coordinates to fit the canvas size."""
         max_x = max(c[0] for c in coords)
@@ -66,27 +72,34 @@ class ParticleSwormApp:
             text=f"Iteration: {iteration} | Best Distance: {best_distance:.2f}",
             fill="black", font=("Arial", 16), tags="iteration"
         )
-        self.root.update()
 
     def solve_and_visualize(self):
-        """Solve the TSP and visualize each iteration."""
-        def iteration_callback(iteration, solution, distance):
-            if iteration % 100 == 0:  # Update visualization every 100 iterations
-                self.update_visualization(iteration, solution, distance)
-
+        """Solve the TSP in a background thread and visualize its progress."""
         # Draw initial setup
         self.draw_cities()
 
-        # Solve the TSP with visualization
-        best_solution, best_distance = self.solver.solve(
-            self.instance,
-            on_iteration_callback=iteration_callback,
-            callback_interval=1
-        )
+        self.solver.initialize(self.instance)
+        self.worker = SolverThread(self.solver, self.instance).start()
+        self.poll_solver()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.mainloop()
+
+    def poll_solver(self):
+        """Draw the newest snapshot of the solver, until its run is over."""
+        worker = self.worker
+        snapshot = worker.latest()
+        if snapshot is not None:
+            self.update_visualization(snapshot.iteration, snapshot.best_path, snapshot.best_distance)
+        if worker.is_alive() or not worker.snapshots.empty():
+            self.root.after(1000 // self.fps, self.poll_solver)
+            return
 
         # Display the final solution
-        self.update_visualization("Final", best_solution, best_distance)
-        print("Best Solution:", best_solution)
-        print("Best Distance:", best_distance)
+        self.update_visualization("Final", self.solver.best_path, self.solver.best_path_len)
+        print("Best Solution:", self.solver.best_path)
+        print("Best Distance:", self.solver.best_path_len)
 
-        self.root.mainloop()
\ No newline at end of file
+    def on_close(self):
+        if self.worker is not None:
+            self.worker.stop()
+        self.root.destroy()
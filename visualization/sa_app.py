@@ -1,7 +1,6 @@
 import tkinter as tk
-import math
-import random
 from tsp_solvers.metaheuristics.simulated_annealing import SimulatedAnnealing
+from .solver_thread import SolverThread
 
 class SimulatedAnnealingApp:
     def __init__(self, master, instance):
@@ -95,13 +94,9 @@ class SimulatedAnnealingApp:
         self.best_distance = None
         self.paused = False
         self.stagnation_threshold = 500
-
-        # State for incremental runs
-        self.temp = self.sa_solver.initial_temp
-        self.iteration = 0
-        self.stagnation_count = 0
-        self.current_solution = None
-        self.current_distance = None
+        # The solver runs in a SolverThread; the GUI redraws its latest snapshot fps times per second
+        self.worker = None
+        self.fps = 25
 
         # Initially no route drawn
         self.draw_points()
@@ -122,6 +117,7 @@ class SimulatedAnnealingApp:
 
     def start_sa(self):
         self.paused = False
+        self.stop_worker()
 
         # Update SA parameters based on user inputs
         self.sa_solver.initial_temp = self.initial_temp_var.get()
@@ -129,81 +125,65 @@ class SimulatedAnnealingApp:
         self.sa_solver.stopping_temp = self.stopping_temp_var.get()
         self.sa_solver.max_iterations = self.max_iterations_var.get()
 
-        # Initialize or re-initialize SA parameters
-        n = self.instance.dimension
-        self.current_solution = list(range(n))
-        random.shuffle(self.current_solution)
-        self.current_distance = self.instance.total_distance(self.current_solution)
-        self.best_solution = self.current_solution[:]
-        self.best_distance = self.current_distance
-        self.temp = self.sa_solver.initial_temp
-        self.iteration = 0
-        self.stagnation_count = 0
+        # Initialize or re-initialize the solver's run state
+        self.sa_solver.initialize(self.instance, stagnation_threshold=self.stagnation_threshold)
+        self.best_solution = self.sa_solver.best_path
+        self.best_distance = self.sa_solver.best_path_len
+
+        self.update_stats_labels(iteration=0, best_distance=self.best_distance, temp=self.sa_solver.temp)
+        self.worker = SolverThread(self.sa_solver, self.instance, snapshot=lambda solver: solver.temp).start()
+        self.poll_worker()
 
-        self.update_stats_labels(iteration=self.iteration, best_distance=self.best_distance, temp=self.temp)
-        self.run_iteration_step()
+    def stop_worker(self):
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
 
     def pause(self):
         self.paused = True
+        if self.worker is not None:
+            self.worker.pause()
 
     def resume(self):
         if self.paused:
             self.paused = False
-            self.run_iteration_step()
+            if self.worker is not None:
+                self.worker.resume()
 
     def reset_temperature(self):
-        if self.sa_solver:
-            self.temp = self.sa_solver.initial_temp
-            self.update_stats_labels(iteration=self.iteration, best_distance=self.best_distance, temp=self.temp)
-
-    def run_iteration_step(self):
-        if self.paused:
+        if self.sa_solver.finished:
             return
 
-        # Stop condition
-        if self.temp <= self.sa_solver.stopping_temp or self.stagnation_count >= self.stagnation_threshold:
-            self.master.title(f"SA Completed! Best: {self.best_distance:.2f}")
-            return
+        def reset():
+            self.sa_solver.temp = self.sa_solver.initial_temp
 
-        # Perform one "outer iteration" of SA logic (similar to what solve does)
-        # but in an incremental fashion. We replicate the logic from solve()
-        stagnation = True
-        for _ in range(self.sa_solver.max_iterations):
-            new_solution = self.sa_solver.get_neighbor_2opt(self.current_solution)
-            new_distance = self.instance.total_distance(new_solution)
-
-            if new_distance < self.current_distance:
-                self.current_solution = new_solution
-                self.current_distance = new_distance
-                if self.current_distance < self.best_distance:
-                    self.best_distance = self.current_distance
-                    self.best_solution = self.current_solution[:]
-                    stagnation = False
-            else:
-                diff = self.current_distance - new_distance
-                if random.random() < math.exp(diff / self.temp):
-                    self.current_solution = new_solution
-                    self.current_distance = new_distance
-
-        if stagnation:
-            self.stagnation_count += 1
+        # Between two temperature levels of the running solver
+        if self.worker is not None and self.worker.is_alive():
+            self.worker.submit(reset)
         else:
-            self.stagnation_count = 0
-
-        self.iteration_callback(self.iteration, self.best_solution, self.best_distance)
-        self.temp *= self.sa_solver.cooling_rate
-        self.iteration += 1
-
-        # Schedule the next step
-        self.master.after(10, self.run_iteration_step)
-
-    def iteration_callback(self, iteration, best_solution, best_distance):
-        self.best_solution = best_solution
-        self.best_distance = best_distance
-        self.master.title(f"SA Iteration {iteration}, Best: {best_distance:.2f}")
-        self.draw_points()
-        self.update_stats_labels(iteration=iteration, best_distance=best_distance, temp=self.temp)
-        self.master.update_idletasks()
+            reset()
+            self.update_stats_labels(
+                iteration=self.sa_solver.current_iter, best_distance=self.best_distance, temp=self.sa_solver.temp
+            )
+
+    def poll_worker(self):
+        worker = self.worker
+        if worker is None:
+            return
+        snapshot = worker.latest()
+        if snapshot is not None:
+            self.best_solution = snapshot.best_path
+            self.best_distance = snapshot.best_distance
+            self.master.title(f"SA Iteration {snapshot.iteration}, Best: {snapshot.best_distance:.2f}")
+            self.draw_points()
+            self.update_stats_labels(iteration=snapshot.iteration, best_distance=snapshot.best_distance,
+                                     temp=snapshot.extra)
+        if worker.is_alive() or not worker.snapshots.empty():
+            self.master.after(1000 // self.fps, self.poll_worker)
+        elif worker.error is not None:
+            self.master.title(f"SA failed: {worker.error}")
+        elif self.sa_solver.finished:
+            self.master.title(f"SA Completed! Best: {self.best_distance:.2f}")
 
     def update_stats_labels(self, iteration, best_distance, temp):
         self.iteration_label_var.set(f"Iteration: {iteration}")
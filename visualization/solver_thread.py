@@ -0,0 +1,98 @@
+import queue
+import threading
+from collections import namedtuple
+
+# What the GUI gets to see of a solver run. ``extra`` is whatever the app's
+# snapshot function adds (temperature, a copy of the pheromones, ...).
+Snapshot = namedtuple("Snapshot", ["iteration", "best_path", "best_distance", "finished", "extra"])
+
+
+class SolverThread:
+    """
+    Runs an initialized SteppingSolver in a background thread.
+
+    After a step the thread publishes a Snapshot to a bounded queue, but only if
+    the queue has room: when the GUI falls behind, snapshots are skipped instead
+    of slowing the solver down. The final snapshot is always delivered. The GUI
+    drains the queue at its own frame rate with ``latest()``.
+
+    Changes to the solver state from the GUI (e.g. resetting the temperature)
+    go through ``submit`` and run in the solver thread between two steps.
+    """
+
+    def __init__(self, solver, instance, snapshot=None, maxsize=2, **step_kwargs):
+        self.solver = solver
+        self.instance = instance
+        self.snapshot = snapshot
+        self.step_kwargs = step_kwargs
+        self.snapshots = queue.Queue(maxsize)
+        self.error = None
+        self._commands = queue.Queue()
+        self._running = threading.Event()
+        self._running.set()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def stop(self, timeout=None):
+        self._stopped = True
+        self._running.set()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def submit(self, command):
+        """
+        Call ``command()`` in the solver thread before the next step.
+        """
+        self._commands.put(command)
+
+    def latest(self):
+        """
+        Drain the queue and return the newest snapshot, or None if there is none.
+        """
+        snapshot = None
+        while True:
+            try:
+                snapshot = self.snapshots.get_nowait()
+            except queue.Empty:
+                return snapshot
+
+    def _make_snapshot(self):
+        solver = self.solver
+        best_path = None if solver.best_path is None else list(solver.best_path)
+        extra = None if self.snapshot is None else self.snapshot(solver)
+        return Snapshot(solver.current_iter, best_path, solver.best_path_len, solver.finished, extra)
+
+    def _run(self):
+        try:
+            while not self._stopped:
+                self._running.wait()
+                if self._stopped:
+                    break
+                while not self._commands.empty():
+                    self._commands.get_nowait()()
+                if not self.solver.run(self.instance, steps=1, **self.step_kwargs):
+                    break
+                if not self.snapshots.full():
+                    self.snapshots.put_nowait(self._make_snapshot())
+        except Exception as error:
+            self.error = error
+        # Make room for the final state
+        self.latest()
+        self.snapshots.put_nowait(self._make_snapshot())